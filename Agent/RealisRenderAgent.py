@@ -2,6 +2,7 @@ import socket
 import json
 import threading
 from agent_logic import AgentLogic
+from file_server import AgentFileServer
 
 class AgentServer:
     """
@@ -14,6 +15,7 @@ class AgentServer:
         # --- Callbacks for the Logic Controller ---
         callbacks = {
             'on_status_update': self.broadcast_status,
+            'on_trace_ready': self.broadcast_status,
             'on_job_finished': self.on_job_finished
         }
         self.logic = AgentLogic(self.config, callbacks)
@@ -21,11 +23,24 @@ class AgentServer:
         # --- Networking State ---
         self.director_connections = []
         self.connections_lock = threading.Lock()
+        self.file_server = None
+        self.preview_generator = None
 
     def start(self):
         """Starts the main TCP server to listen for Director connections."""
         host = self.config.get('listen_host', '0.0.0.0')
         port = self.config.get('listen_port', 9999)
+
+        # --- Optional Output File Server ---
+        if self.config.get('file_server_port'):
+            self.file_server = AgentFileServer(self._file_server_roots(), host, self.config['file_server_port']).start()
+
+        # --- Optional Live Previews ---
+        if self.config.get('preview_interval'):
+            # numpy/imageio are only required on agents that send previews.
+            from preview import PreviewGenerator
+            self.preview_generator = PreviewGenerator(self.logic.get_render_output_dir, self.logic.get_current_job_id,
+                                                      self.broadcast_preview, self.config['preview_interval']).start()
         
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         server_socket.bind((host, port))
@@ -45,13 +60,20 @@ class AgentServer:
         try:
             # On connect, immediately send the agent's current status.
             initial_status = self.logic.get_current_status()
+            initial_status['file_server_port'] = self.config.get('file_server_port')
             conn.sendall((json.dumps(initial_status) + '\n').encode('utf-8'))
+            # Let a Director that connects mid-job show the last thumbnail right away.
+            preview = self.preview_generator.get_preview(initial_status.get('job_id')) if self.preview_generator else None
+            if preview:
+                conn.sendall((json.dumps(dict(preview, agent_id=self.config.get('agent_id'))) + '\n').encode('utf-8'))
         except socket.error as e:
             print(f"Error sending initial status to {addr}: {e}")
             self._cleanup_connection(conn)
             return
 
         # --- Main Loop: Listen for new jobs from this director ---
+        # Jobs arrive as newline-delimited JSON and may span several recv() calls.
+        buffer = ""
         while True:
             try:
                 data = conn.recv(4096)
@@ -59,21 +81,34 @@ class AgentServer:
                     print(f"Director {addr} disconnected.")
                     break
 
-                job_data = json.loads(data.decode('utf-8'))
-                
-                if not self.logic.start_job(job_data):
-                    # If logic controller rejected the job, inform the director.
-                    response = {"status": "error", "message": "Agent is busy with another job."}
-                    conn.sendall((json.dumps(response) + '\n').encode('utf-8'))
+                buffer += data.decode('utf-8')
+                while '\n' in buffer:
+                    line, buffer = buffer.split('\n', 1)
+                    if line.strip():
+                        self._handle_job_message(conn, addr, line)
 
-            except (json.JSONDecodeError, KeyError) as e:
+            except UnicodeDecodeError as e:
                 print(f"Received invalid job data from {addr}: {e}")
+                buffer = ""
             except socket.error:
                 print(f"Director {addr} connection lost.")
                 break
         
         self._cleanup_connection(conn)
 
+    def _handle_job_message(self, conn: socket.socket, addr, line):
+        """Parses one job message and hands it to the logic controller."""
+        try:
+            job_data = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Received invalid job data from {addr}: {e}")
+            return
+
+        if not self.logic.start_job(job_data):
+            # If logic controller rejected the job, inform the director.
+            response = {"status": "error", "message": "Agent is busy with another job."}
+            conn.sendall((json.dumps(response) + '\n').encode('utf-8'))
+
     # --- Callback Implementations ---
     
     def broadcast_status(self, status_data):
@@ -89,6 +124,10 @@ class AgentServer:
             for conn in dead_connections:
                 self._cleanup_connection(conn)
 
+    def broadcast_preview(self, preview):
+        """Sends a thumbnail message to all connected Directors, tagged with this agent's id."""
+        self.broadcast_status(dict(preview, agent_id=self.config.get('agent_id')))
+
     def on_job_finished(self):
         """Callback triggered by AgentLogic when a job is complete."""
         # This could be used for any post-job logic on the server side if needed.
@@ -96,6 +135,14 @@ class AgentServer:
 
     # --- Helper Methods ---
 
+    def _file_server_roots(self):
+        """'current' follows the running job's output; scratch and extra roots from the config are fixed."""
+        roots = {'current': self.logic.get_render_output_dir}
+        if self.config.get('scratch_directory'):
+            roots['scratch'] = self.config['scratch_directory']
+        roots.update(self.config.get('file_server_roots', {}))
+        return roots
+
     def _cleanup_connection(self, conn: socket.socket):
         """Removes a director's connection from the active list."""
         with self.connections_lock:
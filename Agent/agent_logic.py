@@ -3,6 +3,10 @@ import threading
 import json
 import time
 import os
+from output_uploader import OutputUploader, prune_failed_scratch
+from agent_profile import (CALIBRATION_VERSION, DEFAULT_CALIBRATION, hardware_fingerprint, load_profile,
+                           save_profile, frames_per_second)
+from launch_profiles import resolve_launch_profile, launch_arguments, console_variables
 
 class AgentLogic:
     """
@@ -14,7 +18,7 @@ class AgentLogic:
         Initializes the agent's logic controller.
         :param config: A dictionary containing configuration like UE path, jobs directory.
         :param callbacks: A dictionary of functions for events.
-                          Expected keys: 'on_status_update', 'on_job_finished'.
+                          Expected keys: 'on_status_update', 'on_job_finished', 'on_trace_ready'.
         """
         self.config = config
         self.callbacks = callbacks
@@ -23,8 +27,28 @@ class AgentLogic:
         self.state_lock = threading.Lock()
         self.is_busy = False
         self.current_job_data = None
+        self.job_accepted_at = None
+        self.active_uploader = None
+        self.render_output_dir = None # Where the current job's frames are being written
+
+        # --- Performance Profile ---
+        # Measured by 'calibration' jobs and advertised in every Idle status for speed-weighted dispatch.
+        self.hardware_id, self.hardware_info = hardware_fingerprint(config)
+        self.profile_path = config.get('profile_path') or os.path.join(config.get('jobs_directory', '.'), 'agent_profile.json')
+        self.profile = load_profile(self.profile_path)
         self.last_known_status = self._get_idle_status()
 
+        # --- Job Type Handlers ---
+        # 'render' launches Unreal; the others are Python post-process stages run by this agent.
+        self.job_handlers = {
+            'render': self._execute_and_monitor_job,
+            'derive': self._execute_derive_job,
+            'contact_sheet': self._execute_contact_sheet_job,
+            'reproject': self._execute_reproject_job,
+            'stitch': self._execute_stitch_job,
+            'calibration': self._execute_calibration_job,
+        }
+
     # --- Public Methods ---
 
     def get_current_status(self):
@@ -35,6 +59,15 @@ class AgentLogic:
         with self.state_lock:
             return self.last_known_status.copy()
 
+    def get_current_job_id(self):
+        with self.state_lock:
+            return self.current_job_data.get('job_id') if self.current_job_data else None
+
+    def get_render_output_dir(self):
+        """Returns the directory the current job writes frames to (scratch when staging), or None."""
+        with self.state_lock:
+            return self.render_output_dir
+
     def start_job(self, job_data):
         """
         Attempts to start a new render job.
@@ -42,6 +75,7 @@ class AgentLogic:
         :return: True if the job was started, False if the agent was busy.
         """
         job_id = job_data.get('job_id', 'unknown_job')
+        accepted_at = time.time()
         
         # Atomically check if busy and set the new state if not.
         if not self._set_state_to_busy(job_data):
@@ -49,6 +83,7 @@ class AgentLogic:
             return False
 
         print(f"Logic: Accepted new job: {job_id}")
+        self.job_accepted_at = accepted_at
         
         # Immediately report that the agent is starting the job.
         starting_status = self._get_idle_status()
@@ -60,7 +95,7 @@ class AgentLogic:
         self._update_and_broadcast_status(starting_status)
         
         # The monitoring process will run in a separate thread.
-        threading.Thread(target=self._execute_and_monitor_job).start()
+        threading.Thread(target=self._run_job).start()
         return True
 
     # --- Private, Thread-Safe State Modifiers ---
@@ -90,6 +125,7 @@ class AgentLogic:
         with self.state_lock:
             self.is_busy = False
             self.current_job_data = None
+            self.render_output_dir = None
         
         # Create and broadcast the new idle status
         idle_status = self._get_idle_status()
@@ -97,87 +133,445 @@ class AgentLogic:
 
     # --- Core Job Execution Logic ---
 
+    def _run_job(self):
+        """Routes the current job to the handler registered for its job_type."""
+        job_type = self.current_job_data.get('job_type', 'render')
+        handler = self.job_handlers.get(job_type)
+        if handler:
+            handler()
+            return
+
+        self._update_and_broadcast_status({
+            "timestamp": time.time(), "job_id": self.current_job_data.get('job_id'),
+            "status": "Error", "reason": f"Unknown job type '{job_type}'"
+        })
+        self._set_state_to_idle()
+        self.callbacks['on_job_finished']()
+
     def _execute_and_monitor_job(self):
         """The private method that launches and monitors the UE process."""
         job_data = self.current_job_data
         job_id = job_data.get('job_id', f'job_{int(time.time())}')
         
         # Prepare file paths
-        job_file_path = os.path.join(self.config['jobs_directory'], f"{job_id}.json")
-        progress_file_path = os.path.join(self.config['jobs_directory'], f"{job_id}.stat")
+        job_file_path, progress_file_path, trace_file_path, ledger_file_path = self._job_file_paths(job_id)
 
-        with open(job_file_path, 'w') as f:
-            json.dump(job_data, f)
+        try:
+            profile_name, launch_profile = resolve_launch_profile(self.config, job_data.get('launch_profile'))
+        except KeyError as e:
+            self._update_and_broadcast_status({
+                "timestamp": time.time(), "job_id": job_id, "status": "Error", "reason": e.args[0]
+            })
+            self._set_state_to_idle()
+            self.callbacks['on_job_finished']()
+            return
+
+        # --- Optional Scratch Staging ---
+        # Unreal writes to a local disk and frames are uploaded to output_path while it renders.
+        uploader = None
+        render_job_data = job_data
+        if self.config.get('scratch_directory'):
+            scratch_dir = os.path.join(self.config['scratch_directory'], job_id).replace('\\', '/')
+            render_job_data = self._redirect_output(job_data, scratch_dir)
+            uploader = OutputUploader(scratch_dir, job_data['output_path'],
+                                      workers=self.config.get('upload_workers', 4),
+                                      max_retries=self.config.get('upload_retries', 3),
+                                      bandwidth_limit=self.config.get('upload_bandwidth_limit')).start()
+        self.active_uploader = uploader
+        with self.state_lock:
+            self.render_output_dir = render_job_data['output_path']
 
-        if os.path.exists(progress_file_path):
-            os.remove(progress_file_path)
+        render_job_data = dict(render_job_data, console_variable_overrides=console_variables(launch_profile, job_data))
+        self._write_job_file(render_job_data, job_file_path, (progress_file_path, trace_file_path, ledger_file_path))
 
         # Construct and execute the command
-        command = [
+        command = self._build_unreal_command(job_data, launch_profile, job_file_path, progress_file_path,
+                                             trace_file_path, ledger_file_path)
+
+        trace_events = [{"name": "agent_accept", "ts": self.job_accepted_at or time.time()}]
+        max_crash_retries = self.config.get('max_crash_retries', 1)
+        attempt = 0
+
+        while True:
+            # A relaunch after a crash resumes from the executor's frame ledger.
+            attempt_command = command + ["-Resume"] if attempt > 0 else command
+            spawn_start = time.time()
+            process = subprocess.Popen(' '.join(attempt_command), shell=True)
+            spawn_end = time.time()
+
+            # --- Monitoring Loop ---
+            while process.poll() is None:
+                time.sleep(1)
+                self._check_progress_file(progress_file_path)
+            # The executor's last status (e.g. Completed) may have been written after the last poll.
+            self._check_progress_file(progress_file_path)
+
+            # --- Final Status Check ---
+            process_end = time.time()
+            return_code = process.returncode
+            last_status = self.get_current_status()
+
+            trace_events.append({"name": "ue_spawn", "ts": spawn_start, "dur": spawn_end - spawn_start,
+                                 "args": {"attempt": attempt}})
+            trace_events.append({"name": "ue_process", "ts": spawn_start, "dur": process_end - spawn_start,
+                                 "args": {"return_code": return_code, "attempt": attempt,
+                                          "launch_profile": profile_name}})
+
+            crashed = return_code != 0 and last_status.get("status") not in ("Error", "Completed", "Uploading")
+            if not crashed:
+                break
+            if attempt >= max_crash_retries:
+                error_status = {
+                    "timestamp": time.time(), "job_id": job_id, "status": "Error",
+                    "reason": f"Process crashed with exit code {return_code}"
+                }
+                self._update_and_broadcast_status(error_status)
+                break
+
+            attempt += 1
+            print(f"Logic: Job {job_id} crashed with exit code {return_code}. Resuming (attempt {attempt} of {max_crash_retries}).")
+            self._update_and_broadcast_status({
+                "timestamp": time.time(), "job_id": job_id, "status": "Starting", "attempt": attempt,
+                "reason": f"Resuming after crash (exit code {return_code})"
+            })
+
+        # --- Drain Uploads ---
+        # The job only counts as Completed once every frame has reached output_path.
+        if uploader:
+            self._finish_uploads(job_id, uploader, trace_events)
+            self.active_uploader = None
+            last_status = self.get_current_status()
+
+        # --- Report Timing ---
+        trace_events.extend(self._read_trace_file(trace_file_path))
+        self._report_trace(job_data, trace_events)
+
+        # --- Cleanup ---
+        job_was_completed = last_status.get("status") == "Completed"
+
+        # If the job just completed, wait 2 seconds before becoming idle.
+        # This is done OUTSIDE any lock.
+        if job_was_completed:
+            print(f"Logic: Job {job_id} completed. Waiting 2 seconds before becoming idle.")
+            time.sleep(2)
+
+        # Atomically reset the agent state to idle.
+        self._set_state_to_idle()
+        print(f"Logic: Job {job_id} finished. Agent is now idle.")
+        self.callbacks['on_job_finished']()
+
+    def _job_file_paths(self, job_id):
+        """The job definition, progress, trace and ledger files the executor is pointed at."""
+        jobs_directory = self.config['jobs_directory']
+        return tuple(os.path.join(jobs_directory, f"{job_id}.{extension}")
+                     for extension in ('json', 'stat', 'trace', 'ledger'))
+
+    def _write_job_file(self, job_data, job_file_path, stale_files):
+        with open(job_file_path, 'w') as f:
+            json.dump(job_data, f)
+        for stale_file in stale_files:
+            if os.path.exists(stale_file):
+                os.remove(stale_file)
+
+    def _build_unreal_command(self, job_data, launch_profile, job_file_path, progress_file_path, trace_file_path,
+                              ledger_file_path):
+        return [
             f'"{self.config["unreal_editor_path"]}"',
             f'"{job_data["project_path"]}"',
             "-game", "-MoviePipelineClass=/Script/MovieRenderPipelineCore.MovieGraphPipeline",
             "-MoviePipelineLocalExecutorClass=/Script/MovieRenderPipelineCore.MoviePipelinePythonHostExecutor",
             f"-ExecutorPythonClass=/Engine/PythonTypes.RealisVirtualPlateRenderExecutor",
-            "-AllowCommandletRendering", "-windowed", "-resx=1280", "-resy=720", "-log",
+            "-AllowCommandletRendering", *launch_arguments(launch_profile),
             f'-JobPath="{job_file_path}"', f'-GraphPath="{job_data["graph_path"]}"',
-            f'-ProgressFile="{progress_file_path}"'
+            f'-ProgressFile="{progress_file_path}"', f'-TraceFile="{trace_file_path}"',
+            f'-LedgerFile="{ledger_file_path}"'
         ]
-        
-        process = subprocess.Popen(' '.join(command), shell=True)
 
-        # --- Monitoring Loop ---
-        while process.poll() is None:
-            time.sleep(1)
-            self._check_progress_file(progress_file_path)
+    def _redirect_output(self, job_data, scratch_dir):
+        """Returns a copy of the job whose output paths (including scene variants) point into scratch_dir."""
+        output_path = job_data['output_path']
+        redirected = json.loads(json.dumps(job_data))
+        redirected['output_path'] = scratch_dir
+        for variant in redirected.get('scene_variants', []):
+            variant['output_path'] = scratch_dir + variant['output_path'][len(output_path):]
+        return redirected
 
-        # --- Final Status Check ---
-        return_code = process.returncode
-        last_status = self.get_current_status()
+    def _finish_uploads(self, job_id, uploader, trace_events):
+        """Waits for the uploader to drain, reporting 'Uploading' progress, then publishes the final status."""
+        render_status = self.get_current_status()
+        render_succeeded = render_status.get("status") == "Uploading"
+        drain_start = time.time()
 
-        if return_code != 0 and last_status.get("status") != "Error":
-            error_status = {
+        def report_progress(done, total):
+            self._update_and_broadcast_status({
+                "timestamp": time.time(), "job_id": job_id, "status": "Uploading",
+                "progress": round(done / total, 4) if total else 1.0, "current_frame": done
+            })
+
+        failed = uploader.finish(report_progress if render_succeeded else None)
+        trace_events.append({"name": "upload_drain", "ts": drain_start, "dur": time.time() - drain_start,
+                             "args": {"failed": len(failed), "bytes": uploader.bytes_uploaded}})
+        if not render_succeeded:
+            # The render has failed for good (crash retries are over), so nothing will resume from the
+            # scratch copy. The frames it did finish were uploaded above; the Error status stands.
+            uploader.cleanup()
+            return
+
+        if failed:
+            # The scratch copy may be the only copy of those frames, so keep it, but only the newest few.
+            uploader.keep_after_failure()
+            keep = self.config.get('scratch_keep_failed', 2)
+            for removed in prune_failed_scratch(self.config['scratch_directory'], keep):
+                print(f"Logic: Removed {removed}, the oldest scratch copy kept after a failed upload.")
+            self._update_and_broadcast_status({
                 "timestamp": time.time(), "job_id": job_id, "status": "Error",
-                "reason": f"Process crashed with exit code {return_code}"
+                "reason": f"{len(failed)} file(s) could not be uploaded to {uploader.destination_dir}"
+                          + (f"; the scratch copy is kept in {uploader.scratch_dir}" if keep > 0 else "")
+            })
+            return
+
+        uploader.cleanup()
+        final_status = dict(render_status, timestamp=time.time(), status="Completed", progress=1.0)
+        if 'output_paths' in final_status:
+            final_status['output_paths'] = [uploader.destination_dir + path[len(uploader.scratch_dir):]
+                                            for path in final_status['output_paths']]
+        self._update_and_broadcast_status(final_status)
+
+    def _execute_derive_job(self):
+        """Produces a smaller resolution preset by resampling an already rendered, larger one."""
+        job_data = self.current_job_data
+
+        def derive(report_progress):
+            # numpy/imageio are only required on agents that run post-process jobs.
+            import resample
+            resample.derive_resolution(job_data['source_path'], job_data['output_path'], job_data['resolution'],
+                                       self.config.get('post_process_workers'), report_progress)
+
+        self._execute_local_job(job_data, derive)
+
+    def _execute_contact_sheet_job(self):
+        """Tiles the outputs of a finished batch into contact sheets."""
+        job_data = self.current_job_data
+        cache_dir = self.config.get('thumbnail_cache_directory') or os.path.join(self.config['jobs_directory'], 'thumbnail_cache')
+
+        def build(report_progress):
+            import contact_sheet
+            contact_sheet.build_contact_sheets(job_data['cells'], job_data['output_path'], job_data.get('frames', ['middle']),
+                                               workers=self.config.get('post_process_workers'), cache_dir=cache_dir,
+                                               progress_callback=report_progress)
+
+        self._execute_local_job(job_data, build)
+
+    def _execute_reproject_job(self):
+        """Converts a rendered panoramic sequence between equirect and cubemap layouts."""
+        job_data = self.current_job_data
+        cache_dir = self.config.get('lut_cache_directory') or os.path.join(self.config['jobs_directory'], 'lut_cache')
+
+        def reproject_frames(report_progress):
+            import reproject
+            reproject.reproject_sequence(job_data['source_path'], job_data['output_path'], job_data['reprojection'],
+                                         cache_dir, self.config.get('post_process_workers'), report_progress)
+
+        self._execute_local_job(job_data, reproject_frames)
+
+    def _execute_stitch_job(self):
+        """Assembles full frames from the outputs of a still's tile jobs."""
+        job_data = self.current_job_data
+
+        def stitch_tiles(report_progress):
+            import stitch
+            stitch.stitch_sequence(job_data['source_paths'], job_data['tiles'], job_data['output_path'],
+                                   job_data['resolution'], self.config.get('stitch_workers'),
+                                   self.config.get('scratch_directory') or None, report_progress)
+
+        self._execute_local_job(job_data, stitch_tiles)
+
+    def _execute_calibration_job(self):
+        """
+        Renders the standard calibration sequence once per resolution class and
+        records frames/sec for each in the agent profile. The Director sees a
+        single 'Calibrating' job; the individual renders' statuses are not forwarded.
+        """
+        job_data = self.current_job_data
+        job_id = job_data.get('job_id')
+        started_at = time.time()
+        settings = dict(DEFAULT_CALIBRATION, **self.config.get('calibration', {}))
+        settings.update({key: job_data[key] for key in ('frame_range', 'classes') if job_data.get(key)})
+        classes = settings['classes']
+        expected_frames = settings['frame_range'][1] - settings['frame_range'][0] + 1
+        calibration_dir = os.path.join(self.config['jobs_directory'], 'calibration')
+        trace_events = [{"name": "agent_accept", "ts": self.job_accepted_at or started_at}]
+        results = {}
+
+        missing = [key for key in ('project_path', 'level_path', 'sequence_path', 'graph_path') if not settings.get(key)]
+        error = f"Calibration is not configured; set {', '.join(missing)} under 'calibration'" if missing else None
+        try:
+            _, launch_profile = resolve_launch_profile(self.config, settings.get('launch_profile'))
+        except KeyError as e:
+            error = error or e.args[0]
+
+        for class_index, (class_name, resolution) in enumerate(classes.items()):
+            if error:
+                break
+            run_id = f"{job_id}_{class_name}"
+            run_job = {
+                "job_id": run_id, "project_path": settings['project_path'], "graph_path": settings['graph_path'],
+                "level_path": settings['level_path'], "sequence_path": settings['sequence_path'],
+                "camera_actor_name": settings.get('camera_actor_name'),
+                "scene_settings": settings.get('scene_settings', {}), "resolution": list(resolution),
+                "frame_range": settings['frame_range'],
+                "output_path": os.path.join(calibration_dir, class_name).replace('\\', '/')
             }
-            self._update_and_broadcast_status(error_status)
+            run_job["console_variable_overrides"] = console_variables(launch_profile, run_job)
+            job_file_path, progress_file_path, trace_file_path, ledger_file_path = self._job_file_paths(run_id)
+            self._write_job_file(run_job, job_file_path, (progress_file_path, trace_file_path, ledger_file_path))
+            command = self._build_unreal_command(run_job, launch_profile, job_file_path, progress_file_path,
+                                                 trace_file_path, ledger_file_path)
 
-        # --- Cleanup ---
-        job_was_completed = last_status.get("status") == "Completed"
+            run_start = time.time()
+            process = subprocess.Popen(' '.join(command), shell=True)
+            run_status = {}
+            while process.poll() is None:
+                time.sleep(1)
+                run_status = self._read_progress_file(progress_file_path) or run_status
+                run_progress = 1.0 if run_status.get('status') == 'Completed' else run_status.get('progress', 0)
+                progress = round((class_index + run_progress) / len(classes), 4)
+                if progress > (self.get_current_status().get('progress') or 0):
+                    self._update_and_broadcast_status({
+                        "timestamp": time.time(), "job_id": job_id, "status": "Calibrating",
+                        "progress": progress, "current_frame": run_status.get('current_frame', 0),
+                        "calibration_class": class_name
+                    })
+            run_status = self._read_progress_file(progress_file_path) or run_status
+            run_seconds = time.time() - run_start
 
-        # If the job just completed, wait 2 seconds before becoming idle.
-        # This is done OUTSIDE any lock.
-        if job_was_completed:
-            print(f"Logic: Job {job_id} completed. Waiting 2 seconds before becoming idle.")
+            if run_status.get('status') != 'Completed':
+                error = (f"Calibration render '{class_name}' failed: "
+                         f"{run_status.get('reason') or f'exit code {process.returncode}'}")
+                break
+            fps = frames_per_second(self._read_trace_file(trace_file_path), expected_frames, run_seconds)
+            results[class_name] = {"resolution": list(resolution), "fps": round(fps, 4)}
+            trace_events.append({"name": f"calibrate_{class_name}", "ts": run_start, "dur": run_seconds,
+                                 "args": {"fps": results[class_name]["fps"]}})
+
+        if error is None:
+            self.profile = {
+                "version": CALIBRATION_VERSION, "hardware_id": self.hardware_id, "hardware": self.hardware_info,
+                "calibrated_at": time.time(), "classes": results
+            }
+            save_profile(self.profile_path, self.profile)
+            final_status = {"timestamp": time.time(), "job_id": job_id, "status": "Completed", "progress": 1.0}
+            print(f"Logic: Calibration finished: " +
+                  ", ".join(f"{name} {result['fps']:.2f} fps" for name, result in results.items()))
+        else:
+            print(f"Logic: Calibration job {job_id} failed: {error}")
+            final_status = {"timestamp": time.time(), "job_id": job_id, "status": "Error", "reason": error}
+        self._update_and_broadcast_status(final_status)
+        self._report_trace(job_data, trace_events)
+
+        if final_status["status"] == "Completed":
             time.sleep(2)
+        self._set_state_to_idle()
+        print(f"Logic: Job {job_id} finished. Agent is now idle.")
+        self.callbacks['on_job_finished']()
 
-        # Atomically reset the agent state to idle.
+    def _execute_local_job(self, job_data, work):
+        """
+        Runs a Python post-process job inside the agent process and reports it
+        the same way a render is reported: progress, then Completed or Error.
+        :param work: A function taking a report_progress(done, total) callback.
+        """
+        job_id = job_data.get('job_id')
+        started_at = time.time()
+        last_reported = [-1]
+        with self.state_lock:
+            self.render_output_dir = job_data.get('output_path')
+
+        def report_progress(done, total):
+            percent = int(100 * done / total) if total else 100
+            if percent == last_reported[0]:
+                return # Only broadcast whole-percent changes
+            last_reported[0] = percent
+            self._update_and_broadcast_status({
+                "timestamp": time.time(), "job_id": job_id, "status": "Processing",
+                "progress": round(done / total, 4) if total else 1.0, "current_frame": done
+            })
+
+        try:
+            work(report_progress)
+            final_status = {"timestamp": time.time(), "job_id": job_id, "status": "Completed"}
+        except Exception as e:
+            print(f"Logic: Post-process job {job_id} failed: {e}")
+            final_status = {"timestamp": time.time(), "job_id": job_id, "status": "Error", "reason": str(e)}
+        self._update_and_broadcast_status(final_status)
+
+        self._report_trace(job_data, [
+            {"name": "agent_accept", "ts": self.job_accepted_at or started_at},
+            {"name": job_data.get('job_type', 'post_process'), "ts": started_at, "dur": time.time() - started_at,
+             "args": {"status": final_status["status"]}},
+        ])
+
+        if final_status["status"] == "Completed":
+            time.sleep(2)
         self._set_state_to_idle()
         print(f"Logic: Job {job_id} finished. Agent is now idle.")
         self.callbacks['on_job_finished']()
 
+    def _report_trace(self, job_data, events):
+        """Sends this job's timing events to the Director as a 'trace' message."""
+        self.callbacks['on_trace_ready']({
+            "type": "trace", "timestamp": time.time(), "agent_id": self.config.get('agent_id'),
+            "job_id": job_data.get('job_id'), "trace_id": job_data.get('trace_id'), "events": events
+        })
+
     def _check_progress_file(self, progress_file):
         """Reads the last line of the progress file and triggers status update."""
+        status_data = self._read_progress_file(progress_file)
+        if status_data:
+            if status_data.get("status") == "Completed" and self.active_uploader:
+                # Hold back Completed until the uploader has drained.
+                status_data = dict(status_data, status="Uploading")
+            # Only broadcast if the status has actually changed.
+            if status_data != self.get_current_status():
+                self._update_and_broadcast_status(status_data)
+
+    def _read_progress_file(self, progress_file):
+        """Returns the executor's latest status line, or None if there is none yet."""
         try:
             if not os.path.exists(progress_file) or os.path.getsize(progress_file) == 0:
-                return
+                return None
             
             with open(progress_file, 'r') as f:
                 lines = f.readlines()
             
             if lines:
-                last_line = lines[-1].strip()
-                status_data = json.loads(last_line)
-                # Only broadcast if the status has actually changed.
-                if status_data != self.get_current_status():
-                    self._update_and_broadcast_status(status_data)
+                return json.loads(lines[-1].strip())
         except (IOError, json.JSONDecodeError) as e:
             print(f"Warning: Could not read or parse progress file: {e}")
+        return None
+
+    def _read_trace_file(self, trace_file):
+        """Reads the timing events the executor appended to its trace file."""
+        events = []
+        try:
+            if not os.path.exists(trace_file):
+                return events
+            with open(trace_file, 'r') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue # A crash can leave a truncated last line.
+        except IOError as e:
+            print(f"Warning: Could not read trace file: {e}")
+        return events
 
     def _get_idle_status(self):
         """Generates a standard 'Idle' status dictionary."""
         return {
             "timestamp": time.time(), "job_id": None,
             "status": "Idle", "agent_id": self.config.get('agent_id'),
-            "progress": 0, "current_frame": 0
+            "progress": 0, "current_frame": 0,
+            "file_server_port": self.config.get('file_server_port'),
+            "hardware_id": self.hardware_id, "profile": self.profile
         }
@@ -0,0 +1,104 @@
+"""
+The agent's performance profile: frames/sec per resolution class, measured by
+a 'calibration' job and advertised to the Director in every Idle status. The
+profile is keyed to a hardware fingerprint, so the Director can tell when a
+node's hardware changed and its scores need measuring again.
+"""
+import hashlib
+import json
+import os
+import platform
+import subprocess
+
+# Bump when the calibration scene or the way fps is measured changes, so old profiles are re-measured.
+CALIBRATION_VERSION = 1
+
+# The standard calibration render. Scene paths come from the agent config's 'calibration' section.
+DEFAULT_CALIBRATION = {
+    "frame_range": [0, 47],
+    "classes": {"hd": [1920, 1080], "uhd": [3840, 2160]}
+}
+
+
+def _gpu_names():
+    """GPU model names from nvidia-smi, or an empty list where it is not available."""
+    try:
+        output = subprocess.run(['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'],
+                                capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    return sorted(line.strip() for line in output.splitlines() if line.strip())
+
+
+def _total_memory_gb():
+    try:
+        if hasattr(os, 'sysconf') and 'SC_PHYS_PAGES' in os.sysconf_names:
+            return round(os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / 2**30)
+        import ctypes # Windows
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        return round(status.ullTotalPhys / 2**30)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def hardware_fingerprint(config):
+    """
+    Describes the render-relevant hardware and hashes it into a short id.
+    Setting 'hardware_id' in the agent config overrides the detected one.
+    :return: (hardware_id, description dict)
+    """
+    description = {
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "memory_gb": _total_memory_gb(),
+        "gpus": _gpu_names(),
+        "unreal_editor_path": config.get('unreal_editor_path')
+    }
+    if config.get('hardware_id'):
+        return config['hardware_id'], description
+    digest = hashlib.sha1(json.dumps(description, sort_keys=True).encode('utf-8')).hexdigest()
+    return digest[:12], description
+
+
+def load_profile(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read agent profile {path}: {e}")
+        return None
+
+
+def save_profile(path, profile):
+    try:
+        with open(path, 'w') as f:
+            json.dump(profile, f, indent=4)
+    except IOError as e:
+        print(f"Warning: Could not save agent profile {path}: {e}")
+
+
+def frames_per_second(trace_events, expected_frames=None, fallback_seconds=None):
+    """
+    Render throughput from the executor's per-frame trace spans, so editor
+    startup and map loading don't count. Falls back to expected_frames over
+    fallback_seconds when the trace has no frames.
+    """
+    frames = [event for event in trace_events if event.get('name') == 'frame' and event.get('dur') is not None]
+    if len(frames) >= 2:
+        start = min(event['ts'] for event in frames)
+        end = max(event['ts'] + event['dur'] for event in frames)
+        if end > start:
+            return len(frames) / (end - start)
+    if expected_frames and fallback_seconds:
+        return expected_frames / fallback_seconds
+    return None
@@ -0,0 +1,181 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import image_io
+import resample
+
+CELL_BORDER = 2
+EMPTY_CELL_VALUE = 32 # Dark grey for cells whose job produced no frame
+
+
+def select_frame(frames, selector):
+    """
+    Picks one frame from a sorted list. The selector is 'first', 'middle',
+    'last' or an integer index (negative counts from the end).
+    """
+    if not frames:
+        return None
+    if selector == 'first':
+        return frames[0]
+    if selector == 'last':
+        return frames[-1]
+    if selector == 'middle':
+        return frames[len(frames) // 2]
+    index = int(selector)
+    return frames[max(-len(frames), min(index, len(frames) - 1))]
+
+
+def _cache_key(path, cell_size):
+    stat = os.stat(path)
+    identity = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{cell_size[0]}x{cell_size[1]}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+
+def make_thumbnail(path, cell_size, cache_dir=None):
+    """
+    Decodes a frame and fits it into a cell_size (width, height) uint8 tile,
+    letterboxed to keep its aspect ratio. Tiles are cached on disk keyed by
+    the frame's path, size and mtime, so re-running a sheet after a few more
+    jobs finish only decodes the new frames. Runs in the worker processes.
+    """
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, _cache_key(path, cell_size) + '.npy')
+        if os.path.exists(cache_path):
+            try:
+                return np.load(cache_path)
+            except (OSError, ValueError):
+                pass # Torn cache file; decode again
+
+    cell_width, cell_height = cell_size
+    image = image_io.to_display(image_io.read_image(path))
+    scale = min(cell_width / image.shape[1], cell_height / image.shape[0])
+    fit_width = max(1, int(round(image.shape[1] * scale)))
+    fit_height = max(1, int(round(image.shape[0] * scale)))
+
+    # Cheap box pre-shrink to about twice the target, then an exact Lanczos resize.
+    image = image_io.box_downscale(image, int(image.shape[1] / fit_width / 2))
+    fitted = resample.resize_image(image, fit_width, fit_height)
+
+    tile = np.full((cell_height, cell_width, 3), EMPTY_CELL_VALUE, dtype=np.uint8)
+    top = (cell_height - fit_height) // 2
+    left = (cell_width - fit_width) // 2
+    tile[top:top + fit_height, left:left + fit_width] = fitted
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = cache_path + f'.{os.getpid()}.tmp.npy'
+        np.save(temp_path, tile)
+        os.replace(temp_path, cache_path)
+    return tile
+
+
+def _thumbnail_task(task):
+    """Process pool worker. Returns the tile, or None if the frame could not be read."""
+    path, cell_size, cache_dir = task
+    try:
+        return make_thumbnail(path, cell_size, cache_dir)
+    except (OSError, ValueError) as e:
+        print(f"Contact sheet: Skipping unreadable frame {path}: {e}")
+        return None
+
+
+def tile_grid(tiles, rows, columns):
+    """
+    Assembles an (rows * columns, h, w, 3) stack of tiles into one image with
+    a single reshape/transpose, adding a border around every cell.
+    """
+    bordered = np.pad(tiles, ((0, 0), (CELL_BORDER, CELL_BORDER), (CELL_BORDER, CELL_BORDER), (0, 0)))
+    _, height, width, channels = bordered.shape
+    grid = bordered.reshape(rows, columns, height, width, channels).transpose(0, 2, 1, 3, 4)
+    return grid.reshape(rows * height, columns * width, channels)
+
+
+def build_contact_sheets(cells, output_dir, frame_selectors=('middle',), cell_size=(320, 180),
+                         rows_per_page=40, workers=None, cache_dir=None, progress_callback=None):
+    """
+    Renders contact sheets for a grid of render outputs.
+    :param cells: A list of rows; each row is a list of {"source_dir", "label"} dicts (or None for gaps).
+    :param frame_selectors: Which frame of each cell to show; one set of sheets is written per selector.
+    :param rows_per_page: Large sweeps are split into pages of this many rows to bound memory.
+    :param progress_callback: Optional function called with (done, total) tiles.
+    :return: The list of sheet image paths written.
+    """
+    rows = len(cells)
+    columns = max((len(row) for row in cells), default=0)
+    if rows == 0 or columns == 0:
+        return []
+
+    frame_lists = {}
+    def cell_frame(cell, selector):
+        source_dir = cell['source_dir']
+        if source_dir not in frame_lists:
+            frame_lists[source_dir] = image_io.list_frames(source_dir) if os.path.isdir(source_dir) else []
+        frame = select_frame(frame_lists[source_dir], selector)
+        return os.path.join(source_dir, frame) if frame else None
+
+    pages = [(selector, page, first_row, min(rows_per_page, rows - first_row))
+             for selector in frame_selectors
+             for page, first_row in enumerate(range(0, rows, rows_per_page))]
+    total_cells = sum(1 for row in cells for cell in row if cell) * len(frame_selectors)
+    cell_width, cell_height = cell_size
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Pages are built one at a time so memory stays at one page of tiles however large the sweep is.
+        for selector, page, first_row, page_rows in pages:
+            page_cells = cells[first_row:first_row + page_rows]
+            tiles = np.full((page_rows * columns, cell_height, cell_width, 3), EMPTY_CELL_VALUE, dtype=np.uint8)
+
+            tasks, slots = [], []
+            for row_index, row in enumerate(page_cells):
+                for column_index, cell in enumerate(row):
+                    frame_path = cell_frame(cell, selector) if cell else None
+                    if frame_path:
+                        tasks.append((frame_path, tuple(cell_size), cache_dir))
+                        slots.append(row_index * columns + column_index)
+                    elif cell:
+                        done += 1
+
+            for slot, tile in zip(slots, pool.map(_thumbnail_task, tasks, chunksize=8)):
+                if tile is not None:
+                    tiles[slot] = tile
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total_cells)
+
+            sheet_path = os.path.join(output_dir, f"contact_{selector}_{page:03d}.png")
+            image_io.write_image(sheet_path, tile_grid(tiles, page_rows, columns))
+            written.append(sheet_path)
+
+            # Labels live in a sidecar so the sheet itself needs no font rendering.
+            with open(os.path.splitext(sheet_path)[0] + '.json', 'w') as f:
+                json.dump({
+                    "frame": selector, "cell_size": list(cell_size), "border": CELL_BORDER,
+                    "rows": [[cell.get('label') if cell else None for cell in row] for row in page_cells]
+                }, f, indent=2)
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build contact sheets from a JSON grid of render output folders.")
+    parser.add_argument('cells_json', help="JSON file holding a list of rows of {source_dir, label} cells.")
+    parser.add_argument('output_dir')
+    parser.add_argument('--frames', default='middle', help="Comma separated: first, middle, last or frame indices.")
+    parser.add_argument('--cell-width', type=int, default=320)
+    parser.add_argument('--cell-height', type=int, default=180)
+    parser.add_argument('--rows-per-page', type=int, default=40)
+    parser.add_argument('--cache-dir', default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.cells_json, 'r') as f:
+        grid = json.load(f)
+    sheets = build_contact_sheets(grid, args.output_dir, [s.strip() for s in args.frames.split(',')],
+                                  (args.cell_width, args.cell_height), args.rows_per_page, args.workers, args.cache_dir)
+    print(f"Wrote {len(sheets)} contact sheet(s) to {args.output_dir}")
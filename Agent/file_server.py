@@ -0,0 +1,193 @@
+import json
+import mimetypes
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+COPY_CHUNK_SIZE = 256 * 1024
+
+
+class AgentFileServer:
+    """
+    A small read-only HTTP server exposing the agent's render outputs, so the
+    Director can preview frames while a job is still rendering.
+
+    URLs have the form /files/<root>/<relative path>. A root is either a fixed
+    directory or a function returning the current directory (e.g. the active
+    job's output), so previews follow the job without reconfiguring anything.
+    Files support Range requests and ETags; directories return a JSON listing.
+    """
+    def __init__(self, roots, host='0.0.0.0', port=8080):
+        """
+        :param roots: A dictionary of {name: path or callable returning a path or None}.
+        """
+        self.roots = roots
+        self.host = host
+        self.port = port
+        self.httpd = None
+
+    def start(self):
+        """Starts serving on a background thread."""
+        handler = type('BoundFileRequestHandler', (FileRequestHandler,), {'file_server': self})
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        print(f"File server listening on {self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+    def resolve(self, url_path):
+        """
+        Maps a request path onto the file system.
+        :return: An absolute path inside one of the roots, '' for the root index, or None if not allowed.
+        """
+        parts = [unquote(p) for p in url_path.split('/') if p]
+        if not parts or parts[0] != 'files':
+            return None
+        if len(parts) == 1:
+            return ''
+
+        root = self.roots.get(parts[1])
+        root_dir = root() if callable(root) else root
+        if not root_dir:
+            return None
+        root_dir = os.path.realpath(root_dir)
+        target = os.path.realpath(os.path.join(root_dir, *parts[2:]))
+        # Refuse anything that escapes the root, e.g. through '..' or a symlink.
+        if target != root_dir and not target.startswith(root_dir + os.sep):
+            return None
+        return target
+
+
+class FileRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET/HEAD for an AgentFileServer. The server is bound in as a class attribute."""
+    file_server = None
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def log_message(self, format, *args):
+        pass # Previews poll frequently; keep the agent console readable.
+
+    # --- Request Handling ---
+
+    def _serve(self, send_body):
+        target = self.file_server.resolve(urlsplit(self.path).path)
+        if target is None:
+            self.send_error(404)
+        elif target == '':
+            self._send_json(sorted(self.file_server.roots), send_body)
+        elif os.path.isdir(target):
+            self._send_listing(target, send_body)
+        elif os.path.isfile(target):
+            self._send_file(target, send_body)
+        else:
+            self.send_error(404)
+
+    def _send_json(self, data, send_body):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_listing(self, directory, send_body):
+        entries = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue # Deleted while listing, e.g. an upload's .part file
+                    entries.append({"name": entry.name, "is_dir": entry.is_dir(),
+                                    "size": stat.st_size, "mtime": stat.st_mtime})
+        except OSError:
+            self.send_error(404)
+            return
+        entries.sort(key=lambda e: e['name'])
+        self._send_json(entries, send_body)
+
+    def _send_file(self, path, send_body):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.send_error(404)
+            return
+
+        # Frames are rewritten in place on re-renders, so size and mtime are enough to tell versions apart.
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        start, end = 0, stat.st_size - 1
+        status = 200
+        range_header = self.headers.get('Range')
+        if range_header:
+            byte_range = self._parse_range(range_header, stat.st_size)
+            if byte_range is None:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{stat.st_size}')
+                self.end_headers()
+                return
+            start, end = byte_range
+            status = 206
+
+        length = max(0, end - start + 1)
+        self.send_response(status)
+        self.send_header('Content-Type', mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        self.send_header('Content-Length', str(length))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{stat.st_size}')
+        self.end_headers()
+        if not send_body:
+            return
+
+        try:
+            with open(path, 'rb') as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(COPY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (OSError, ConnectionError):
+            pass # Client went away or the file vanished mid-transfer
+
+    @staticmethod
+    def _parse_range(header, size):
+        """Parses a single 'bytes=a-b' range. Returns (start, end) inclusive, or None if unsatisfiable."""
+        match = RANGE_PATTERN.match(header.strip())
+        if not match or size == 0:
+            return None
+        first, last = match.groups()
+        if first == '' and last == '':
+            return None
+        if first == '':
+            # Suffix range: the last N bytes.
+            return max(0, size - int(last)), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start > end:
+            return None
+        return start, end
@@ -0,0 +1,145 @@
+import os
+import numpy as np
+import imageio.v3 as iio
+
+# Frame formats the Movie Render Graph writes that the post-process stages understand.
+IMAGE_EXTENSIONS = ('.exr', '.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+# EXR channel names by channel count, in array order. Other layers (e.g. Cryptomatte) are not read.
+EXR_CHANNELS = {1: ('Y',), 2: ('Y', 'A'), 3: ('R', 'G', 'B'), 4: ('R', 'G', 'B', 'A')}
+
+
+def list_frames(root_dir):
+    """
+    Recursively lists image files under a directory, sorted for stable ordering.
+    :return: A list of paths relative to root_dir.
+    """
+    frames = []
+    for current_dir, _, files in os.walk(root_dir):
+        for name in files:
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                frames.append(os.path.relpath(os.path.join(current_dir, name), root_dir))
+    frames.sort()
+    return frames
+
+
+def _import_openexr(path):
+    """
+    imageio has no EXR backend by default, so EXR frames go through the
+    OpenEXR package, which only agents that handle EXR frames need.
+    :return: The OpenEXR and Imath modules.
+    """
+    try:
+        import OpenEXR
+        import Imath
+    except ImportError as e:
+        raise ImportError(f"Reading or writing EXR frames ({path}) needs the OpenEXR package: pip install OpenEXR") from e
+    return OpenEXR, Imath
+
+
+def open_exr(path):
+    """Opens an EXR file for reading its header and channels."""
+    OpenEXR, _ = _import_openexr(path)
+    return OpenEXR.InputFile(path)
+
+
+def _read_exr(path):
+    _, Imath = _import_openexr(path)
+    exr = open_exr(path)
+    try:
+        header = exr.header()
+        window = header['dataWindow']
+        width, height = window.max.x - window.min.x + 1, window.max.y - window.min.y + 1
+        names = next((EXR_CHANNELS[count] for count in (4, 3, 2, 1)
+                      if all(name in header['channels'] for name in EXR_CHANNELS[count])), None)
+        if names is None:
+            raise ValueError(f"{path} has no RGB or Y channels.")
+        # Keep the stored precision, e.g. half float frames are read as float16.
+        pixel_type = header['channels'][names[0]].type
+        dtype = {Imath.PixelType.HALF: np.float16, Imath.PixelType.FLOAT: np.float32,
+                 Imath.PixelType.UINT: np.uint32}[pixel_type.v]
+        planes = [np.frombuffer(exr.channel(name, pixel_type), dtype=dtype).reshape(height, width) for name in names]
+    finally:
+        exr.close()
+    return np.stack(planes, axis=2)
+
+
+def _write_exr(path, image):
+    OpenEXR, Imath = _import_openexr(path)
+    if image.dtype == np.float16:
+        pixel_type = Imath.PixelType.HALF
+    elif image.dtype == np.uint32:
+        pixel_type = Imath.PixelType.UINT
+    else:
+        image = to_float(image)
+        pixel_type = Imath.PixelType.FLOAT
+    height, width, count = image.shape
+    names = EXR_CHANNELS[count]
+    header = OpenEXR.Header(width, height)
+    header['channels'] = {name: Imath.Channel(Imath.PixelType(pixel_type)) for name in names}
+    exr = OpenEXR.OutputFile(path, header)
+    try:
+        exr.writePixels({name: np.ascontiguousarray(image[:, :, index]).tobytes() for index, name in enumerate(names)})
+    finally:
+        exr.close()
+
+
+def read_image(path):
+    """Reads an image as an (H, W, C) array, keeping its native dtype."""
+    if path.lower().endswith('.exr'):
+        return _read_exr(path)
+    image = iio.imread(path)
+    if image.ndim == 2:
+        image = image[:, :, np.newaxis]
+    return image
+
+
+def write_image(path, image):
+    """Writes an (H, W, C) array, creating the parent directory if needed."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if path.lower().endswith('.exr'):
+        _write_exr(path, image)
+        return
+    if image.shape[2] == 1:
+        image = image[:, :, 0]
+    iio.imwrite(path, image)
+
+
+def to_float(image):
+    """Converts an image to float32, scaling integer formats to 0..1."""
+    if np.issubdtype(image.dtype, np.integer):
+        return image.astype(np.float32) / np.iinfo(image.dtype).max
+    return image.astype(np.float32, copy=False)
+
+
+def to_display(image):
+    """
+    Converts a frame to 8-bit RGB for thumbnails and sheets. HDR (float) frames
+    are clamped and gamma-encoded so they look plausible on screen.
+    """
+    rgb = image[:, :, :3]
+    if rgb.shape[2] == 1:
+        rgb = np.repeat(rgb, 3, axis=2)
+    display = to_float(rgb)
+    if not np.issubdtype(image.dtype, np.integer):
+        display = np.power(np.clip(display, 0.0, 1.0), 1.0 / 2.2)
+    return from_float(display, np.uint8)
+
+
+def box_downscale(image, factor):
+    """Averages factor x factor pixel blocks. A cheap first step before an exact resize."""
+    if factor <= 1:
+        return image
+    height = image.shape[0] // factor * factor
+    width = image.shape[1] // factor * factor
+    blocks = image[:height, :width].reshape(height // factor, factor, width // factor, factor, image.shape[2])
+    return blocks.mean(axis=(1, 3), dtype=np.float32).astype(image.dtype)
+
+
+def from_float(image, dtype):
+    """Converts a float32 image back to the given dtype, clamping integer formats."""
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        max_value = np.iinfo(dtype).max
+        return np.clip(np.rint(image * max_value), 0, max_value).astype(dtype)
+    return image.astype(dtype, copy=False)
@@ -0,0 +1,64 @@
+"""
+Named Unreal launch profiles. A profile decides how the editor process is
+started for a render: windowed or offscreen, sound, texture streaming pool,
+DDC locations, extra command-line arguments, and console variables that the
+executor applies to the job. Profiles are defined under 'launch_profiles' in
+agent_config.json and picked per job with 'launch_profile'.
+"""
+
+# The command line the agent has always used; profiles override individual keys.
+DEFAULT_LAUNCH_PROFILE = {
+    "offscreen": False,         # -RenderOffscreen: no window, no swap chain
+    "window_size": [1280, 720], # Window size when not offscreen
+    "nosound": False,
+    "log": True,
+    "texture_pool_mb": None,    # r.Streaming.PoolSize
+    "local_ddc_path": None,
+    "shared_ddc_path": None,
+    "console_variables": {},    # Applied by the executor, before the job's own overrides
+    "args": []                  # Extra command-line arguments, passed through as-is
+}
+
+
+def resolve_launch_profile(config, name=None):
+    """
+    Merges a named profile from the agent config over the defaults.
+    :param name: The job's 'launch_profile'; None uses the config's 'default_launch_profile'.
+    :return: (profile name, profile dict)
+    :raises KeyError: If the profile is not defined on this agent.
+    """
+    profiles = config.get('launch_profiles', {})
+    name = name or config.get('default_launch_profile') or 'default'
+    if name not in profiles and name != 'default':
+        raise KeyError(f"Launch profile '{name}' is not defined on this agent")
+    profile = dict(DEFAULT_LAUNCH_PROFILE, **profiles.get(name, {}))
+    return name, profile
+
+
+def launch_arguments(profile):
+    """The editor switches a profile adds after the executor arguments."""
+    arguments = []
+    if profile["offscreen"]:
+        arguments.append("-RenderOffscreen")
+    else:
+        width, height = profile["window_size"]
+        arguments += ["-windowed", f"-resx={width}", f"-resy={height}"]
+    if profile["nosound"]:
+        arguments.append("-nosound")
+    if profile["log"]:
+        arguments.append("-log")
+    if profile["local_ddc_path"]:
+        arguments.append(f'-LocalDataCachePath="{profile["local_ddc_path"]}"')
+    if profile["shared_ddc_path"]:
+        arguments.append(f'-SharedDataCachePath="{profile["shared_ddc_path"]}"')
+    return arguments + list(profile["args"])
+
+
+def console_variables(profile, job_data):
+    """The profile's console variables with the job's console_variable_overrides on top."""
+    variables = {}
+    if profile["texture_pool_mb"]:
+        variables["r.Streaming.PoolSize"] = profile["texture_pool_mb"]
+    variables.update(profile["console_variables"])
+    variables.update(job_data.get('console_variable_overrides') or {})
+    return variables
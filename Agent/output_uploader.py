@@ -0,0 +1,224 @@
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Written into a scratch directory that is kept because its upload failed; see prune_failed_scratch().
+FAILED_UPLOAD_MARKER = '.upload_failed'
+
+
+def prune_failed_scratch(scratch_root, keep):
+    """
+    Deletes the scratch copies kept after failed uploads, oldest first, until
+    at most `keep` remain. Only directories carrying the marker are touched.
+    :return: The directories removed.
+    """
+    kept = []
+    try:
+        with os.scandir(scratch_root) as entries:
+            for entry in entries:
+                marker = os.path.join(entry.path, FAILED_UPLOAD_MARKER)
+                if entry.is_dir() and os.path.exists(marker):
+                    kept.append((os.path.getmtime(marker), entry.path))
+    except OSError:
+        return []
+    kept.sort()
+    removed = [path for _, path in kept[:max(0, len(kept) - keep)]]
+    for path in removed:
+        shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket used to cap upload bandwidth. Tokens are bytes;
+    consume() blocks until enough have accumulated.
+    """
+    def __init__(self, rate_bytes_per_second, burst_bytes=None):
+        self.rate = float(rate_bytes_per_second)
+        self.capacity = float(burst_bytes or rate_bytes_per_second)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, amount):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                # Chunks larger than the bucket are let through once it is full.
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= needed
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class OutputUploader:
+    """
+    Streams frames from a local scratch directory to their final destination
+    while the render is still running. A watcher thread polls the scratch
+    directory; a file is uploaded once its size and modification time have
+    stayed the same for stable_seconds, i.e. the renderer has finished writing
+    it. Uploads run on a bounded thread pool with retries and an optional
+    shared bandwidth limit.
+    """
+    def __init__(self, scratch_dir, destination_dir, workers=4, max_retries=3,
+                 bandwidth_limit=None, poll_interval=1.0, stable_seconds=2.0):
+        """
+        :param bandwidth_limit: Upload cap in bytes per second shared by all workers, or None.
+        """
+        self.scratch_dir = scratch_dir
+        self.destination_dir = destination_dir
+        self.max_retries = max_retries
+        self.poll_interval = poll_interval
+        self.stable_seconds = stable_seconds
+        self.bucket = TokenBucket(bandwidth_limit) if bandwidth_limit else None
+
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        self.seen = {} # relative path -> (size, mtime, first_seen_at) while waiting to stabilize
+        self.uploaded = {} # relative path -> (size, mtime) of the uploaded version
+        self.in_flight = set()
+        self.failed = {} # relative path -> last error message
+        self.bytes_uploaded = 0
+        self.stop_event = threading.Event()
+        self.watcher = threading.Thread(target=self._watch, daemon=True)
+
+    # --- Public Methods ---
+
+    def start(self):
+        os.makedirs(self.scratch_dir, exist_ok=True)
+        self.watcher.start()
+        return self
+
+    def pending_count(self):
+        """Files found in scratch that are not uploaded yet."""
+        with self.lock:
+            return len(self.seen) + len(self.in_flight)
+
+    def finish(self, progress_callback=None):
+        """
+        Stops watching, uploads everything still in scratch and waits for the
+        queue to drain.
+        :param progress_callback: Optional function called with (uploaded, total) files.
+        :return: A dict of {relative_path: error} for files that could not be uploaded.
+        """
+        self.stop_event.set()
+        self.watcher.join()
+        self._scan(final=True)
+
+        while True:
+            with self.lock:
+                remaining = len(self.in_flight)
+                done = len(self.uploaded)
+            if progress_callback:
+                progress_callback(done, done + remaining)
+            if remaining == 0:
+                break
+            time.sleep(self.poll_interval)
+
+        self.pool.shutdown(wait=True)
+        with self.lock:
+            return dict(self.failed)
+
+    def cleanup(self):
+        """Removes the scratch directory once its contents are safely uploaded."""
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+
+    def keep_after_failure(self):
+        """Marks the scratch directory as kept for recovery, so prune_failed_scratch() can retire it later."""
+        try:
+            with open(os.path.join(self.scratch_dir, FAILED_UPLOAD_MARKER), 'w') as f:
+                f.write('\n'.join(sorted(self.failed)))
+        except OSError as e:
+            print(f"Uploader: Could not mark {self.scratch_dir} as kept. Error: {e}")
+
+    # --- Watching ---
+
+    def _watch(self):
+        while not self.stop_event.wait(self.poll_interval):
+            self._scan(final=False)
+
+    def _scan(self, final):
+        """Queues every file that is finished. With final=True, everything left is treated as finished."""
+        now = time.time()
+        for relative_path, size, mtime in self._list_scratch_files():
+            with self.lock:
+                if relative_path in self.in_flight or self.uploaded.get(relative_path) == (size, mtime):
+                    continue
+                previous = self.seen.get(relative_path)
+                if previous is None or previous[:2] != (size, mtime):
+                    self.seen[relative_path] = (size, mtime, now)
+                    if not final:
+                        continue
+                elif not final and now - previous[2] < self.stable_seconds:
+                    continue
+                del self.seen[relative_path]
+                self.in_flight.add(relative_path)
+            self.pool.submit(self._upload, relative_path, size, mtime)
+
+    def _list_scratch_files(self):
+        files = []
+        pending_dirs = [self.scratch_dir]
+        while pending_dirs:
+            try:
+                entries = list(os.scandir(pending_dirs.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    pending_dirs.append(entry.path)
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((os.path.relpath(entry.path, self.scratch_dir), stat.st_size, stat.st_mtime))
+        return files
+
+    # --- Uploading ---
+
+    def _upload(self, relative_path, size, mtime):
+        """Copies one file to the destination, retrying with backoff."""
+        source = os.path.join(self.scratch_dir, relative_path)
+        target = os.path.join(self.destination_dir, relative_path)
+        error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._copy_file(source, target)
+                error = None
+                break
+            except OSError as e:
+                error = str(e)
+                time.sleep(min(30, 2 ** attempt))
+
+        with self.lock:
+            self.in_flight.discard(relative_path)
+            if error is None:
+                self.uploaded[relative_path] = (size, mtime)
+                self.failed.pop(relative_path, None)
+                self.bytes_uploaded += size
+            else:
+                print(f"Uploader: Giving up on {relative_path}: {error}")
+                self.failed[relative_path] = error
+
+    def _copy_file(self, source, target):
+        """Copies through a temporary name so readers of the destination never see a partial frame."""
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        partial_target = target + '.part'
+        with open(source, 'rb') as src, open(partial_target, 'wb') as dst:
+            while True:
+                chunk = src.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if self.bucket:
+                    self.bucket.consume(len(chunk))
+                dst.write(chunk)
+        shutil.copystat(source, partial_target)
+        os.replace(partial_target, target)
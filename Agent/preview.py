@@ -0,0 +1,147 @@
+import base64
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import imageio.v3 as iio
+import image_io
+
+PREVIEW_MAX_SIZE = 320
+PREVIEW_JPEG_QUALITY = 75
+
+
+def _lower_worker_priority():
+    """Process pool initializer: keep preview work from competing with the Unreal render process."""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            BELOW_NORMAL_PRIORITY_CLASS = 0x4000
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), BELOW_NORMAL_PRIORITY_CLASS)
+        else:
+            os.nice(10)
+    except (OSError, AttributeError):
+        pass
+
+
+def make_preview(path, max_size=PREVIEW_MAX_SIZE):
+    """
+    Decodes a frame and returns a small JPEG of it as base64. Runs in the worker process.
+    """
+    image = image_io.read_image(path)
+
+    # A box filter is plenty for a thumbnail and much cheaper than the Lanczos resampler.
+    factor = max(1, int(np.ceil(max(image.shape[:2]) / max_size)))
+    thumbnail = image_io.box_downscale(image_io.to_display(image), factor)
+
+    jpeg = iio.imwrite('<bytes>', thumbnail, extension='.jpg', quality=PREVIEW_JPEG_QUALITY)
+    return base64.b64encode(jpeg).decode('ascii')
+
+
+class PreviewGenerator:
+    """
+    Watches the directory the current job renders into and turns the newest
+    finished frame into a thumbnail. Decoding and resizing happen in a single
+    low-priority worker process, so neither the agent's network threads nor
+    the render compete with it. Only the latest preview per job is kept (LRU
+    over jobs), and previews are pushed at most once per interval.
+    """
+    def __init__(self, get_output_dir, get_job_id, on_preview_ready, interval=5.0, cache_size=8):
+        """
+        :param get_output_dir: Function returning the current job's frame directory, or None when idle.
+        :param get_job_id: Function returning the current job_id, or None when idle.
+        :param on_preview_ready: Called with a 'preview' message dict.
+        """
+        self.get_output_dir = get_output_dir
+        self.get_job_id = get_job_id
+        self.on_preview_ready = on_preview_ready
+        self.interval = interval
+        self.cache_size = cache_size
+        self.cache = OrderedDict() # job_id -> latest preview message
+        self.cache_lock = threading.Lock()
+        self.last_source = {} # job_id -> (path, mtime) of the frame last previewed
+        self.pool = None
+        self.stop_event = threading.Event()
+
+    # --- Public Methods ---
+
+    def start(self):
+        self.pool = ProcessPoolExecutor(max_workers=1, initializer=_lower_worker_priority)
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.pool:
+            self.pool.shutdown(wait=False)
+
+    def get_preview(self, job_id):
+        """Returns the latest preview message for a job, if one is cached."""
+        with self.cache_lock:
+            preview = self.cache.get(job_id)
+            if preview:
+                self.cache.move_to_end(job_id)
+            return preview
+
+    # --- Watching ---
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            job_id, output_dir = self.get_job_id(), self.get_output_dir()
+            if not job_id or not output_dir:
+                continue
+
+            frame = self._newest_finished_frame(output_dir)
+            if not frame or self.last_source.get(job_id) == frame:
+                continue
+            self.last_source[job_id] = frame
+
+            try:
+                image = self.pool.submit(make_preview, frame[0]).result(timeout=max(30.0, self.interval * 4))
+            except Exception as e:
+                # Frames can be caught mid-write or be a format the decoder does not handle; try the next one.
+                print(f"Preview: Could not create preview of {frame[0]}: {e}")
+                continue
+
+            preview = {
+                "type": "preview", "timestamp": time.time(), "job_id": job_id,
+                "frame": os.path.relpath(frame[0], output_dir).replace('\\', '/'),
+                "image": f"data:image/jpeg;base64,{image}"
+            }
+            self._remember(job_id, preview)
+            self.on_preview_ready(preview)
+
+    def _remember(self, job_id, preview):
+        with self.cache_lock:
+            self.cache[job_id] = preview
+            self.cache.move_to_end(job_id)
+            while len(self.cache) > self.cache_size:
+                evicted_job_id, _ = self.cache.popitem(last=False)
+                self.last_source.pop(evicted_job_id, None)
+
+    @staticmethod
+    def _newest_finished_frame(output_dir, settle_seconds=1.0):
+        """Returns (path, mtime) of the most recent frame that has not been touched for settle_seconds."""
+        newest = None
+        cutoff = time.time() - settle_seconds
+        pending_dirs = [output_dir]
+        while pending_dirs:
+            try:
+                entries = list(os.scandir(pending_dirs.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    pending_dirs.append(entry.path)
+                    continue
+                if not entry.name.lower().endswith(image_io.IMAGE_EXTENSIONS):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if mtime <= cutoff and (newest is None or mtime > newest[1]):
+                    newest = (entry.path, mtime)
+        return newest
@@ -0,0 +1,224 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import image_io
+
+# Bump when the LUT math changes so stale cached tables are not reused.
+LUT_VERSION = 1
+
+# Cubemaps are a horizontal strip of six square faces in this order.
+CUBE_FACES = ('+X', '-X', '+Y', '-Y', '+Z', '-Z')
+
+
+# --- Direction Math ---
+# Directions are unit vectors with x right, y up and z forward.
+
+def _rotation_matrix(yaw, pitch, roll):
+    """Rotation applied to output directions to find where they sample the input. Angles in degrees."""
+    yaw, pitch, roll = np.radians([yaw, pitch, roll])
+    rot_y = np.array([[np.cos(yaw), 0, np.sin(yaw)], [0, 1, 0], [-np.sin(yaw), 0, np.cos(yaw)]])
+    rot_x = np.array([[1, 0, 0], [0, np.cos(pitch), -np.sin(pitch)], [0, np.sin(pitch), np.cos(pitch)]])
+    rot_z = np.array([[np.cos(roll), -np.sin(roll), 0], [np.sin(roll), np.cos(roll), 0], [0, 0, 1]])
+    return rot_y @ rot_x @ rot_z
+
+
+def _equirect_directions(width, height, crop=None):
+    """
+    Directions for every pixel of an equirectangular image.
+    :param crop: Optional (lon_min, lon_max, lat_min, lat_max) in degrees to output only part of the sphere.
+    """
+    lon_min, lon_max, lat_min, lat_max = np.radians(crop) if crop else (-np.pi, np.pi, -np.pi / 2, np.pi / 2)
+    lon = lon_min + (np.arange(width) + 0.5) / width * (lon_max - lon_min)
+    lat = lat_max - (np.arange(height) + 0.5) / height * (lat_max - lat_min)
+    lon, lat = np.meshgrid(lon, lat)
+    return np.stack([np.cos(lat) * np.sin(lon), np.sin(lat), np.cos(lat) * np.cos(lon)], axis=-1)
+
+
+def _cubemap_directions(face_size):
+    """Directions for every pixel of a six-face cubemap strip, shaped (face_size, 6 * face_size, 3)."""
+    coords = (np.arange(face_size) + 0.5) / face_size * 2 - 1
+    sc, tc = np.meshgrid(coords, coords)
+    one = np.ones_like(sc)
+    faces = [
+        np.stack([one, -tc, -sc], axis=-1),   # +X
+        np.stack([-one, -tc, sc], axis=-1),   # -X
+        np.stack([sc, one, tc], axis=-1),     # +Y
+        np.stack([sc, -one, -tc], axis=-1),   # -Y
+        np.stack([sc, -tc, one], axis=-1),    # +Z
+        np.stack([-sc, -tc, -one], axis=-1),  # -Z
+    ]
+    directions = np.concatenate(faces, axis=1)
+    return directions / np.linalg.norm(directions, axis=-1, keepdims=True)
+
+
+# --- Sampling Positions ---
+
+def _bilinear(px, py, width, height, wrap_x):
+    """Turns continuous pixel positions into four neighbour (x, y) pairs and weights."""
+    x0 = np.floor(px).astype(np.int64)
+    y0 = np.floor(py).astype(np.int64)
+    fx = (px - x0).astype(np.float32)
+    fy = (py - y0).astype(np.float32)
+    xs = np.stack([x0, x0 + 1, x0, x0 + 1], axis=-1)
+    ys = np.stack([y0, y0, y0 + 1, y0 + 1], axis=-1)
+    weights = np.stack([(1 - fx) * (1 - fy), fx * (1 - fy), (1 - fx) * fy, fx * fy], axis=-1)
+    xs = np.mod(xs, width) if wrap_x else np.clip(xs, 0, width - 1)
+    ys = np.clip(ys, 0, height - 1)
+    return xs, ys, weights
+
+
+def _sample_equirect(directions, width, height):
+    lon = np.arctan2(directions[..., 0], directions[..., 2])
+    lat = np.arcsin(np.clip(directions[..., 1], -1.0, 1.0))
+    px = (lon + np.pi) / (2 * np.pi) * width - 0.5
+    py = (np.pi / 2 - lat) / np.pi * height - 0.5
+    xs, ys, weights = _bilinear(px, py, width, height, wrap_x=True)
+    return ys * width + xs, weights
+
+
+def _sample_cubemap(directions, face_size):
+    x, y, z = directions[..., 0], directions[..., 1], directions[..., 2]
+    ax, ay, az = np.abs(x), np.abs(y), np.abs(z)
+    face = np.where((ax >= ay) & (ax >= az), np.where(x > 0, 0, 1),
+                    np.where(ay >= az, np.where(y > 0, 2, 3), np.where(z > 0, 4, 5)))
+    major = np.choose(face, [ax, ax, ay, ay, az, az])
+    sc = np.choose(face, [-z, z, x, x, x, -x]) / major
+    tc = np.choose(face, [-y, -y, z, -z, -y, -y]) / major
+    px = (sc + 1) / 2 * face_size - 0.5
+    py = (tc + 1) / 2 * face_size - 0.5
+    # Neighbours are clamped inside the face; the half-pixel seam is not worth a cross-face lookup.
+    xs, ys, weights = _bilinear(px, py, face_size, face_size, wrap_x=False)
+    return ys * (6 * face_size) + face[..., np.newaxis] * face_size + xs, weights
+
+
+# --- LUT Building and Caching ---
+
+def lut_key(spec):
+    canonical = json.dumps(dict(spec, version=LUT_VERSION), sort_keys=True)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+def build_lut(spec):
+    """
+    Computes the sampling table for a conversion. All the trigonometry happens
+    here, once; applying the table to a frame is a single gather.
+    :param spec: {"input_format", "input_size": [w, h], "output_format", "output_size": [w, h],
+                  "rotation": [yaw, pitch, roll], "crop": [lon_min, lon_max, lat_min, lat_max] or None}
+    :return: (indices, weights) shaped (out_h * out_w, 4), int32 and float32.
+    """
+    out_width, out_height = spec['output_size']
+    if spec['output_format'] == 'equirect':
+        directions = _equirect_directions(out_width, out_height, spec.get('crop'))
+    elif spec['output_format'] == 'cubemap':
+        if out_width != 6 * out_height:
+            raise ValueError("A cubemap strip must be six faces wide (width == 6 * height)")
+        directions = _cubemap_directions(out_height)
+    else:
+        raise ValueError(f"Unknown output format '{spec['output_format']}'")
+
+    rotation = spec.get('rotation') or [0, 0, 0]
+    if any(rotation):
+        directions = directions @ _rotation_matrix(*rotation).T
+
+    in_width, in_height = spec['input_size']
+    if spec['input_format'] == 'equirect':
+        indices, weights = _sample_equirect(directions, in_width, in_height)
+    elif spec['input_format'] == 'cubemap':
+        if in_width != 6 * in_height:
+            raise ValueError("A cubemap strip must be six faces wide (width == 6 * height)")
+        indices, weights = _sample_cubemap(directions, in_height)
+    else:
+        raise ValueError(f"Unknown input format '{spec['input_format']}'")
+
+    # int32 halves the table size and is enough for any input under 2^31 pixels.
+    return indices.reshape(-1, 4).astype(np.int32), weights.reshape(-1, 4).astype(np.float32)
+
+
+def cached_lut_path(spec, cache_dir):
+    """Builds the LUT for a spec unless it is already in cache_dir. Returns the .npz path."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"reproject_{lut_key(spec)}.npz")
+    if not os.path.exists(path):
+        indices, weights = build_lut(spec)
+        temp_path = path + f".{os.getpid()}.tmp.npz"
+        np.savez(temp_path, indices=indices, weights=weights)
+        os.replace(temp_path, path)
+    return path
+
+
+_loaded_luts = {}
+
+def _load_lut(path):
+    """Loads a LUT once per worker process."""
+    if path not in _loaded_luts:
+        with np.load(path) as data:
+            _loaded_luts[path] = (data['indices'], data['weights'])
+    return _loaded_luts[path]
+
+
+def apply_lut(image, indices, weights, output_size):
+    """Reprojects one (H, W, C) image: one gather of the four neighbours, then a weighted sum."""
+    out_width, out_height = output_size
+    # Gather in the native dtype first; converting only the samples is cheaper than converting the whole input.
+    samples = image_io.to_float(image.reshape(-1, image.shape[2])[indices]) # (N, 4, C)
+    result = np.einsum('nkc,nk->nc', samples, weights, optimize=True)
+    return image_io.from_float(result.reshape(out_height, out_width, image.shape[2]), image.dtype)
+
+
+def _reproject_file(task):
+    """Process pool worker."""
+    source_path, target_path, lut_path, output_size = task
+    indices, weights = _load_lut(lut_path)
+    image_io.write_image(target_path, apply_lut(image_io.read_image(source_path), indices, weights, output_size))
+    return target_path
+
+
+def reproject_sequence(source_dir, output_dir, spec, cache_dir, workers=None, progress_callback=None):
+    """
+    Reprojects every frame under source_dir. The input size is taken from the
+    first frame, and the LUT is built (or loaded from cache_dir) once before
+    the workers start.
+    :param spec: As for build_lut, without input_size.
+    :param progress_callback: Optional function called with (done, total).
+    :return: The number of frames written.
+    """
+    frames = image_io.list_frames(source_dir)
+    if not frames:
+        return 0
+    first = image_io.read_image(os.path.join(source_dir, frames[0]))
+    spec = dict(spec, input_size=[first.shape[1], first.shape[0]])
+    lut_path = cached_lut_path(spec, cache_dir)
+
+    tasks = [(os.path.join(source_dir, f), os.path.join(output_dir, f), lut_path, tuple(spec['output_size']))
+             for f in frames]
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(_reproject_file, tasks):
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(tasks))
+    return done
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Reproject panoramic frame sequences between equirect and cubemap layouts.")
+    parser.add_argument('source_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--input-format', choices=['equirect', 'cubemap'], default='equirect')
+    parser.add_argument('--output-format', choices=['equirect', 'cubemap'], default='cubemap')
+    parser.add_argument('--width', type=int, required=True)
+    parser.add_argument('--height', type=int, required=True)
+    parser.add_argument('--rotation', type=float, nargs=3, default=[0, 0, 0], metavar=('YAW', 'PITCH', 'ROLL'))
+    parser.add_argument('--crop', type=float, nargs=4, default=None, metavar=('LON_MIN', 'LON_MAX', 'LAT_MIN', 'LAT_MAX'),
+                        help="Equirect output only: the part of the sphere to keep, in degrees.")
+    parser.add_argument('--cache-dir', default='lut_cache')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    conversion = {"input_format": args.input_format, "output_format": args.output_format,
+                  "output_size": [args.width, args.height], "rotation": args.rotation, "crop": args.crop}
+    count = reproject_sequence(args.source_dir, args.output_dir, conversion, args.cache_dir, args.workers)
+    print(f"Reprojected {count} frames into {args.output_dir}")
@@ -0,0 +1,108 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+import image_io
+
+LANCZOS_LOBES = 3
+
+
+@lru_cache(maxsize=64)
+def _lanczos_taps(in_size, out_size):
+    """
+    Precomputes the source indices and weights for resampling one axis.
+    When downscaling the kernel is stretched by the scale factor so it also
+    acts as the anti-aliasing filter.
+    :return: (indices, weights), both shaped (out_size, taps).
+    """
+    scale = in_size / out_size
+    support = LANCZOS_LOBES * max(scale, 1.0)
+    taps = int(np.ceil(support)) * 2 + 1
+
+    centers = (np.arange(out_size) + 0.5) * scale - 0.5
+    first = np.floor(centers - support).astype(np.int64) + 1
+    indices = first[:, np.newaxis] + np.arange(taps)[np.newaxis, :]
+
+    distance = (indices - centers[:, np.newaxis]) / max(scale, 1.0)
+    weights = np.sinc(distance) * np.sinc(distance / LANCZOS_LOBES)
+    weights[np.abs(distance) >= LANCZOS_LOBES] = 0.0
+    weights /= weights.sum(axis=1, keepdims=True)
+
+    # Clamp to the edge so border pixels are replicated rather than wrapped.
+    np.clip(indices, 0, in_size - 1, out=indices)
+    return indices, weights.astype(np.float32)
+
+
+def _resample_axis(image, out_size, axis):
+    """
+    Resamples a float32 (H, W, C) image along one axis. Each tap is one
+    vectorized gather plus a multiply-add, so memory stays at one output
+    image instead of (out_size x taps) intermediate planes.
+    """
+    indices, weights = _lanczos_taps(image.shape[axis], out_size)
+    weight_shape = (-1, 1, 1) if axis == 0 else (1, -1, 1)
+
+    result = None
+    for tap in range(indices.shape[1]):
+        contribution = np.take(image, indices[:, tap], axis=axis)
+        contribution *= weights[:, tap].reshape(weight_shape)
+        if result is None:
+            result = contribution
+        else:
+            result += contribution
+    return result
+
+
+def resize_image(image, width, height):
+    """Resizes an (H, W, C) image with a separable Lanczos-3 filter, keeping its dtype."""
+    source_dtype = image.dtype
+    result = image_io.to_float(image)
+    if result.shape[0] != height:
+        result = _resample_axis(result, height, axis=0)
+    if result.shape[1] != width:
+        result = _resample_axis(result, width, axis=1)
+    return image_io.from_float(result, source_dtype)
+
+
+def _resize_file(task):
+    """Process pool worker: reads one frame, resizes it and writes it out."""
+    source_path, target_path, width, height = task
+    image = image_io.read_image(source_path)
+    image_io.write_image(target_path, resize_image(image, width, height))
+    return target_path
+
+
+def derive_resolution(source_dir, output_dir, resolution, workers=None, progress_callback=None):
+    """
+    Produces a lower resolution copy of every frame rendered into source_dir.
+    :param resolution: (width, height) of the derived frames.
+    :param progress_callback: Optional function called with (done, total).
+    :return: The number of frames written.
+    """
+    width, height = int(resolution[0]), int(resolution[1])
+    frames = image_io.list_frames(source_dir)
+    tasks = [(os.path.join(source_dir, f), os.path.join(output_dir, f), width, height) for f in frames]
+    if not tasks:
+        return 0
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(_resize_file, tasks, chunksize=4):
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(tasks))
+    return done
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Derive a lower resolution copy of a rendered frame sequence.")
+    parser.add_argument('source_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('width', type=int)
+    parser.add_argument('height', type=int)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    count = derive_resolution(args.source_dir, args.output_dir, (args.width, args.height), args.workers)
+    print(f"Derived {count} frames at {args.width}x{args.height} into {args.output_dir}")
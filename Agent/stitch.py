@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import image_io
+
+# Rows blended or normalized at a time, bounding the temporary arrays to a band of the image.
+BAND_ROWS = 256
+
+
+def feather_weights(rect, core):
+    """
+    Per-axis blend weights for one tile. Inside its core a tile has full
+    weight; across each overlap it shares with a neighbour it ramps linearly,
+    so the two tiles' weights sum to one there.
+    :param rect: [x0, y0, x1, y1] the tile covers in the full image.
+    :param core: [x0, y0, x1, y1] the tile owns; rect is core plus the overlap.
+    :return: (row_weights, column_weights) float32 arrays.
+    """
+    def ramp(length, lead, trail):
+        weights = np.ones(length, dtype=np.float32)
+        if lead > 0:
+            span = 2 * lead # This tile's lead plus the neighbour's trail past the core edge
+            weights[:span] *= (np.arange(min(span, length), dtype=np.float32) + 0.5) / span
+        if trail > 0:
+            span = 2 * trail
+            weights[-span:] *= ((np.arange(min(span, length), dtype=np.float32) + 0.5) / span)[::-1]
+        return weights
+
+    rows = ramp(rect[3] - rect[1], core[1] - rect[1], rect[3] - core[3])
+    columns = ramp(rect[2] - rect[0], core[0] - rect[0], rect[2] - core[2])
+    return rows, columns
+
+
+def stitch_frame(tile_paths, tiles, output_file, resolution, temp_dir):
+    """
+    Assembles one frame from its tiles. Tiles are blended one at a time into
+    a memory-mapped float accumulator on disk, so neither the tiles nor the
+    full-size image ever have to fit in RAM together. The normalized result
+    goes to a memory-mapped buffer of the tiles' dtype, which is then encoded.
+    """
+    width, height = resolution
+    os.makedirs(temp_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix='stitch_', dir=temp_dir)
+    try:
+        accumulator = weight_sum = None
+        dtype = None
+        for path, tile in zip(tile_paths, tiles):
+            x0, y0, x1, y1 = tile['rect']
+            image = image_io.read_image(path)
+            if image.shape[:2] != (y1 - y0, x1 - x0):
+                raise ValueError(f"Tile {path} is {image.shape[1]}x{image.shape[0]}, expected {x1 - x0}x{y1 - y0}")
+            if accumulator is None:
+                dtype = image.dtype
+                accumulator = np.lib.format.open_memmap(os.path.join(work_dir, 'accumulator.npy'), mode='w+',
+                                                        dtype=np.float32, shape=(height, width, image.shape[2]))
+                weight_sum = np.lib.format.open_memmap(os.path.join(work_dir, 'weights.npy'), mode='w+',
+                                                       dtype=np.float32, shape=(height, width))
+            row_weights, column_weights = feather_weights(tile['rect'], tile['core'])
+            for band in range(0, y1 - y0, BAND_ROWS):
+                band_end = min(band + BAND_ROWS, y1 - y0)
+                weights = row_weights[band:band_end, np.newaxis] * column_weights[np.newaxis, :]
+                accumulator[y0 + band:y0 + band_end, x0:x1] += image_io.to_float(image[band:band_end]) * weights[:, :, np.newaxis]
+                weight_sum[y0 + band:y0 + band_end, x0:x1] += weights
+            del image
+
+        result = np.lib.format.open_memmap(os.path.join(work_dir, 'result.npy'), mode='w+',
+                                           dtype=dtype, shape=accumulator.shape)
+        for band in range(0, height, BAND_ROWS):
+            band_weights = np.maximum(weight_sum[band:band + BAND_ROWS], 1e-6)[:, :, np.newaxis]
+            result[band:band + BAND_ROWS] = image_io.from_float(accumulator[band:band + BAND_ROWS] / band_weights, dtype)
+        del accumulator, weight_sum
+
+        image_io.write_image(output_file, result)
+        del result
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _stitch_task(task):
+    """Process pool worker."""
+    relative_frame, source_paths, tiles, output_dir, resolution, temp_dir = task
+    tile_paths = [os.path.join(source, relative_frame) for source in source_paths]
+    missing = [path for path in tile_paths if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"Missing tile(s) for {relative_frame}: {missing}")
+    stitch_frame(tile_paths, tiles, os.path.join(output_dir, relative_frame), resolution, temp_dir)
+    return relative_frame
+
+
+def stitch_sequence(source_paths, tiles, output_dir, resolution, workers=None, temp_dir=None, progress_callback=None):
+    """
+    Stitches every frame of a tiled render. Frames are matched across tiles by
+    their path relative to each tile's output folder.
+    :param source_paths: One output folder per tile, in the same order as tiles.
+    :param tiles: A list of {"rect", "core"} dicts, see feather_weights.
+    :param workers: Frames stitched at once. Each needs about 20 bytes per output pixel of
+                    temporary disk space, so this defaults to 2 rather than the CPU count.
+    :param temp_dir: Where the memory-mapped buffers live; defaults to output_dir's parent.
+    :param progress_callback: Optional function called with (done, total).
+    :return: The number of frames written.
+    """
+    frames = image_io.list_frames(source_paths[0])
+    temp_root = temp_dir or os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(temp_root, exist_ok=True)
+    run_temp_dir = tempfile.mkdtemp(prefix='stitch_temp_', dir=temp_root)
+    tasks = [(frame, source_paths, tiles, output_dir, tuple(resolution), run_temp_dir) for frame in frames]
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers or 2) as pool:
+            for _ in pool.map(_stitch_task, tasks):
+                done += 1
+                if progress_callback:
+                    progress_callback(done, len(tasks))
+    finally:
+        shutil.rmtree(run_temp_dir, ignore_errors=True)
+    return done
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stitch the outputs of tiled render jobs into full frames.")
+    parser.add_argument('job_json', help="A stitch job JSON file with source_paths, tiles and resolution.")
+    parser.add_argument('output_dir')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--temp-dir', default=None)
+    args = parser.parse_args()
+
+    with open(args.job_json, 'r') as f:
+        job = json.load(f)
+    count = stitch_sequence(job['source_paths'], job['tiles'], args.output_dir, job['resolution'],
+                            args.workers, args.temp_dir)
+    print(f"Stitched {count} frames into {args.output_dir}")
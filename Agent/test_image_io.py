@@ -0,0 +1,41 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import image_io
+
+
+class ExrTests(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='test_image_io_')
+        self.path = os.path.join(self.work_dir, 'Shot.0001.exr')
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    @unittest.skipUnless(importlib.util.find_spec('OpenEXR'), "OpenEXR is not installed")
+    def test_round_trip_keeps_channels_and_precision(self):
+        for dtype, channels in ((np.float16, 4), (np.float32, 3), (np.float32, 1)):
+            image = (np.random.default_rng(1).random((9, 13, channels)) * 4.0).astype(dtype)
+            image_io.write_image(self.path, image)
+            read_back = image_io.read_image(self.path)
+            self.assertEqual(read_back.dtype, dtype)
+            np.testing.assert_array_equal(read_back, image)
+
+    def test_missing_backend_names_the_package(self):
+        with mock.patch.dict(sys.modules, {'OpenEXR': None}):
+            with self.assertRaisesRegex(ImportError, "pip install OpenEXR"):
+                image_io.write_image(self.path, np.zeros((2, 2, 3), np.float32))
+            with self.assertRaisesRegex(ImportError, "pip install OpenEXR"):
+                image_io.read_image(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
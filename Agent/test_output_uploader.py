@@ -0,0 +1,40 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from output_uploader import OutputUploader, prune_failed_scratch
+
+
+class FailedScratchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.scratch_root = tempfile.mkdtemp(prefix='test_output_uploader_')
+
+    def tearDown(self):
+        shutil.rmtree(self.scratch_root, ignore_errors=True)
+
+    def keep_failed_job(self, job_id, age_seconds):
+        uploader = OutputUploader(os.path.join(self.scratch_root, job_id), os.path.join(self.scratch_root, 'dest'))
+        os.makedirs(uploader.scratch_dir)
+        uploader.failed['Shot.0001.exr'] = "share offline"
+        uploader.keep_after_failure()
+        uploader.pool.shutdown()
+        marker = os.path.join(uploader.scratch_dir, '.upload_failed')
+        os.utime(marker, (os.path.getmtime(marker) - age_seconds,) * 2)
+
+    def test_oldest_kept_copies_are_removed_first(self):
+        for job_id, age in (("old", 300), ("newest", 0), ("middle", 100)):
+            self.keep_failed_job(job_id, age)
+        os.makedirs(os.path.join(self.scratch_root, "rendering")) # A job still staging has no marker
+
+        removed = prune_failed_scratch(self.scratch_root, keep=2)
+        self.assertEqual([os.path.basename(path) for path in removed], ["old"])
+        self.assertEqual(sorted(os.listdir(self.scratch_root)), ["middle", "newest", "rendering"])
+
+        prune_failed_scratch(self.scratch_root, keep=0)
+        self.assertEqual(os.listdir(self.scratch_root), ["rendering"])
+
+
+if __name__ == '__main__':
+    unittest.main()
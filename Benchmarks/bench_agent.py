@@ -0,0 +1,111 @@
+"""AgentServer.broadcast_status fan-out and AgentLogic._check_progress_file on growing .stat files."""
+import json
+import os
+import selectors
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+from harness import measure, result
+from RealisRenderAgent import AgentServer
+from agent_logic import AgentLogic
+
+FAN_OUTS = (1, 4, 16, 64, 256)
+QUICK_FAN_OUTS = (1, 16)
+STAT_LINES = (100, 1000, 10000, 100000)
+QUICK_STAT_LINES = (100, 1000, 10000)
+
+# A Rendering status as the executor writes it, which the agent forwards unchanged.
+RENDERING_STATUS = {
+    "timestamp": 0.0, "job_id": "job_1700000000000_42", "status": "Rendering",
+    "progress": 0.4213, "current_frame": 101, "render_pass": 0, "render_pass_count": 1,
+    "pass_progress": 0.4213, "variant": None,
+    "output_path": "//fileserver/plates/job_1700000000000/job_1700000000000_42"
+}
+
+
+class SocketDrain:
+    """Reads and discards everything arriving on the Director ends of the socket pairs."""
+    def __init__(self, sockets):
+        self.selector = selectors.DefaultSelector()
+        for sock in sockets:
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ)
+        self.running = True
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def _drain(self):
+        while self.running:
+            for key, _ in self.selector.select(timeout=0.05):
+                try:
+                    key.fileobj.recv(65536)
+                except BlockingIOError:
+                    pass
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        self.selector.close()
+
+
+def create_agent_server(work_dir):
+    config_path = os.path.join(work_dir, 'agent_config.json')
+    with open(config_path, 'w') as f:
+        json.dump({"agent_id": "bench-agent", "jobs_directory": work_dir}, f)
+    return AgentServer(config_path)
+
+
+def bench_broadcast(config, work_dir):
+    results = []
+    server = create_agent_server(work_dir)
+    for fan_out in (QUICK_FAN_OUTS if config["quick"] else FAN_OUTS):
+        pairs = [socket.socketpair() for _ in range(fan_out)]
+        server.director_connections = [agent_end for agent_end, _ in pairs]
+        drain = SocketDrain([director_end for _, director_end in pairs])
+        try:
+            stats = measure(lambda: server.broadcast_status(dict(RENDERING_STATUS, timestamp=time.time())),
+                            repeat=config["repeat"], number=200)
+        finally:
+            drain.stop()
+            for agent_end, director_end in pairs:
+                agent_end.close()
+                director_end.close()
+        results.append(result("agent.broadcast_status", {"directors": fan_out}, stats,
+                              seconds_per_send=stats["median"] / fan_out))
+    return results
+
+
+def write_stat_file(path, line_count):
+    """A .stat file as a long job leaves it: one Rendering line per progress step, then Completed."""
+    with open(path, 'w') as f:
+        for index in range(line_count - 1):
+            progress = index / line_count
+            f.write(json.dumps(dict(RENDERING_STATUS, timestamp=1700000000.0 + index,
+                                    progress=round(progress, 4), current_frame=index)) + '\n')
+        f.write(json.dumps({"timestamp": 1700000000.0 + line_count, "job_id": RENDERING_STATUS["job_id"],
+                            "status": "Completed", "progress": 1.0}) + '\n')
+
+
+def bench_progress_file(config, work_dir):
+    results = []
+    callbacks = {'on_status_update': lambda status: None, 'on_trace_ready': lambda trace: None,
+                 'on_job_finished': lambda: None}
+    logic = AgentLogic({"agent_id": "bench-agent", "jobs_directory": work_dir}, callbacks)
+    for line_count in (QUICK_STAT_LINES if config["quick"] else STAT_LINES):
+        stat_path = os.path.join(work_dir, f"bench_{line_count}.stat")
+        write_stat_file(stat_path, line_count)
+        stats = measure(lambda: logic._check_progress_file(stat_path), repeat=config["repeat"], number=20)
+        results.append(result("agent.check_progress_file", {"lines": line_count}, stats,
+                              file_bytes=os.path.getsize(stat_path)))
+    return results
+
+
+def run(config):
+    work_dir = tempfile.mkdtemp(prefix='bench_agent_')
+    try:
+        return bench_broadcast(config, work_dir) + bench_progress_file(config, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
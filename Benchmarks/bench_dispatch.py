@@ -0,0 +1,86 @@
+"""
+DirectorLogic._check_queue_and_assign_jobs with large queues and many idle
+agents. Sockets are not involved: the per-job send thread is still started,
+but its target does nothing, so the timing covers idle-agent selection,
+queue pops, tracing and the queue snapshots sent to the UI.
+"""
+import os
+import shutil
+import tempfile
+from collections import deque
+
+from harness import measure, result
+import director
+from director import DirectorLogic
+from job_tracing import JobTracer
+from bench_job_factory import build_form_data
+from job_factory import JobFactory
+
+QUEUE_SIZES = (1000, 100000)
+AGENT_COUNTS = (10, 100, 1000)
+QUICK_QUEUE_SIZES = (1000, 10000)
+QUICK_AGENT_COUNTS = (10, 100)
+
+
+def create_director(work_dir):
+    """A DirectorLogic that loads no saved agents and keeps its files in work_dir."""
+    director.AGENTS_SAVE_FILE = os.path.join(work_dir, 'director_agents.json')
+    previous_dir = os.getcwd()
+    os.chdir(work_dir) # The render cache index is relative to the working directory
+    try:
+        events = {name: (lambda *args: None) for name in ('on_agent_connected', 'on_agent_disconnected',
+                                                          'on_agent_status_update', 'on_queue_update',
+                                                          'on_agent_preview')}
+        return DirectorLogic(lambda message: None, events)
+    finally:
+        os.chdir(previous_dir)
+
+
+def add_idle_agents(logic, count):
+    for index in range(count):
+        agent_id = f"bench-agent-{index:04d}"
+        logic.agents[agent_id] = {
+            'internal': {'socket': None},
+            'public': {"agent_id": agent_id, "ip": f"10.0.{index // 256}.{index % 256}:9999", "status": "Idle",
+                       "job_id": None, "progress": 0, "current_frame": 0, "timestamp": 0}
+        }
+
+
+def queue_shapes(seed, size):
+    """The same permutations as a lazy JobBatch and as a deque of expanded job dicts."""
+    sequences = max(1, size // 100)
+    job_batch_form = build_form_data(seed, sequences, 10, size // (sequences * 10))
+    expanded = list(JobFactory().create_job_batch(job_batch_form))
+    return {
+        "batch": lambda: deque([JobFactory().create_job_batch(job_batch_form)]),
+        "jobs": lambda: deque(expanded)
+    }
+
+
+def run(config):
+    results = []
+    work_dir = tempfile.mkdtemp(prefix='bench_dispatch_')
+    logic = create_director(work_dir)
+    logic._send_job_to_agent = lambda agent_id, job_dict: None
+
+    queue_sizes = QUICK_QUEUE_SIZES if config["quick"] else QUEUE_SIZES
+    agent_counts = QUICK_AGENT_COUNTS if config["quick"] else AGENT_COUNTS
+    for queue_size in queue_sizes:
+        for shape, build_queue in queue_shapes(config["seed"], queue_size).items():
+            for agent_count in agent_counts:
+                logic.agents.clear()
+                add_idle_agents(logic, agent_count)
+
+                def setup():
+                    logic.active_jobs.clear()
+                    logic.tracer = JobTracer() # Every benchmark job shares one trace_id; don't let it grow
+                    logic.job_queue = build_queue()
+
+                stats = measure(lambda state: logic._check_queue_and_assign_jobs(), setup=setup,
+                                repeat=config["repeat"])
+                results.append(result("director.check_queue_and_assign_jobs",
+                                      {"queue": queue_size, "shape": shape, "idle_agents": agent_count}, stats,
+                                      seconds_per_assignment=stats["median"] / min(queue_size, agent_count)))
+    logic.history.flush()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return results
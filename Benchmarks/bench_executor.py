@@ -0,0 +1,77 @@
+"""
+The render executor's on_begin_frame, which runs on the game thread every
+engine tick. Timed against the simulated `unreal` module with a pipeline
+held in PRODUCING_FRAMES, so only the executor's own Python cost is measured.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from harness import REPO_ROOT, measure, result
+
+# The executor imports 'unreal', which the simulator provides outside the editor.
+for source_dir in (os.path.join(REPO_ROOT, 'Simulator'),
+                   os.path.join(REPO_ROOT, 'Plugins', 'VirtualPlateRender', 'Content', 'Python')):
+    if source_dir not in sys.path:
+        sys.path.insert(0, source_dir)
+import unreal
+from RealisVirtualPlateRenderExecutor import RealisVirtualPlateRenderExecutor
+from RealisProgressReporter import ProgressReporter
+
+FRAMES = 1000
+
+# What each tick does besides the state check:
+# steady - the same frame as the last tick, no status due;
+# frame_boundary - a new frame, so a trace span and a ledger line are written;
+# report - a status line is due on every tick.
+TICK_KINDS = ("steady", "frame_boundary", "report")
+
+
+def create_executor(work_dir):
+    executor = RealisVirtualPlateRenderExecutor()
+    executor.reporter = ProgressReporter(os.path.join(work_dir, 'bench.stat'), os.path.join(work_dir, 'bench.trace'),
+                                         os.path.join(work_dir, 'bench.ledger'))
+    executor.job_id = "bench"
+    executor.render_passes_json = json.dumps([{"camera": None, "variant": None, "scene_settings": {},
+                                               "output_path": work_dir}])
+    executor.render_pass_count = 1
+    executor.pass_frames_total = FRAMES
+    pipeline = unreal.MovieGraphPipeline()
+    pipeline._frames = list(range(FRAMES))
+    pipeline._state = unreal.MovieRenderPipelineState.PRODUCING_FRAMES
+    executor.active_movie_pipeline = pipeline
+    executor.is_graph_pipeline = True
+    return executor, pipeline
+
+
+def bench_tick(kind, config, work_dir):
+    executor, pipeline = create_executor(work_dir)
+    reporter = executor.reporter
+    if kind == "report":
+        reporter.min_interval = reporter.min_delta = 0.0
+        reporter.last_progress = -2.0
+    else:
+        reporter.min_interval = float('inf')
+
+    def tick():
+        if kind == "frame_boundary":
+            pipeline._frame_index = (pipeline._frame_index + 1) % FRAMES
+        elif kind == "report":
+            reporter.last_progress = -2.0 # Progress barely moves between ticks; force the write
+        executor.on_begin_frame()
+
+    try:
+        stats = measure(tick, repeat=config["repeat"], number=2000)
+    finally:
+        reporter.close()
+    return result("executor.on_begin_frame", {"tick": kind}, stats, microseconds=round(stats["median"] * 1e6, 2))
+
+
+def run(config):
+    work_dir = tempfile.mkdtemp(prefix='bench_executor_')
+    try:
+        return [bench_tick(kind, config, work_dir) for kind in TICK_KINDS]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
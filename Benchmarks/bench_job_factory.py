@@ -0,0 +1,63 @@
+"""JobFactory.create_job_batch and JobBatch expansion at 10^3 - 10^6 permutations."""
+import random
+
+from harness import measure, result
+from job_factory import JobFactory
+
+# (sequences, scene presets, resolutions) per permutation count; one camera per sequence.
+SWEEP_SHAPES = {
+    1000: (10, 10, 10),
+    10000: (25, 20, 20),
+    100000: (50, 50, 40),
+    1000000: (100, 100, 100)
+}
+QUICK_SIZES = (1000, 10000)
+
+# Jobs expanded per timing repeat; indices are strided across the whole batch.
+EXPAND_SAMPLE = 2000
+
+
+def build_form_data(seed, sequence_count, scene_count, resolution_count):
+    """A submission like the Job Factory form sends, with seeded preset values."""
+    rng = random.Random(seed)
+    return {
+        "project_path": "D:/Projects/VirtualPlates/VirtualPlates.uproject",
+        "graph_path": "/Game/Graphs/PlateGraph",
+        "level_path": "/Game/Maps/PlateLevel",
+        "frame_start": 0, "frame_end": 239,
+        "sequences": [{"path": f"/Game/Sequences/Shot_{index:04d}", "cameras": [f"CineCamera_{index % 4}"]}
+                      for index in range(sequence_count)],
+        "scene_presets": [{"enabled": True, "settings": {"time_of_day": round(rng.uniform(0, 24), 2),
+                                                         "cloud_coverage": round(rng.random(), 3)}}
+                          for _ in range(scene_count)],
+        "resolution_presets": [{"enabled": True, "res_x": 640 + 32 * index, "res_y": 360 + 18 * index}
+                               for index in range(resolution_count)],
+        "use_render_cache": True,
+        "trace_id": "benchmark"
+    }
+
+
+def run(config):
+    results = []
+    factory = JobFactory()
+    sizes = QUICK_SIZES if config["quick"] else sorted(SWEEP_SHAPES)
+    for size in sizes:
+        form_data = build_form_data(config["seed"], *SWEEP_SHAPES[size])
+
+        stats = measure(lambda: factory.create_job_batch(form_data), repeat=config["repeat"], number=5)
+        results.append(result("job_factory.create_job_batch", {"permutations": size}, stats))
+
+        job_batch = factory.create_job_batch(form_data)
+        stride = max(1, len(job_batch) // EXPAND_SAMPLE)
+        indices = list(range(0, len(job_batch), stride))[:EXPAND_SAMPLE]
+
+        def expand():
+            for index in indices:
+                job_batch.job_at(index)
+
+        stats = measure(expand, repeat=config["repeat"])
+        per_job = stats["median"] / len(indices)
+        results.append(result("job_factory.job_at", {"permutations": size}, stats,
+                              jobs_per_repeat=len(indices), seconds_per_job=per_job,
+                              full_expansion_seconds=per_job * len(job_batch)))
+    return results
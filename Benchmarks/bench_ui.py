@@ -0,0 +1,47 @@
+"""
+UI payload construction in director_ui.on_agent_status_update. Importing
+director_ui starts Flask and connects to the saved agents, so the payload is
+built here the same way: a get_all_agents() snapshot, the agent's own entry
+copied, then JSON-encoded as SocketIO does before sending.
+"""
+import json
+import shutil
+import tempfile
+import time
+
+from harness import measure, result
+from bench_dispatch import create_director, add_idle_agents
+
+AGENT_COUNTS = (10, 100, 1000, 5000)
+QUICK_AGENT_COUNTS = (10, 100, 1000)
+
+
+def build_agent_update_payload(logic, agent_id):
+    all_agents_status = logic.get_all_agents()
+    payload = all_agents_status.get(agent_id, {}).copy()
+    payload['all_agents'] = all_agents_status
+    return payload
+
+
+def run(config):
+    results = []
+    work_dir = tempfile.mkdtemp(prefix='bench_ui_')
+    try:
+        logic = create_director(work_dir)
+        for agent_count in (QUICK_AGENT_COUNTS if config["quick"] else AGENT_COUNTS):
+            logic.agents.clear()
+            add_idle_agents(logic, agent_count)
+            agent_id = "bench-agent-0000"
+            logic.agents[agent_id]['public'].update(status="Rendering", progress=0.5, timestamp=time.time())
+
+            stats = measure(lambda: build_agent_update_payload(logic, agent_id), repeat=config["repeat"], number=20)
+            results.append(result("ui.agent_update_payload", {"agents": agent_count, "encode": False}, stats))
+
+            encoded = json.dumps(build_agent_update_payload(logic, agent_id))
+            stats = measure(lambda: json.dumps(build_agent_update_payload(logic, agent_id)),
+                            repeat=config["repeat"], number=20)
+            results.append(result("ui.agent_update_payload", {"agents": agent_count, "encode": True}, stats,
+                                  payload_bytes=len(encoded)))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
@@ -0,0 +1,80 @@
+import gc
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+# The Director and Agent are run as scripts from their own folders, so their modules import flat.
+for source_dir in ('Director', 'Agent'):
+    path = os.path.join(REPO_ROOT, source_dir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def measure(func, setup=None, repeat=5, number=1, warmup=1):
+    """
+    Times func the way timeit does, but with a fresh setup before every repeat.
+    :param setup: Called (untimed) before each repeat; its return value is passed to func.
+    :param number: Calls of func per repeat; the stats are per call.
+    :return: Per-call seconds: {min, median, mean, max, stdev, repeat, number}.
+    """
+    for _ in range(warmup):
+        state = setup() if setup else None
+        func(state) if setup else func()
+
+    timings = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        gc_was_enabled = gc.isenabled()
+        gc.disable() # Collections triggered by earlier garbage would land in random repeats
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                func(state) if setup else func()
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        timings.append(elapsed / number)
+
+    return {
+        "min": min(timings), "median": statistics.median(timings), "mean": statistics.mean(timings),
+        "max": max(timings), "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "repeat": repeat, "number": number
+    }
+
+
+def result(name, params, stats, **extra):
+    """One benchmark result row. name + params identify it when comparing against a baseline."""
+    row = {"name": name, "params": params, "stats": stats}
+    row.update(extra)
+    return row
+
+
+def result_key(row):
+    params = ','.join(f"{key}={row['params'][key]}" for key in sorted(row['params']))
+    return f"{row['name']}[{params}]"
+
+
+def environment_info():
+    """Where the numbers came from, so results from different machines are not compared blindly."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
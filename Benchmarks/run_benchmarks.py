@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Runs the control-plane benchmarks and stores the results as JSON.
+
+    python Benchmarks/run_benchmarks.py                       # full suite, results/<timestamp>.json
+    python Benchmarks/run_benchmarks.py --quick --suite dispatch
+    python Benchmarks/run_benchmarks.py --compare results/baseline.json --threshold 0.2
+
+Inputs are generated from a fixed seed, so two runs on the same machine time
+the same work. --compare matches results by name and parameters and reports
+the change in median time; it exits with 1 if anything got slower than the
+threshold allows.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+from harness import BENCHMARKS_DIR, environment_info, result_key
+
+SUITES = {
+    "job_factory": "bench_job_factory",
+    "dispatch": "bench_dispatch",
+    "agent": "bench_agent",
+    "ui": "bench_ui",
+    "executor": "bench_executor"
+}
+
+
+def compare(results, baseline, threshold):
+    """
+    :return: (rows, regressions). Each row is (key, baseline median, median, ratio).
+    """
+    baseline_rows = {result_key(row): row for row in baseline.get('results', [])}
+    rows, regressions = [], []
+    for row in results:
+        key = result_key(row)
+        if key not in baseline_rows:
+            continue
+        before, after = baseline_rows[key]['stats']['median'], row['stats']['median']
+        ratio = after / before if before else float('inf')
+        rows.append((key, before, after, ratio))
+        if ratio > 1 + threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the farm control-plane hot paths.")
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help="Run only this suite (repeatable). Default: all")
+    parser.add_argument('--quick', action='store_true', help="Smaller sizes, for a fast smoke run")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5, help="Timed repeats per benchmark")
+    parser.add_argument('--output', help="Results file. Default: Benchmarks/results/<timestamp>.json")
+    parser.add_argument('--compare', help="A previous results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Relative slowdown of the median that counts as a regression")
+    args = parser.parse_args()
+
+    config = {"quick": args.quick, "seed": args.seed, "repeat": args.repeat}
+    results = []
+    for suite in args.suite or list(SUITES):
+        print(f"Running {suite} benchmarks...")
+        suite_start = time.time()
+        for row in importlib.import_module(SUITES[suite]).run(config):
+            print(f"  {result_key(row):<75} median {row['stats']['median'] * 1000:10.3f} ms")
+            results.append(row)
+        print(f"  ({time.time() - suite_start:.1f}s)")
+
+    output_path = args.output or os.path.join(BENCHMARKS_DIR, 'results', f"{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({"environment": environment_info(), "config": config, "results": results}, f, indent=2)
+    print(f"Results written to {output_path}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare, 'r') as f:
+        baseline = json.load(f)
+    if baseline.get('environment', {}).get('platform') != environment_info()['platform']:
+        print("Warning: The baseline was recorded on a different platform.")
+    rows, regressions = compare(results, baseline, args.threshold)
+    print(f"\nCompared with {args.compare}:")
+    for key, before, after, ratio in rows:
+        flag = '  REGRESSION' if key in regressions else ''
+        print(f"  {key:<75} {before * 1000:10.3f} -> {after * 1000:10.3f} ms ({ratio:5.2f}x){flag}")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slowed down by more than {args.threshold:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Turns the performance profiles agents advertise (frames/sec per resolution
+class, measured by 'calibration' jobs) into speed scores and job time
+estimates, for speed-weighted dispatch and ETAs.
+"""
+import math
+
+# Must match Agent/agent_profile.py; profiles from another version are re-measured.
+CALIBRATION_VERSION = 1
+
+# Agents are ranked by their frames/sec at this resolution.
+REFERENCE_RESOLUTION = (1920, 1080)
+
+# How many queued jobs are matched against idle agents at once, so long jobs can wait for fast agents.
+SPEED_LOOKAHEAD = 8
+
+# A job passed over this many times goes to the next idle agent, however slow.
+MAX_PASSED_OVER = 4
+
+# Frame count assumed for a sequence until a finished job has shown how long it is.
+DEFAULT_SEQUENCE_FRAMES = 100
+
+# Job types that render frames in Unreal; everything else is a short post-process.
+RENDER_JOB_TYPES = (None, 'render')
+
+
+def needs_calibration(agent_public):
+    """True if a connected agent supports calibration but has no current profile for its hardware."""
+    hardware_id = agent_public.get('hardware_id')
+    if hardware_id is None:
+        return False # An agent from before profiles existed
+    profile = agent_public.get('profile')
+    return (not profile or not profile.get('classes') or profile.get('hardware_id') != hardware_id
+            or profile.get('version') != CALIBRATION_VERSION)
+
+
+def agent_fps(profile, resolution):
+    """
+    Frames/sec a profiled agent is expected to render at 'resolution'. Pixel
+    throughput is interpolated between the measured classes on a log-pixel
+    scale and held flat beyond them.
+    :return: Frames/sec, or None if the profile has no measurements.
+    """
+    if not profile or not resolution:
+        return None
+    points = []
+    for result in profile.get('classes', {}).values():
+        if result.get('fps'):
+            class_pixels = result['resolution'][0] * result['resolution'][1]
+            points.append((class_pixels, result['fps'] * class_pixels))
+    points.sort()
+    if not points:
+        return None
+    pixels = max(1, resolution[0] * resolution[1])
+    if pixels <= points[0][0]:
+        rate = points[0][1]
+    elif pixels >= points[-1][0]:
+        rate = points[-1][1]
+    else:
+        (low_pixels, low_rate), (high_pixels, high_rate) = next(
+            (points[i], points[i + 1]) for i in range(len(points) - 1) if pixels <= points[i + 1][0])
+        weight = math.log(pixels / low_pixels) / math.log(high_pixels / low_pixels)
+        rate = low_rate + weight * (high_rate - low_rate)
+    return rate / pixels
+
+
+def speed_score(profile):
+    return agent_fps(profile, REFERENCE_RESOLUTION)
+
+
+def job_passes(job):
+    """Unreal renders a job once per camera and per scene variant."""
+    return max(1, len(job.get('camera_actor_names') or [None])) * max(1, len(job.get('scene_variants') or [None]))
+
+
+def job_frames(job, sequence_frames):
+    """
+    :param sequence_frames: {sequence_path: frames} learned from finished jobs.
+    """
+    if job.get('frame_set'):
+        return len(job['frame_set'])
+    frame_range = job.get('frame_range')
+    if frame_range:
+        return frame_range[1] - frame_range[0] + 1
+    return sequence_frames.get(job.get('sequence_path'), DEFAULT_SEQUENCE_FRAMES)
+
+
+def estimate_job_work(job, sequence_frames):
+    """Relative size of a job in rendered pixels; post-process jobs count as no work."""
+    if job.get('job_type') not in RENDER_JOB_TYPES or not job.get('resolution'):
+        return 0
+    resolution = job['resolution']
+    return job_frames(job, sequence_frames) * job_passes(job) * resolution[0] * resolution[1]
+
+
+def estimate_job_seconds(job, profile, sequence_frames):
+    """Expected render time of a job on an agent with 'profile', or None if it can't be estimated."""
+    if job.get('job_type') not in RENDER_JOB_TYPES:
+        return None
+    fps = agent_fps(profile, job.get('resolution'))
+    if not fps:
+        return None
+    return job_frames(job, sequence_frames) * job_passes(job) / fps
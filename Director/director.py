@@ -2,10 +2,21 @@ import socket
 import threading
 import json
 import os
+import time
 from collections import deque
+from job_tracing import JobTracer
+from job_history import JobHistory
+from job_factory import JobBatch
+from render_cache import RenderCache
+from output_verifier import OutputVerifier
+from agent_profiles import (SPEED_LOOKAHEAD, MAX_PASSED_OVER, needs_calibration, speed_score, estimate_job_work,
+                            estimate_job_seconds)
 
 AGENTS_SAVE_FILE = 'director_agents.json'
 
+# How many rounds of repair sub-jobs a job may spawn before it is reported as failed.
+MAX_REPAIR_ATTEMPTS = 2
+
 class DirectorLogic:
     """
     Handles all the backend logic for the Director, including state management,
@@ -15,8 +26,26 @@ class DirectorLogic:
         self.log = log_callback
         self.events = event_callbacks
         self.agents = {}
-        self.job_queue = deque() # Using deque for an efficient queue
+        self.job_queue = deque() # Job dicts and lazily expanded JobBatch entries
+        self.active_jobs = {} # agent_id -> job dict currently running there
+        self.waiting_jobs = {} # job_id -> job dict blocked on unfinished dependencies
+        self.unmet_dependencies = {} # waiting job_id -> set of job_ids it still needs
+        self.dependents_of = {} # job_id -> list of waiting job_ids that need it
+        self.pinned_jobs = {} # agent_id -> job only that agent may run (calibration), ahead of the queue
+        self.calibration_requested = {} # agent_id -> hardware_id a calibration was already queued for
+        self.job_estimates = {} # agent_id -> (started_at, estimated seconds) of the job it is running
+        self.passed_over = {} # job_id -> times speed-weighted placement gave other jobs precedence
+        self.sequence_frames = {} # sequence_path -> frame count, learned from finished jobs
+        self.held_batches = {} # batch_id -> JobBatch of finals waiting for review of their drafts
+        self.draft_batches = {} # draft batch_id -> the final JobBatch its drafts preview
+        self.coverage_batches = {} # batch_id -> JobBatch rendering progressively, until all its frames are in
+        self.pending_repairs = {} # job_id -> {"job": job dict, "repairs": repair job_ids still to finish}
         self.agents_lock = threading.Lock()
+        self.tracer = JobTracer()
+        self.history = JobHistory() # Input for offline scheduling replays (Simulator/replay_sim.py)
+        self.render_cache = RenderCache()
+        self.output_verifier = OutputVerifier()
+        self.latest_previews = {} # agent_id -> last 'preview' message, replayed to newly opened UIs
         self._load_and_connect_agents()
 
     # --- Public Methods ---
@@ -25,35 +54,175 @@ class DirectorLogic:
         with self.agents_lock:
             return {agent_id: data['public'] for agent_id, data in self.agents.items()}
 
+    def get_latest_previews(self):
+        with self.agents_lock:
+            return list(self.latest_previews.values())
+
     def get_job_queue(self):
+        """Returns a UI-friendly view of the queue. Batches appear as one summary entry."""
+        with self.agents_lock:
+            queue = [entry.summary() if isinstance(entry, JobBatch) else entry for entry in self.job_queue]
+            return queue + [batch.summary() for batch in self.held_batches.values()]
+
+    def get_coverage_progress(self):
+        """Frames rendered and the finest fully covered stride of every progressive batch still rendering."""
+        with self.agents_lock:
+            return [dict(batch.coverage_progress(), batch_id=batch.batch_id) for batch in self.coverage_batches.values()]
+
+    def get_queued_job_count(self):
+        with self.agents_lock:
+            return sum(entry.remaining() if isinstance(entry, JobBatch) else 1 for entry in self.job_queue)
+
+    def get_agent_file_server_url(self, agent_id):
+        """Returns the base URL of an agent's output file server, or None if it does not run one."""
         with self.agents_lock:
-            return list(self.job_queue)
+            agent_info = self.agents.get(agent_id)
+            if not agent_info or not agent_info['public'].get('file_server_port'):
+                return None
+            host = agent_info['public']['ip'].split(':')[0]
+            return f"http://{host}:{agent_info['public']['file_server_port']}"
 
     def add_job_to_queue(self, job_dict):
         """Adds a new job to the queue and tries to dispatch it."""
         with self.agents_lock:
             self.job_queue.append(job_dict)
+            self.tracer.begin(job_dict.get('trace_id'), job_dict['job_id'], 'queued')
+            self.history.record_queued(job_dict)
             self.log(f"Job '{job_dict['job_id']}' added to the queue. Queue size: {len(self.job_queue)}")
         
         # Notify UI about the queue change and then try to assign jobs.
-        self.events['on_queue_update'](list(self.job_queue))
+        self.events['on_queue_update'](self.get_job_queue())
         self._check_queue_and_assign_jobs()
 
     def add_job_batch_to_queue(self, job_batch):
-        """Adds a batch of new jobs to the queue and then tries to dispatch them."""
+        """
+        Adds a batch of new jobs to the queue and then tries to dispatch them.
+        :param job_batch: A JobBatch, which is queued as a single lazy entry and
+                          expanded one job at a time, or a list of job dicts.
+        """
         if not job_batch:
             return
 
         with self.agents_lock:
-            for job_dict in job_batch:
-                self.job_queue.append(job_dict)
-            self.log(f"Added batch of {len(job_batch)} jobs. New queue size: {len(self.job_queue)}")
+            resolve_from_cache = False
+            if isinstance(job_batch, JobBatch):
+                # Drafts go ahead of the finals they preview; held finals wait for release_batch().
+                for batch in filter(None, (job_batch.draft_batch, job_batch)):
+                    batch.enqueued_at = time.time()
+                    if batch.held:
+                        self.held_batches[batch.batch_id] = batch
+                    else:
+                        self.job_queue.append(batch)
+                    for batch_job in batch.batch_jobs:
+                        self._register_waiting_job(batch_job)
+                    if batch.coverage_chunks:
+                        self.coverage_batches[batch.batch_id] = batch
+                if job_batch.draft_batch:
+                    self.draft_batches[job_batch.draft_batch.batch_id] = job_batch
+                resolve_from_cache = job_batch.asset_hashes is not None and not self.render_cache.is_empty()
+            else:
+                for job_dict in job_batch:
+                    self.job_queue.append(job_dict)
+                    self.tracer.begin(job_dict.get('trace_id'), job_dict['job_id'], 'queued')
+                    self.history.record_queued(job_dict)
+            self.log(f"Added batch of {len(job_batch)} jobs. Queue now holds {len(self.job_queue)} entries.")
         
+        # Satisfy already-rendered permutations without waiting for an idle agent.
+        if resolve_from_cache:
+            for batch in filter(None, (job_batch.draft_batch, job_batch)):
+                threading.Thread(target=self._resolve_cached_batch, args=(batch,)).start()
+
         # Notify UI about the queue change once after adding the whole batch.
-        self.events['on_queue_update'](list(self.job_queue))
+        self.events['on_queue_update'](self.get_job_queue())
         # And then try to assign jobs once.
         self._check_queue_and_assign_jobs()
 
+    def estimate_queue_seconds(self):
+        """
+        Rough time until the queue drains: the queued work at the fleet's median
+        speed plus what is left of running jobs, spread over connected agents.
+        :return: Seconds, or None until at least one agent has been calibrated.
+        """
+        with self.agents_lock:
+            profiles = [data['public'].get('profile') for data in self.agents.values()]
+            speeds = sorted((speed_score(profile), profile) for profile in profiles if speed_score(profile))
+            if not speeds:
+                return None
+            median_profile = speeds[len(speeds) // 2][1]
+            total_seconds = 0
+            for entry in self.job_queue:
+                if isinstance(entry, JobBatch):
+                    if not entry.remaining():
+                        continue
+                    sample, count = entry.job_at(0), entry.remaining()
+                else:
+                    sample, count = entry, 1
+                total_seconds += (estimate_job_seconds(sample, median_profile, self.sequence_frames) or 0) * count
+            now = time.time()
+            for started_at, estimate in self.job_estimates.values():
+                total_seconds += max(0, estimate - (now - started_at))
+            return total_seconds / len(self.agents)
+
+    def request_calibration(self, agent_id):
+        """Has an agent render the calibration sequence before its next job."""
+        with self.agents_lock:
+            if agent_id not in self.agents:
+                self.log(f"Could not calibrate: Agent {agent_id} not found.")
+                return
+            self._pin_calibration_job(agent_id)
+        self._check_queue_and_assign_jobs()
+
+    def release_batch(self, batch_id):
+        """Queues a batch of finals that was held for draft review."""
+        with self.agents_lock:
+            job_batch = self.held_batches.pop(batch_id, None)
+            if job_batch is None:
+                self.log(f"Could not release: Batch '{batch_id}' is not held.")
+                return
+            job_batch.held = False
+            job_batch.enqueued_at = time.time()
+            self.job_queue.append(job_batch)
+            self.log(f"Released batch '{batch_id}' ({job_batch.remaining()} jobs).")
+        self.events['on_queue_update'](self.get_job_queue())
+        self._check_queue_and_assign_jobs()
+
+    def reject_drafts(self, draft_job_ids):
+        """
+        Drops the final renders of the combinations whose drafts were rejected,
+        as long as they have not been dispatched yet. Jobs waiting on a dropped
+        final (stitches, contact sheets) are released as if it had failed.
+        """
+        dropped_job_ids = []
+        with self.agents_lock:
+            # Jobs already taken from a batch are back in the queue as dicts if placement passed them over.
+            queued_jobs = {entry['job_id']: entry for entry in self.job_queue if not isinstance(entry, JobBatch)}
+            for draft_job_id in draft_job_ids:
+                draft_batch_id, _, draft_index = draft_job_id.rpartition('_')
+                job_batch = self.draft_batches.get(draft_batch_id)
+                if job_batch is None or not draft_index.isdigit():
+                    self.log(f"Could not reject '{draft_job_id}': it is not a draft job.")
+                    continue
+                for index in job_batch.final_indices_for_draft(int(draft_index)):
+                    if index in job_batch.resolved_indices:
+                        continue # Rejected before, or already in the render cache
+                    job_id = job_batch.job_at(index)['job_id']
+                    if index < job_batch.next_index:
+                        queued_job = queued_jobs.pop(job_id, None)
+                        if queued_job is None:
+                            self.log(f"The final of draft '{draft_job_id}' has already been dispatched.")
+                            continue
+                        self.job_queue.remove(queued_job)
+                        self.passed_over.pop(job_id, None)
+                        self.tracer.discard(queued_job.get('trace_id'), job_id)
+                    else:
+                        job_batch.mark_resolved(index)
+                    dropped_job_ids.append(job_id)
+        for job_id in dropped_job_ids:
+            self._release_dependent_jobs(job_id, succeeded=False)
+        if dropped_job_ids:
+            self.log(f"Rejected drafts; dropped {len(dropped_job_ids)} final job(s).")
+            self.events['on_queue_update'](self.get_job_queue())
+
     def connect_to_agent(self, ip_port_str):
         if not ip_port_str: return
         self.log(f"UI requested connection to agent: {ip_port_str}")
@@ -80,32 +249,362 @@ class DirectorLogic:
 
     def _check_queue_and_assign_jobs(self):
         """Finds idle agents and assigns them jobs from the queue."""
+        cache_hits = []
         with self.agents_lock:
-            if not self.job_queue:
-                return # Nothing to do if queue is empty
-
-            # Find all idle agents
+            # Find all idle agents. An agent still reports Idle until its Starting status
+            # arrives, so agents with a job already assigned are skipped.
             idle_agents = [
                 agent_id for agent_id, data in self.agents.items()
-                if data['public'].get('status') == 'Idle'
+                if data['public'].get('status') == 'Idle' and agent_id not in self.active_jobs
             ]
 
+            # Agents without a profile for their current hardware calibrate before taking work.
             for agent_id in idle_agents:
-                if not self.job_queue:
-                    break # Stop if we run out of jobs
-                
-                job_to_assign = self.job_queue.popleft()
-                self.log(f"Found idle agent '{agent_id}'. Assigning job '{job_to_assign['job_id']}'.")
-                
-                # We need to call the actual socket send in a new thread
-                # to avoid holding the lock during a network operation.
-                threading.Thread(target=self._send_job_to_agent, args=(agent_id, job_to_assign)).start()
+                public = self.agents[agent_id]['public']
+                if (agent_id not in self.pinned_jobs and needs_calibration(public)
+                        and self.calibration_requested.get(agent_id) != public.get('hardware_id')):
+                    self._pin_calibration_job(agent_id)
+            for agent_id in [agent_id for agent_id in idle_agents if agent_id in self.pinned_jobs]:
+                idle_agents.remove(agent_id)
+                self._assign_job(agent_id, self.pinned_jobs.pop(agent_id))
+
+            if not self.job_queue:
+                return # Nothing to do if queue is empty
+
+            for agent_id, job_to_assign in self._place_jobs(idle_agents, cache_hits):
+                self.tracer.end(job_to_assign.get('trace_id'), job_to_assign['job_id'], 'queued', {'agent_id': agent_id})
+                self._assign_job(agent_id, job_to_assign)
         
+        # Cache hits found while popping are copied outside the lock.
+        if cache_hits:
+            threading.Thread(target=self._complete_jobs_from_cache, args=(cache_hits,)).start()
+
         # After assignments, notify UI of the queue change
-        self.events['on_queue_update'](list(self.job_queue))
+        self.events['on_queue_update'](self.get_job_queue())
+
+    def _assign_job(self, agent_id, job_to_assign):
+        """Marks a job as running on an agent and sends it. Must hold agents_lock."""
+        self.active_jobs[agent_id] = job_to_assign
+        estimate = estimate_job_seconds(job_to_assign, self.agents[agent_id]['public'].get('profile'),
+                                        self.sequence_frames)
+        if estimate:
+            self.job_estimates[agent_id] = (time.time(), estimate)
+        self.log(f"Found idle agent '{agent_id}'. Assigning job '{job_to_assign['job_id']}'.")
+
+        # We need to call the actual socket send in a new thread
+        # to avoid holding the lock during a network operation.
+        threading.Thread(target=self._send_job_to_agent, args=(agent_id, job_to_assign)).start()
+
+    def _pin_calibration_job(self, agent_id):
+        """Queues a calibration job that only 'agent_id' will run. Must hold agents_lock."""
+        hardware_id = self.agents[agent_id]['public'].get('hardware_id')
+        self.calibration_requested[agent_id] = hardware_id
+        self.pinned_jobs[agent_id] = {
+            "job_id": f"calibrate_{agent_id}_{int(time.time())}", "job_type": "calibration",
+            "target_agent": agent_id
+        }
+        self.log(f"Agent '{agent_id}' (hardware {hardware_id}) will be calibrated before its next job.")
+
+    def _place_jobs(self, idle_agents, cache_hits):
+        """
+        Pairs idle agents with queued jobs. Once agents have been calibrated,
+        up to SPEED_LOOKAHEAD jobs are considered together and each idle agent
+        takes the job whose size rank matches its speed rank in the fleet, so
+        the longest jobs go to the fastest agents. Jobs left over go back to
+        the front of the queue in their original order. Must hold agents_lock.
+        :return: A list of (agent_id, job) pairs.
+        """
+        speeds = {agent_id: speed_score(data['public'].get('profile')) for agent_id, data in self.agents.items()}
+        known_speeds = sorted(speed for speed in speeds.values() if speed)
+        if not known_speeds or not idle_agents:
+            placements = []
+            for agent_id in idle_agents:
+                job = self._pop_next_job(cache_hits)
+                if job is None:
+                    break # Stop if we run out of jobs
+                placements.append((agent_id, job))
+            return placements
+
+        # Agents that have not been calibrated yet are treated as average.
+        median_speed = known_speeds[len(known_speeds) // 2]
+        fleet_speeds = sorted((speed or median_speed for speed in speeds.values()), reverse=True)
+        window = []
+        while len(window) < max(len(idle_agents), SPEED_LOOKAHEAD):
+            job = self._pop_next_job(cache_hits)
+            if job is None:
+                break
+            window.append(job)
+
+        # Jobs passed over too often are handed out first, regardless of size.
+        overdue = [job for job in window if self.passed_over.get(job['job_id'], 0) >= MAX_PASSED_OVER]
+        by_work = overdue + sorted((job for job in window if job not in overdue),
+                                   key=lambda job: estimate_job_work(job, self.sequence_frames), reverse=True)
+        placements = []
+        for agent_id in sorted(idle_agents, key=lambda agent_id: speeds[agent_id] or median_speed, reverse=True):
+            if not by_work:
+                break
+            if overdue:
+                job = overdue.pop(0)
+            else:
+                # The fraction of the fleet that is faster than this agent picks the job's rank.
+                speed = speeds[agent_id] or median_speed
+                faster = sum(1 for other in fleet_speeds if other > speed) / len(fleet_speeds)
+                job = by_work[min(len(by_work) - 1, int(faster * len(by_work)))]
+            by_work.remove(job)
+            placements.append((agent_id, job))
+
+        placed = {id(job) for _, job in placements}
+        for job in reversed(window):
+            if id(job) not in placed:
+                self.passed_over[job['job_id']] = self.passed_over.get(job['job_id'], 0) + 1
+                self.job_queue.appendleft(job)
+        for _, job in placements:
+            self.passed_over.pop(job['job_id'], None)
+        return placements
+
+    def _pop_next_job(self, cache_hits):
+        """
+        Removes and returns the next job to dispatch, expanding it from the
+        batch at the head of the queue if necessary. Must hold agents_lock.
+        :param cache_hits: Jobs skipped because their outputs are already in the
+                           render cache are appended here as (job, entry) pairs.
+        """
+        while self.job_queue:
+            head = self.job_queue[0]
+            if isinstance(head, JobBatch):
+                job = head.take_next()
+                if job is None:
+                    self.job_queue.popleft() # Batch exhausted
+                    continue
+                # Jobs expanded from a batch have been waiting since the batch was queued.
+                self.tracer.add_span(job.get('trace_id'), job['job_id'], 'queued', head.enqueued_at, time.time())
+                self.history.record_queued(job, head.enqueued_at)
+            else:
+                job = self.job_queue.popleft()
+
+            self._register_dependent_jobs(job)
+            # Index only: the outputs may be on a share, so materialize() checks them outside the lock.
+            cache_entry = self.render_cache.lookup(job.get('fingerprint'), check_outputs=False)
+            if cache_entry:
+                cache_hits.append((job, cache_entry))
+                continue
+            return job
+        return None
+
+    def _resolve_cached_batch(self, job_batch):
+        """
+        Walks a freshly queued batch and completes every permutation whose
+        fingerprint is already in the render cache, so only new combinations
+        are ever dispatched.
+        """
+        cache_hits = []
+        for index in range(len(job_batch)):
+            job = job_batch.job_at(index)
+            cache_entry = self.render_cache.lookup(job.get('fingerprint'))
+            if not cache_entry:
+                continue
+            with self.agents_lock:
+                if index < job_batch.next_index:
+                    continue # Already dispatched (or caught by _pop_next_job)
+                job_batch.mark_resolved(index)
+                self._register_dependent_jobs(job)
+            cache_hits.append((job, cache_entry))
+
+        if cache_hits:
+            self._complete_jobs_from_cache(cache_hits)
+            self.events['on_queue_update'](self.get_job_queue())
+
+    def _complete_jobs_from_cache(self, cache_hits):
+        """Copies cached outputs into each job's output path. Jobs whose outputs are gone are re-queued."""
+        requeued = False
+        for job, cache_entry in cache_hits:
+            try:
+                placed = self.render_cache.materialize(cache_entry, job['output_path'])
+                self.tracer.add_span(job.get('trace_id'), job['job_id'], 'cache_hit', time.time(),
+                                     args={'source_job_id': cache_entry['job_id'], 'files': placed})
+                self._record_coverage(job)
+                self._release_dependent_jobs(job['job_id'], succeeded=True)
+            except OSError as e:
+                self.log(f"Render cache copy failed for job '{job['job_id']}': {e}. Queuing it for rendering.")
+                self.render_cache.invalidate(job['fingerprint'])
+                with self.agents_lock:
+                    self.job_queue.appendleft(job)
+                requeued = True
+        self.log(f"Resolved {len(cache_hits)} job(s) from the render cache without rendering.")
+        if requeued:
+            self._check_queue_and_assign_jobs()
+
+    def _register_dependent_jobs(self, job):
+        """
+        Moves the jobs that depend on 'job' (e.g. derive jobs of a max-resolution
+        render) into the waiting set. Must hold agents_lock.
+        """
+        for dependent in job.pop('dependent_jobs', None) or []:
+            self._register_waiting_job(dependent)
+
+    def _register_waiting_job(self, job):
+        """Parks a job until every job in its depends_on list has finished. Must hold agents_lock."""
+        job_id = job['job_id']
+        self.waiting_jobs[job_id] = job
+        self.unmet_dependencies[job_id] = set(job.get('depends_on', []))
+        for dependency_id in self.unmet_dependencies[job_id]:
+            self.dependents_of.setdefault(dependency_id, []).append(job_id)
+
+    def _release_dependent_jobs(self, finished_job_id, succeeded):
+        """
+        Called when a job finishes. Dependents whose requirements are now all met
+        go to the front of the queue. If the job failed they are dropped, unless
+        they are marked allow_failed_dependencies (e.g. contact sheets), and the
+        jobs waiting on a dropped job are released in turn.
+        """
+        ready_jobs, dropped_jobs = [], []
+        with self.agents_lock:
+            for dependent_id in self.dependents_of.pop(finished_job_id, []):
+                unmet = self.unmet_dependencies.get(dependent_id)
+                if unmet is None:
+                    continue # Already dropped because of another failed dependency
+                if not succeeded and not self.waiting_jobs[dependent_id].get('allow_failed_dependencies'):
+                    dropped_jobs.append(self.waiting_jobs.pop(dependent_id))
+                    del self.unmet_dependencies[dependent_id]
+                    continue
+                unmet.discard(finished_job_id)
+                if not unmet:
+                    del self.unmet_dependencies[dependent_id]
+                    ready_jobs.append(self.waiting_jobs.pop(dependent_id))
+
+            for job in reversed(ready_jobs):
+                self.job_queue.appendleft(job)
+                self.tracer.begin(job.get('trace_id'), job['job_id'], 'queued')
+                self.history.record_queued(job)
+
+        for job in dropped_jobs:
+            self.log(f"Dropping job '{job['job_id']}' because '{finished_job_id}' did not complete.")
+            self.tracer.discard(job.get('trace_id'), job['job_id'])
+            # A dropped job never finishes either, so whatever waits on it is released the same way.
+            self._release_dependent_jobs(job['job_id'], succeeded=False)
+        if ready_jobs:
+            self.log(f"Job '{finished_job_id}' finished; {len(ready_jobs)} dependent job(s) are ready.")
+            self._check_queue_and_assign_jobs()
+
+    def _finish_job(self, job, succeeded):
+        """Records a successful job in the render cache and releases whatever was waiting on it."""
+        if succeeded:
+            self.render_cache.record(job.get('fingerprint'), job)
+            self._record_coverage(job)
+        if job.get('repair_of'):
+            self._finish_repair(job, succeeded)
+        self._release_dependent_jobs(job['job_id'], succeeded)
+
+    def _track_repairs(self, job, repair_ids):
+        """Notes the repair jobs queued for a job, or for the repair job that still had gaps, under the original job."""
+        original_id = job.get('repair_of', job['job_id'])
+        with self.agents_lock:
+            if not repair_ids or job.get('repair_of') and original_id not in self.pending_repairs:
+                return
+            pending = self.pending_repairs.setdefault(original_id, {"job": job, "repairs": set()})
+            pending['repairs'].discard(job['job_id'])
+            pending['repairs'].update(repair_ids)
+
+    def _finish_repair(self, repair_job, succeeded):
+        """
+        Once every repair of a job has succeeded its output is whole, so the
+        original job is recorded in the render cache like a job that verified
+        first time. A failed repair leaves it out.
+        """
+        with self.agents_lock:
+            pending = self.pending_repairs.get(repair_job['repair_of'])
+            if not pending:
+                return
+            pending['repairs'].discard(repair_job['job_id'])
+            if succeeded and pending['repairs']:
+                return
+            del self.pending_repairs[repair_job['repair_of']]
+        if succeeded:
+            self.render_cache.record(pending['job'].get('fingerprint'), pending['job'])
+
+    def _record_coverage(self, job):
+        """
+        Counts a finished progressive-coverage job towards its batch's coverage.
+        Jobs whose gaps were sent for repair count too; the repairs carry no
+        'coverage' and go to the front of the queue.
+        """
+        coverage = job.get('coverage')
+        if not coverage:
+            return
+        with self.agents_lock:
+            job_batch = self.coverage_batches.get(coverage['batch_id'])
+            if not job_batch:
+                return
+            covered_stride = job_batch.coverage_progress()['stride']
+            job_batch.record_coverage(coverage['chunk'])
+            progress = job_batch.coverage_progress()
+            if progress['frames_done'] >= progress['frames_total']:
+                del self.coverage_batches[job_batch.batch_id]
+        if progress['stride'] != covered_stride:
+            self.log(f"Batch '{job_batch.batch_id}' coverage: 1 in {progress['stride']} frames rendered "
+                     f"({progress['frames_done']}/{progress['frames_total']} frames).")
+        self.events['on_queue_update'](self.get_job_queue())
+
+    def _verify_and_finish_job(self, job):
+        """
+        Checks that a completed job wrote every frame of its frame_range. Gaps
+        are turned into repair sub-jobs, and the jobs waiting on this one are
+        moved over to wait on the repairs instead.
+        """
+        job_id = job['job_id']
+        verify_start = time.time()
+        try:
+            report = self.output_verifier.verify_job(job)
+        except (OSError, ValueError) as e:
+            self.log(f"Could not verify output of job '{job_id}': {e}")
+            self._finish_job(job, True)
+            return
+        self.tracer.add_span(job.get('trace_id'), job_id, 'verify', verify_start, time.time())
+
+        unverifiable = self.output_verifier.unverifiable(report)
+        if unverifiable:
+            # Repairs would write to the same unreachable place, and failing them would drop the dependents.
+            self.log(f"Could not verify output of job '{job_id}'; completing it without repairs: {json.dumps(unverifiable)}")
+            self._finish_job(job, True)
+            return
+        if not self.output_verifier.has_gaps(report):
+            self._finish_job(job, True)
+            return
+
+        gaps = {directory: result['missing'] + result['invalid'] for directory, result in report.items()
+                if result['missing'] or result['invalid']}
+        self.log(f"Job '{job_id}' is missing frames: {json.dumps(gaps)}")
+        if job.get('repair_attempt', 0) >= MAX_REPAIR_ATTEMPTS:
+            self.log(f"Job '{job_id}' still has gaps after {MAX_REPAIR_ATTEMPTS} repair attempts; giving up.")
+            self._finish_job(job, False)
+            return
+
+        self._record_coverage(job)
+        repair_jobs = self.output_verifier.build_repair_jobs(job, report)
+        repair_ids = {repair_job['job_id'] for repair_job in repair_jobs}
+        self._track_repairs(job, repair_ids)
+        with self.agents_lock:
+            for dependent_id in self.dependents_of.pop(job_id, []):
+                unmet = self.unmet_dependencies.get(dependent_id)
+                if unmet is None:
+                    continue
+                unmet.discard(job_id)
+                unmet.update(repair_ids)
+                for repair_id in repair_ids:
+                    self.dependents_of.setdefault(repair_id, []).append(dependent_id)
+            for repair_job in reversed(repair_jobs):
+                self.job_queue.appendleft(repair_job)
+                self.tracer.begin(repair_job.get('trace_id'), repair_job['job_id'], 'queued')
+                self.history.record_queued(repair_job)
+
+        self.log(f"Queued {len(repair_jobs)} repair job(s) for '{job_id}'.")
+        self.events['on_queue_update'](self.get_job_queue())
+        self._check_queue_and_assign_jobs()
 
     def _send_job_to_agent(self, agent_id, job_dict):
         """Sends a job dictionary to a specific agent's socket."""
+        trace_id = job_dict.get('trace_id')
+        dispatch_start = time.time()
         try:
             with self.agents_lock:
                 # Re-fetch agent info inside the thread to ensure it's still valid
@@ -114,15 +613,34 @@ class DirectorLogic:
                     raise ConnectionError("Agent disconnected before job could be sent.")
                 agent_socket = agent_info['internal']['socket']
 
-            job_data_str = json.dumps(job_dict)
+            # Jobs are newline-delimited so the agent can frame messages larger than one recv().
+            job_data_str = json.dumps(job_dict) + '\n'
             agent_socket.sendall(job_data_str.encode('utf-8'))
+            self.tracer.add_span(trace_id, job_dict['job_id'], 'dispatch', dispatch_start, time.time(),
+                                 args={'agent_id': agent_id})
+            self.tracer.begin(trace_id, job_dict['job_id'], 'running', {'agent_id': agent_id})
+            self.history.record_dispatched(job_dict['job_id'], agent_id, dispatch_start)
             self.log(f"Successfully sent job '{job_dict['job_id']}' to agent '{agent_id}'.")
         except (socket.error, ConnectionError) as e:
             self.log(f"Error sending job to agent '{agent_id}': {e}. Re-queuing job.")
             # If sending fails, put the job back at the front of the queue
             with self.agents_lock:
-                self.job_queue.appendleft(job_dict)
-            self.events['on_queue_update'](list(self.job_queue))
+                if self.active_jobs.get(agent_id) is job_dict:
+                    del self.active_jobs[agent_id]
+                    self.job_estimates.pop(agent_id, None)
+                self._requeue_job(job_dict)
+            self.events['on_queue_update'](self.get_job_queue())
+
+    def _requeue_job(self, job_dict):
+        """Puts a job that did not run back at the front of the queue. Must hold agents_lock."""
+        if job_dict.get('target_agent'):
+            # Pinned jobs only make sense on their agent; drop them if it is gone.
+            if job_dict['target_agent'] in self.agents:
+                self.pinned_jobs.setdefault(job_dict['target_agent'], job_dict)
+        else:
+            self.job_queue.appendleft(job_dict)
+        self.tracer.discard(job_dict.get('trace_id'), job_dict['job_id'])
+        self.tracer.begin(job_dict.get('trace_id'), job_dict['job_id'], 'queued', {'requeued': True})
 
     def _handle_agent_connection(self, ip_port_str):
         # ... (This function remains the same as the previous version) ...
@@ -142,6 +660,7 @@ class DirectorLogic:
             initial_data = sock.recv(4096).decode('utf-8').strip()
             initial_status = json.loads(initial_data.split('\n')[0])
             agent_id = initial_status.get('agent_id', ip_port_str)
+            self.tracer.record_clock_sample(agent_id, initial_status.get('timestamp'))
 
             with self.agents_lock:
                 self.agents[agent_id] = {
@@ -150,7 +669,9 @@ class DirectorLogic:
                 }
                 self.agents[agent_id]['public'].update(initial_status)
             
+            self.history.record_agent(agent_id, connected=True)
             self.events['on_agent_connected'](agent_id, self.agents[agent_id]['public'])
+            self._check_queue_and_assign_jobs()
             
             buffer = ""
             while True:
@@ -162,7 +683,17 @@ class DirectorLogic:
                     line, buffer = buffer.split('\n', 1)
                     if line:
                         status_update = json.loads(line)
-                        self._update_agent_state(agent_id, status_update)
+                        self.tracer.record_clock_sample(agent_id, status_update.get('timestamp'))
+                        if status_update.get('type') == 'trace':
+                            self.tracer.add_remote_events(agent_id, status_update.get('trace_id'),
+                                                          status_update.get('job_id'), status_update.get('events'))
+                        elif status_update.get('type') == 'preview':
+                            status_update['agent_id'] = agent_id
+                            with self.agents_lock:
+                                self.latest_previews[agent_id] = status_update
+                            self.events['on_agent_preview'](agent_id, status_update)
+                        else:
+                            self._update_agent_state(agent_id, status_update)
                     
         except socket.error as e:
             self.log(f"Connection error with agent '{agent_id or ip_port_str}': {e}")
@@ -174,10 +705,20 @@ class DirectorLogic:
                 with self.agents_lock:
                     if agent_id in self.agents:
                         del self.agents[agent_id]
+                    lost_job = self.active_jobs.pop(agent_id, None)
+                    if lost_job:
+                        self.tracer.end(lost_job.get('trace_id'), lost_job['job_id'], 'running', {'status': 'Disconnected'})
+                    self.job_estimates.pop(agent_id, None)
+                    self.pinned_jobs.pop(agent_id, None)
+                    self.calibration_requested.pop(agent_id, None)
+                    self.latest_previews.pop(agent_id, None)
+                self.history.record_agent(agent_id, connected=False)
                 self.events['on_agent_disconnected'](agent_id)
 
     def _update_agent_state(self, agent_id, status_data):
         is_now_idle = False
+        finished_job = None
+        lost_job = None
         with self.agents_lock:
             if agent_id in self.agents:
                 old_status = self.agents[agent_id]['public'].get('status')
@@ -186,18 +727,90 @@ class DirectorLogic:
                 if new_status == 'Idle' and old_status != 'Idle':
                     is_now_idle = True
 
+                # A lowercase 'error' is the agent rejecting the job it was sent (it was busy), and an
+                # Idle without a Completed or Error first means the job ended unreported, e.g. the
+                # render process exited. Either way the job goes back to the queue.
+                if new_status in ('Idle', 'error') and agent_id in self.active_jobs:
+                    lost_job = self.active_jobs.pop(agent_id)
+                    self.job_estimates.pop(agent_id, None)
+                    self.tracer.end(lost_job.get('trace_id'), lost_job['job_id'], 'running', {'status': new_status})
+                    self._requeue_job(lost_job)
+
                 if new_status == 'Completed':
                     job_id = self.agents[agent_id]['public'].get('job_id')
                     if job_id: self.log(f"Job '{job_id}' on agent '{agent_id}' completed successfully.")
+                    timing = status_data.get('timing')
+                    if job_id and timing and timing.get('frames'):
+                        self.log(f"Job '{job_id}' timing: first frame after {timing['time_to_first_frame']}s "
+                                 f"{json.dumps(timing['startup'])}, {timing['frames']} frames at "
+                                 f"p50 {timing['frame_p50']}s / p95 {timing['frame_p95']}s.")
+
+                if new_status in ('Completed', 'Error'):
+                    finished_job = self.active_jobs.pop(agent_id, None)
+                    finished_job_succeeded = new_status == 'Completed'
+                    if finished_job:
+                        self.tracer.end(finished_job.get('trace_id'), finished_job['job_id'], 'running',
+                                        {'status': new_status})
+                        if finished_job_succeeded:
+                            self._learn_sequence_frames(agent_id, finished_job)
+                    self.job_estimates.pop(agent_id, None)
+                elif agent_id in self.job_estimates and isinstance(status_data.get('progress'), (int, float)):
+                    status_data['eta_seconds'] = self._estimate_remaining_seconds(agent_id, status_data['progress'])
                 
-                self.agents[agent_id]['public'].update(status_data)
+                if new_status != 'error': # A reply to one job message, not the agent's state
+                    self.agents[agent_id]['public'].update(status_data)
         
-        self.events['on_agent_status_update'](agent_id, status_data)
+        if lost_job:
+            self.log(f"Agent '{agent_id}' did not run job '{lost_job['job_id']}' "
+                     f"({status_data.get('message') or new_status}). Re-queuing job.")
+            self.events['on_queue_update'](self.get_job_queue())
+        if status_data.get('status') != 'error':
+            self.events['on_agent_status_update'](agent_id, status_data)
+
+        if finished_job:
+            self.history.record_finished(finished_job['job_id'], agent_id, status_data.get('status'))
+            if finished_job_succeeded and finished_job.get('frame_range'):
+                # Checking the frames hits the file server, so keep it off the socket thread.
+                threading.Thread(target=self._verify_and_finish_job, args=(finished_job,), daemon=True).start()
+            else:
+                self._finish_job(finished_job, finished_job_succeeded)
         
         # If an agent just became idle, check if there's work for it.
         if is_now_idle:
             self.log(f"Agent '{agent_id}' is now idle. Checking job queue...")
             self._check_queue_and_assign_jobs()
+        elif lost_job:
+            self._check_queue_and_assign_jobs()
+
+    def _estimate_remaining_seconds(self, agent_id, progress):
+        """
+        Blends the calibrated estimate with the job's own progress rate, trusting
+        progress more as it grows. Must hold agents_lock.
+        """
+        started_at, estimate = self.job_estimates[agent_id]
+        elapsed = time.time() - started_at
+        from_estimate = max(0.0, estimate - elapsed)
+        if progress <= 0:
+            return round(from_estimate)
+        from_progress = elapsed * (1 - progress) / progress
+        return round(progress * from_progress + (1 - progress) * from_estimate)
+
+    def _learn_sequence_frames(self, agent_id, job):
+        """
+        Works out a sequence's length from how long a job without a frame_range
+        took on a calibrated agent, for later estimates. Must hold agents_lock.
+        """
+        if job.get('frame_range') or not job.get('sequence_path') or agent_id not in self.job_estimates:
+            return
+        started_at, _ = self.job_estimates[agent_id]
+        seconds_per_frame = estimate_job_seconds(dict(job, frame_range=[0, 0]),
+                                                 self.agents[agent_id]['public'].get('profile'), {})
+        if not seconds_per_frame:
+            return
+        measured = (time.time() - started_at) / seconds_per_frame
+        # Smooth over runs; editor startup makes a single measurement overshoot.
+        known = self.sequence_frames.get(job['sequence_path'])
+        self.sequence_frames[job['sequence_path']] = max(1, round(measured if known is None else 0.7 * known + 0.3 * measured))
 
     def _load_and_connect_agents(self):
         try:
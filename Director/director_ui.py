@@ -1,4 +1,9 @@
-from flask import Flask, render_template, send_from_directory
+import time
+import uuid
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+from flask import Flask, render_template, send_from_directory, jsonify, request, Response, stream_with_context
 from flask_socketio import SocketIO
 from director import DirectorLogic
 from job_factory import JobFactory
@@ -24,8 +29,12 @@ def on_agent_status_update(agent_id, status_data):
     payload['all_agents'] = all_agents_status
     socketio.emit('agent_update', payload)
 
+def on_agent_preview(agent_id, preview):
+    socketio.emit('agent_preview', preview)
+
 def on_queue_update(queue_data):
-    socketio.emit('queue_update', {'queue': queue_data})
+    socketio.emit('queue_update', {'queue': queue_data, 'eta_seconds': director_logic.estimate_queue_seconds(),
+                                   'coverage': director_logic.get_coverage_progress()})
 
 def log_to_ui(message):
     print(message)
@@ -36,16 +45,65 @@ director_event_callbacks = {
     'on_agent_connected': on_agent_connected,
     'on_agent_disconnected': on_agent_disconnected,
     'on_agent_status_update': on_agent_status_update,
-    'on_queue_update': on_queue_update
+    'on_queue_update': on_queue_update,
+    'on_agent_preview': on_agent_preview
 }
 director_logic = DirectorLogic(log_to_ui, director_event_callbacks)
-job_factory = JobFactory()
+job_factory = JobFactory(director_logic.render_cache)
 
 # --- Web Routes ---
 @app.route('/')
 def index():
     return render_template('director.html')
 
+@app.route('/trace')
+def export_trace():
+    """Downloads collected job timings as Chrome trace JSON. Optional ?trace_id= filter."""
+    trace = director_logic.tracer.export_chrome_trace(request.args.get('trace_id'))
+    response = jsonify(trace)
+    response.headers['Content-Disposition'] = 'attachment; filename=director_trace.json'
+    return response
+
+# Request and response headers passed through the agent file proxy so ranges and ETags keep working.
+PROXY_REQUEST_HEADERS = ('Range', 'If-None-Match')
+PROXY_RESPONSE_HEADERS = ('Content-Type', 'Content-Length', 'Content-Range', 'Accept-Ranges', 'ETag', 'Cache-Control')
+
+@app.route('/agents/<agent_id>/files/', defaults={'subpath': ''})
+@app.route('/agents/<agent_id>/files/<path:subpath>')
+def proxy_agent_file(agent_id, subpath):
+    """Streams a file or directory listing from an agent's file server, e.g. a frame still being rendered."""
+    base_url = director_logic.get_agent_file_server_url(agent_id)
+    if not base_url:
+        return jsonify({"error": f"Agent '{agent_id}' does not serve files."}), 404
+
+    headers = {name: request.headers[name] for name in PROXY_REQUEST_HEADERS if name in request.headers}
+    upstream_request = urllib.request.Request(f"{base_url}/files/{quote(subpath)}", headers=headers)
+    try:
+        upstream = urllib.request.urlopen(upstream_request, timeout=10)
+    except urllib.error.HTTPError as e:
+        # 304/404/416 carry no body worth forwarding, only the status and validators.
+        response = Response(status=e.code)
+        for name in PROXY_RESPONSE_HEADERS:
+            if name in e.headers and name != 'Content-Length':
+                response.headers[name] = e.headers[name]
+        return response
+    except (urllib.error.URLError, OSError) as e:
+        return jsonify({"error": f"Agent file server unreachable: {e}"}), 502
+
+    def generate():
+        with upstream:
+            while True:
+                chunk = upstream.read(256 * 1024)
+                if not chunk:
+                    break
+                yield chunk
+
+    response = Response(stream_with_context(generate()), status=upstream.status)
+    for name in PROXY_RESPONSE_HEADERS:
+        if name in upstream.headers:
+            response.headers[name] = upstream.headers[name]
+    return response
+
 # --- SocketIO Handlers for Web UI ---
 @socketio.on('connect')
 def handle_connect():
@@ -56,7 +114,11 @@ def handle_connect():
         payload = agent_info.copy()
         payload['all_agents'] = all_agents
         socketio.emit('agent_update', payload)
-    socketio.emit('queue_update', {'queue': director_logic.get_job_queue()})
+    socketio.emit('queue_update', {'queue': director_logic.get_job_queue(),
+                                   'eta_seconds': director_logic.estimate_queue_seconds(),
+                                   'coverage': director_logic.get_coverage_progress()})
+    for preview in director_logic.get_latest_previews():
+        socketio.emit('agent_preview', preview)
 
 @socketio.on('add_agent')
 def add_agent(data):
@@ -66,6 +128,18 @@ def add_agent(data):
 def disconnect_agent(data):
     director_logic.disconnect_agent(data.get('agent_id'))
 
+@socketio.on('calibrate_agent_request')
+def calibrate_agent(data):
+    director_logic.request_calibration(data.get('agent_id'))
+
+@socketio.on('release_batch_request')
+def release_batch(data):
+    director_logic.release_batch(data.get('batch_id'))
+
+@socketio.on('reject_drafts_request')
+def reject_drafts(data):
+    director_logic.reject_drafts(data.get('job_ids') or [])
+
 @socketio.on('submit_job')
 def submit_job(data):
     """Handles request from UI to generate and queue a batch of jobs."""
@@ -73,8 +147,21 @@ def submit_job(data):
     if not form_data:
         log_to_ui("Error: Missing form data for job submission.")
         return
-        
+
+    received_at = time.time()
+    trace_id = uuid.uuid4().hex
+    form_data['trace_id'] = trace_id
+    submitted_at = data.get('submitted_at')
+    if isinstance(submitted_at, (int, float)):
+        # The browser clock is not corrected, so only trust it when it looks sane.
+        if 0 <= received_at - submitted_at < 60:
+            director_logic.tracer.add_span(trace_id, None, 'ui_submit', submitted_at, received_at)
+        else:
+            director_logic.tracer.add_span(trace_id, None, 'ui_submit', received_at)
+
     job_batch = job_factory.create_job_batch(form_data)
+    director_logic.tracer.add_span(trace_id, None, 'create_job_batch', received_at, time.time(),
+                                   args={'job_count': len(job_batch) if job_batch else 0})
     if job_batch:
         log_to_ui(f"Generated a batch of {len(job_batch)} jobs. Adding to queue...")
         director_logic.add_job_batch_to_queue(job_batch)
@@ -1,72 +1,585 @@
 import time
 import os
-from itertools import product
+import uuid
+from render_cache import job_fingerprint
+from output_verifier import DEFAULT_FILE_NAME_FORMAT
+
+# Pixels each tile extends past its neighbour's edge, blended away by the stitch.
+DEFAULT_TILE_OVERLAP = 64
+
+# Progressive coverage: the first pass renders every 64th frame; strides halve down to 8,
+# then the gaps are filled. Each job renders at most this many frames of one level.
+DEFAULT_COVERAGE_STRIDE = 64
+DEFAULT_COVERAGE_FINEST_STRIDE = 8
+DEFAULT_COVERAGE_CHUNK_FRAMES = 64
+
+# Render quality tiers. Graph variables are set by the executor when the graph exposes them;
+# console variables go under the job's own overrides. Resolutions are scaled before tiling.
+QUALITY_TIERS = {
+    "draft": {
+        "resolution_scale": 0.5,
+        "graph_variables": {"SpatialSampleCount": 1, "TemporalSampleCount": 1},
+        "console_variables": {"r.Shadow.MaxResolution": 1024, "r.Streaming.MipBias": 1,
+                              "r.MotionBlurQuality": 0, "r.DepthOfFieldQuality": 1}
+    },
+    "preview": {
+        "resolution_scale": 0.75,
+        "graph_variables": {"SpatialSampleCount": 1, "TemporalSampleCount": 4},
+        "console_variables": {"r.Shadow.MaxResolution": 2048}
+    },
+    "final": {"resolution_scale": 1.0, "graph_variables": {}, "console_variables": {}}
+}
+
+
+def scale_resolutions(resolutions, scale):
+    """Scales (res_x, res_y) presets, keeping dimensions even for video encoders."""
+    if scale == 1.0:
+        return list(resolutions)
+    return [(max(2, round(res_x * scale / 2) * 2), max(2, round(res_y * scale / 2) * 2)) for res_x, res_y in resolutions]
+
+
+def coverage_levels(first, last, coarsest_stride, finest_stride):
+    """
+    Orders a frame range for progressive review: every coarsest_stride-th frame
+    (and the last frame) first, then the frames halfway between those, halving
+    the stride down to finest_stride, and finally every frame still missing.
+    :return: A list of (stride, frames) pairs; the final fill has stride 1.
+    """
+    levels, covered = [], set()
+    stride = coarsest_stride
+    while stride >= max(2, finest_stride):
+        frames = [frame for frame in range(first, last + 1, stride) if frame not in covered]
+        if stride == coarsest_stride and last not in frames:
+            frames.append(last)
+        covered.update(frames)
+        levels.append((stride, frames))
+        stride //= 2
+    remaining = [frame for frame in range(first, last + 1) if frame not in covered]
+    if remaining:
+        levels.append((1, remaining))
+    return levels
+
+
+class JobBatch:
+    """
+    A compact description of a permutation sweep. Instead of materializing
+    every sequence/camera x scene preset x resolution combination up front,
+    the batch stores the enabled preset lists once and expands job N on demand.
+    The Director pulls jobs from it lazily with take_next().
+    """
+    def __init__(self, batch_id, trace_id, common_settings, sequences, scene_presets, resolutions,
+                 asset_hashes=None, derived_resolutions=None, batch_scene_variants=False, tiling=None,
+                 quality_tier=None, coverage=None):
+        """
+        :param common_settings: project_path, graph_path, level_path and project_dir shared by every job.
+        :param sequences: A list of {path, camera} dicts, or {path, cameras} dicts when
+                          all cameras of a sequence are rendered by one job.
+        :param scene_presets: A list of scene settings dicts.
+        :param resolutions: A list of (res_x, res_y) tuples.
+        :param asset_hashes: {path: sha256} folded into each job's cache fingerprint.
+                             None disables fingerprinting for this batch.
+        :param derived_resolutions: {(res_x, res_y): [(res_x, res_y), ...]} of smaller presets
+                                    produced by resampling a rendered one instead of rendering.
+        :param batch_scene_variants: Put every scene preset into one job as a list of variants
+                                     rendered in a single engine session, instead of one job each.
+        :param tiling: (columns, rows, overlap) to split every image into overlapping tile
+                       jobs, spread across agents and stitched back together by add_stitch_jobs().
+        :param quality_tier: A QUALITY_TIERS name whose graph and console variables every job
+                             carries. The resolutions passed in are expected to be scaled already.
+        :param coverage: (coarsest_stride, finest_stride, chunk_frames) to render the frame range
+                         progressively: every job gets a sparse 'frame_set' from coverage_levels(),
+                         and the whole sweep's coarse frames are dispatched before any finer ones.
+        """
+        self.batch_id = batch_id
+        self.trace_id = trace_id
+        self.common_settings = common_settings
+        self.sequences = sequences
+        self.scene_presets = scene_presets
+        self.resolutions = resolutions
+        self.batch_scene_variants = batch_scene_variants
+        self.scene_axis_size = 1 if batch_scene_variants else len(scene_presets)
+        self.tiling = tiling
+        self.tile_count = tiling[0] * tiling[1] if tiling else 1
+        self.base_size = len(sequences) * self.scene_axis_size * len(resolutions) * self.tile_count
+        self.coverage_chunks = [] # (level, stride, frames) per coverage job of a combination
+        self.coverage_level_strides = []
+        self.coverage_done = [] # Combinations finished per chunk
+        if coverage:
+            if tiling:
+                raise ValueError("Progressive coverage can't be combined with tiling")
+            if not common_settings.get('frame_range'):
+                raise ValueError("Progressive coverage needs a frame range")
+            coarsest_stride, finest_stride, chunk_frames = coverage
+            levels = coverage_levels(*common_settings['frame_range'], coarsest_stride, finest_stride)
+            for level, (stride, frames) in enumerate(levels):
+                for start in range(0, len(frames), chunk_frames):
+                    self.coverage_chunks.append((level, stride, sorted(frames[start:start + chunk_frames])))
+            self.coverage_level_strides = [stride for stride, _ in levels]
+            self.coverage_done = [0] * len(self.coverage_chunks)
+        self.size = self.base_size * max(1, len(self.coverage_chunks))
+        self.asset_hashes = asset_hashes
+        self.derived_resolutions = derived_resolutions or {}
+        self.next_index = 0
+        self.resolved_indices = set() # Indices >= next_index satisfied without rendering
+        self.enqueued_at = None
+        self.batch_jobs = [] # Jobs that wait on many jobs of the sweep, e.g. a contact sheet
+        self.quality_tier = quality_tier
+        self.draft_batch = None # A draft-tier batch of the same combinations, queued ahead of this one
+        self.held = False # Held batches wait for release_batch() before any job is dispatched
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self.job_at(index)
+
+    def remaining(self):
+        return self.size - self.next_index - len(self.resolved_indices)
+
+    def take_next(self):
+        """Expands the next job in the sweep and advances the cursor. Returns None when exhausted."""
+        while self.next_index in self.resolved_indices:
+            self.resolved_indices.discard(self.next_index)
+            self.next_index += 1
+        if self.next_index >= self.size:
+            return None
+        job = self.job_at(self.next_index)
+        self.next_index += 1
+        return job
+
+    def mark_resolved(self, index):
+        """Removes a not-yet-dispatched job from the sweep, e.g. because of a render cache hit."""
+        if index >= self.next_index:
+            self.resolved_indices.add(index)
+
+    def job_at(self, index):
+        """
+        Expands a single job. The index is decoded in the same order as
+        itertools.product(coverage_chunks, sequences, scene_presets, resolutions, tiles),
+        so the tile varies fastest, then the resolution.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"Job index {index} is out of range for a batch of {self.size}.")
+
+        chunk_index, index = divmod(index, self.base_size)
+        remainder, tile_index = divmod(index, self.tile_count)
+        remainder, res_index = divmod(remainder, len(self.resolutions))
+        seq_index, scene_index = divmod(remainder, self.scene_axis_size)
+        sequence_info = self.sequences[seq_index]
+        res_x, res_y = self.resolutions[res_index]
+
+        job_name = f"{self.batch_id}_{index}"
+        output_path = self._output_path(job_name)
+
+        job = {
+            "job_id": f"{job_name}_c{chunk_index}" if self.coverage_chunks else job_name,
+            "trace_id": self.trace_id,
+            "project_path": self.common_settings['project_path'],
+            "graph_path": self.common_settings['graph_path'],
+            "level_path": self.common_settings['level_path'],
+            "sequence_path": sequence_info['path'],
+            "output_path": output_path,
+            "resolution": [res_x, res_y]
+        }
+        if self.tiling:
+            # The executor narrows the camera to this rect; the tile renders at the rect's size.
+            rect, _ = self._tile_rects(res_x, res_y)[tile_index]
+            job["resolution"] = [rect[2] - rect[0], rect[3] - rect[1]]
+            job["tile"] = {"rect": rect, "full_resolution": [res_x, res_y]}
+        if self.batch_scene_variants:
+            job["scene_variants"] = [
+                {"scene_settings": settings, "output_path": f"{output_path}/variant_{variant_index}"}
+                for variant_index, settings in enumerate(self.scene_presets)
+            ]
+        else:
+            job["scene_settings"] = self.scene_presets[scene_index]
+        if 'cameras' in sequence_info:
+            job["camera_actor_names"] = sequence_info['cameras']
+        else:
+            job["camera_actor_name"] = sequence_info['camera']
+        if self.common_settings.get('launch_profile'):
+            job["launch_profile"] = self.common_settings['launch_profile']
+        quality = QUALITY_TIERS[self.quality_tier] if self.quality_tier else {}
+        if self.quality_tier:
+            job["quality_tier"] = self.quality_tier
+        if quality.get('graph_variables'):
+            job["graph_variable_overrides"] = dict(quality['graph_variables'])
+        # The submitted console variables win over the tier's.
+        console_variable_overrides = dict(quality.get('console_variables', {}))
+        console_variable_overrides.update(self.common_settings.get('console_variable_overrides', {}))
+        if console_variable_overrides:
+            job["console_variable_overrides"] = console_variable_overrides
+        frame_range = self.common_settings.get('frame_range')
+        if frame_range:
+            # Lets the Director verify every expected frame once the job reports Completed.
+            job["frame_range"] = frame_range
+            job["file_name_format"] = self.common_settings['file_name_format']
+        if self.coverage_chunks:
+            # Every coverage job of a combination writes into the same output directory.
+            level, stride, frames = self.coverage_chunks[chunk_index]
+            job["frame_set"] = frames
+            job["coverage"] = {"batch_id": self.batch_id, "chunk": chunk_index, "level": level, "stride": stride}
+        if self.asset_hashes is not None:
+            job["fingerprint"] = job_fingerprint(job, self.asset_hashes)
+
+        derived = self.derived_resolutions.get((res_x, res_y))
+        if derived and not self.tiling:
+            job["dependent_jobs"] = [self._derive_job(job, resolution) for resolution in derived]
+        return job
+
+    def final_indices_for_draft(self, draft_index):
+        """The indices in this batch rendering the combination of 'draft_index' in its draft_batch."""
+        return [chunk_index * self.base_size + index
+                for chunk_index in range(max(1, len(self.coverage_chunks)))
+                for index in range(draft_index * self.tile_count, (draft_index + 1) * self.tile_count)]
+
+    def _coverage_job_names(self, job_name):
+        """The jobs rendering a combination: one per coverage chunk, or the job itself."""
+        if self.coverage_chunks:
+            return [f"{job_name}_c{chunk_index}" for chunk_index in range(len(self.coverage_chunks))]
+        return [job_name]
+
+    def record_coverage(self, chunk_index):
+        """Counts a finished coverage job; the Director calls this as each one completes."""
+        self.coverage_done[chunk_index] += 1
+
+    def coverage_progress(self):
+        """
+        How much of the sweep's frame range has rendered, for the queue UI.
+        'stride' is the finest stride every combination has complete, so 8
+        means every 8th frame of every plate is ready to review.
+        """
+        frames_total = sum(len(frames) for _, _, frames in self.coverage_chunks) * self.base_size
+        frames_done = sum(len(frames) * done for (_, _, frames), done in zip(self.coverage_chunks, self.coverage_done))
+        stride = None
+        for level, level_stride in enumerate(self.coverage_level_strides):
+            if any(done < self.base_size for (chunk_level, _, _), done in zip(self.coverage_chunks, self.coverage_done)
+                   if chunk_level == level):
+                break
+            stride = level_stride
+        return {"frames_done": frames_done, "frames_total": frames_total, "stride": stride}
+
+    def _job_index(self, seq_index, scene_index, res_index, tile_index=0):
+        """The inverse of the decoding in job_at."""
+        combination = (seq_index * self.scene_axis_size + scene_index) * len(self.resolutions) + res_index
+        return combination * self.tile_count + tile_index
+
+    def _final_job_name(self, seq_index, scene_index, res_index):
+        """The job whose output holds the finished images of a combination: its render, or its stitch when tiled."""
+        if self.tiling:
+            return f"{self.batch_id}_{self._job_index(seq_index, scene_index, res_index) // self.tile_count}_stitch"
+        return f"{self.batch_id}_{self._job_index(seq_index, scene_index, res_index)}"
+
+    def _tile_rects(self, res_x, res_y):
+        """
+        Splits a resolution into the tiling grid, row by row.
+        :return: A list of (rect, core) pairs of [x0, y0, x1, y1]. The core
+                 rects partition the image; each rect is its core grown by the
+                 overlap on every side that has a neighbour.
+        """
+        columns, rows, overlap = self.tiling
+        x_edges = [round(i * res_x / columns) for i in range(columns + 1)]
+        y_edges = [round(j * res_y / rows) for j in range(rows + 1)]
+        tiles = []
+        for row in range(rows):
+            for column in range(columns):
+                core = [x_edges[column], y_edges[row], x_edges[column + 1], y_edges[row + 1]]
+                rect = [max(0, core[0] - overlap), max(0, core[1] - overlap),
+                        min(res_x, core[2] + overlap), min(res_y, core[3] + overlap)]
+                tiles.append((rect, core))
+        return tiles
+
+    def add_stitch_jobs(self):
+        """
+        Adds one stitch job per sequence/camera x scene preset x resolution,
+        waiting on all of that image's tile jobs. Stitch jobs are registered
+        when the batch is queued, so tiles finishing (or hitting the render
+        cache) in any order are all counted. Derived resolutions are resampled
+        from the stitched frames.
+        """
+        for combination in range(self.size // self.tile_count):
+            tile_jobs = [self.job_at(combination * self.tile_count + t) for t in range(self.tile_count)]
+            first = tile_jobs[0]
+            res_x, res_y = first["tile"]["full_resolution"]
+            job_name = f"{self.batch_id}_{combination}_stitch"
+            stitch_job = {
+                "job_id": job_name,
+                "job_type": "stitch",
+                "trace_id": self.trace_id,
+                "depends_on": [tile["job_id"] for tile in tile_jobs],
+                "source_paths": [tile["output_path"] for tile in tile_jobs],
+                "tiles": [{"rect": rect, "core": core} for rect, core in self._tile_rects(res_x, res_y)],
+                "output_path": self._output_path(job_name),
+                "sequence_path": first["sequence_path"],
+                "resolution": [res_x, res_y]
+            }
+            # No frame_range: the tiles are verified (and repaired) individually, and a missing tile fails the stitch.
+            for key in ("camera_actor_name", "camera_actor_names", "scene_settings", "scene_variants"):
+                if key in first:
+                    stitch_job[key] = first[key]
+            if self.asset_hashes is not None:
+                stitch_job["source_fingerprints"] = [tile["fingerprint"] for tile in tile_jobs]
+                stitch_job["fingerprint"] = job_fingerprint(stitch_job, self.asset_hashes)
+
+            derived = self.derived_resolutions.get((res_x, res_y))
+            if derived:
+                stitch_job["dependent_jobs"] = [self._derive_job(stitch_job, resolution) for resolution in derived]
+            self.batch_jobs.append(stitch_job)
+
+    def add_contact_sheet_job(self, frame_selectors):
+        """
+        Adds a job that tiles the sweep into contact sheets once its renders are
+        done: one row per sequence/camera, one column per scene preset, at the
+        largest rendered resolution. It waits on exactly the jobs it shows, and
+        still runs if some of them fail so the sheet shows the gaps.
+        """
+        res_index = max(range(len(self.resolutions)), key=lambda i: self.resolutions[i][0] * self.resolutions[i][1])
+        rows, depends_on = [], set()
+        for seq_index, sequence_info in enumerate(self.sequences):
+            grouped = 'cameras' in sequence_info
+            for camera in (sequence_info['cameras'] if grouped else [sequence_info['camera']]):
+                row = []
+                for scene_index, settings in enumerate(self.scene_presets):
+                    job_name = self._final_job_name(seq_index, 0 if self.batch_scene_variants else scene_index, res_index)
+                    source_dir = self._output_path(job_name)
+                    if self.batch_scene_variants:
+                        source_dir += f"/variant_{scene_index}"
+                    if grouped:
+                        source_dir += f"/{camera}"
+                    settings_label = ', '.join(f"{k}={v}" for k, v in sorted(settings.items()))
+                    row.append({"source_dir": source_dir, "job_id": job_name,
+                                "label": f"{os.path.basename(sequence_info['path'])} / {camera} | {settings_label}"})
+                    depends_on.update(self._coverage_job_names(job_name))
+                rows.append(row)
+
+        job_name = f"{self.batch_id}_contact"
+        self.batch_jobs.append({
+            "job_id": job_name,
+            "job_type": "contact_sheet",
+            "trace_id": self.trace_id,
+            "depends_on": sorted(depends_on),
+            "allow_failed_dependencies": True,
+            "cells": rows,
+            "frames": list(frame_selectors),
+            "output_path": self._output_path(job_name)
+        })
+
+    def _derive_job(self, render_job, resolution):
+        """Builds a job that resamples a rendered job's frames down to a smaller preset."""
+        res_x, res_y = resolution
+        job_name = f"{render_job['job_id']}_derive_{res_x}x{res_y}"
+        derive_job = {
+            "job_id": job_name,
+            "job_type": "derive",
+            "trace_id": self.trace_id,
+            "depends_on": [render_job['job_id']],
+            "source_path": render_job['output_path'],
+            "output_path": self._output_path(job_name),
+            "sequence_path": render_job['sequence_path'],
+            "resolution": [res_x, res_y]
+        }
+        for key in ("camera_actor_name", "camera_actor_names", "scene_settings", "scene_variants"):
+            if key in render_job:
+                derive_job[key] = render_job[key]
+        if "fingerprint" in render_job:
+            derive_job["source_fingerprint"] = render_job["fingerprint"]
+            derive_job["fingerprint"] = job_fingerprint(derive_job, self.asset_hashes)
+        return derive_job
+
+    def _output_path(self, job_name):
+        return os.path.join(self.common_settings['project_dir'], 'Saved', 'RenderJobs', job_name, 'export').replace('\\', '/')
+
+    def summary(self):
+        """A small dict describing the batch for the queue UI."""
+        summary = {
+            "job_id": self.batch_id, "batch_id": self.batch_id, "quality_tier": self.quality_tier or "final",
+            "total": self.size, "remaining": self.remaining(), "held": self.held
+        }
+        if self.coverage_chunks:
+            summary["coverage"] = self.coverage_progress()
+        return summary
+
 
 class JobFactory:
     """
     A class responsible for creating batches of render job dictionaries
     from a complex set of UI inputs.
     """
+    def __init__(self, render_cache=None):
+        """
+        :param render_cache: Optional RenderCache used to hash the asset files
+                             listed in 'cache_asset_paths' into job fingerprints.
+        """
+        self.render_cache = render_cache
+
     def create_job_batch(self, form_data):
         """
-        Constructs a list of job dictionaries by creating a permutation of all
-        enabled sequences, cameras, scene presets, and resolution presets.
+        Builds a lazy JobBatch over the permutation of all enabled sequences,
+        cameras, scene presets, and resolution presets. Only the preset lists
+        are validated and stored here, so this returns in O(presets) time
+        regardless of how many combinations the sweep contains.
 
         :param form_data: A dictionary containing the UI form data.
-        :return: A list of job dictionaries, or an empty list if no valid permutations exist.
+        :return: A JobBatch, or None if no valid permutations exist.
         """
         try:
             # --- Extract common settings ---
             project_path = form_data.get('project_path', '')
-            graph_path = form_data.get('graph_path', '')
-            level_path = form_data.get('level_path', '')
-            project_dir = os.path.dirname(project_path) if project_path.endswith('.uproject') else project_path
+            common_settings = {
+                "project_path": project_path,
+                "graph_path": form_data.get('graph_path', ''),
+                "level_path": form_data.get('level_path', ''),
+                "project_dir": os.path.dirname(project_path) if project_path.endswith('.uproject') else project_path,
+                "file_name_format": form_data.get('file_name_format') or DEFAULT_FILE_NAME_FORMAT
+            }
+            if str(form_data.get('frame_start', '')) != '' and str(form_data.get('frame_end', '')) != '':
+                common_settings["frame_range"] = [int(form_data['frame_start']), int(form_data['frame_end'])]
+            # Agents define the profiles; the job only names one.
+            if form_data.get('launch_profile'):
+                common_settings["launch_profile"] = form_data['launch_profile'].strip()
+            console_variable_overrides = self._parse_console_variables(form_data.get('console_variable_overrides'))
+            if console_variable_overrides:
+                common_settings["console_variable_overrides"] = console_variable_overrides
 
             # --- Filter enabled presets ---
-            enabled_sequences = self._get_enabled_sequences(form_data.get('sequences', []))
-            enabled_scene_presets = [p for p in form_data.get('scene_presets', []) if p.get('enabled')]
-            enabled_resolution_presets = [p for p in form_data.get('resolution_presets', []) if p.get('enabled')]
+            enabled_sequences = self._get_enabled_sequences(form_data.get('sequences', []),
+                                                            form_data.get('group_cameras', False))
+            enabled_scene_presets = [p.get('settings', {}) for p in form_data.get('scene_presets', []) if p.get('enabled')]
+            enabled_resolutions = [
+                (int(p.get('res_x', 1920)), int(p.get('res_y', 1080)))
+                for p in form_data.get('resolution_presets', []) if p.get('enabled')
+            ]
 
-            if not all([enabled_sequences, enabled_scene_presets, enabled_resolution_presets]):
+            if not all([enabled_sequences, enabled_scene_presets, enabled_resolutions]):
                 print("Warning: One or more preset lists are empty or disabled. No jobs will be created.")
-                return []
-
-            # --- Generate all permutations ---
-            all_permutations = product(enabled_sequences, enabled_scene_presets, enabled_resolution_presets)
-
-            job_list = []
-            for combo in all_permutations:
-                sequence_info, scene_preset, resolution_preset = combo
-                
-                job_name = f"job_{int(time.time() * 1000)}_{len(job_list)}"
-                output_path = os.path.join(project_dir, 'Saved', 'RenderJobs', job_name, 'export').replace('\\', '/')
-
-                job_dict = {
-                    "job_id": job_name,
-                    "project_path": project_path,
-                    "graph_path": graph_path,
-                    "level_path": level_path,
-                    "sequence_path": sequence_info['path'],
-                    "camera_actor_name": sequence_info['camera'],
-                    "output_path": output_path,
-                    "resolution": [
-                        int(resolution_preset.get('res_x', 1920)),
-                        int(resolution_preset.get('res_y', 1080))
-                    ],
-                    "scene_settings": scene_preset.get('settings', {})
-                }
-                job_list.append(job_dict)
-
-            return job_list
-        except (ValueError, TypeError, KeyError) as e:
+                return None
+
+            quality_tier = form_data.get('quality_tier') or 'final'
+            if quality_tier not in QUALITY_TIERS:
+                raise ValueError(f"Unknown quality tier '{quality_tier}'")
+            tier_scale = QUALITY_TIERS[quality_tier]['resolution_scale']
+            enabled_resolutions = scale_resolutions(enabled_resolutions, tier_scale)
+
+            # --- Optional: render the largest preset once and resample the rest ---
+            derived_resolutions = None
+            if form_data.get('derive_resolutions'):
+                enabled_resolutions, derived_resolutions = self._split_derivable_resolutions(enabled_resolutions)
+
+            # One trace ID per submission; every job in the batch carries it.
+            trace_id = form_data.get('trace_id') or uuid.uuid4().hex
+            batch_id = f"job_{int(time.time() * 1000)}"
+
+            # --- Render cache fingerprinting (off unless the form opts in) ---
+            # The fingerprint only covers the asset files listed, so edits to anything else return stale frames.
+            asset_hashes = None
+            if form_data.get('use_render_cache', False):
+                asset_paths = form_data.get('cache_asset_paths') or []
+                if isinstance(asset_paths, str):
+                    asset_paths = [line.strip() for line in asset_paths.splitlines() if line.strip()]
+                asset_hashes = self.render_cache.hash_assets(asset_paths) if self.render_cache else {}
+
+            # --- Optional: split huge stills into tiles rendered across agents ---
+            tiling = None
+            tile_columns, tile_rows = int(form_data.get('tile_columns') or 1), int(form_data.get('tile_rows') or 1)
+            if tile_columns * tile_rows > 1:
+                tiling = (tile_columns, tile_rows, int(form_data.get('tile_overlap') or DEFAULT_TILE_OVERLAP))
+
+            # --- Optional: render long plates coarse-to-fine so the whole shot is reviewable early ---
+            coverage = None
+            if form_data.get('progressive_coverage'):
+                if derived_resolutions:
+                    raise ValueError("Progressive coverage can't be combined with derived resolutions")
+                coverage = (int(form_data.get('coverage_stride') or DEFAULT_COVERAGE_STRIDE),
+                            int(form_data.get('coverage_finest_stride') or DEFAULT_COVERAGE_FINEST_STRIDE),
+                            int(form_data.get('coverage_chunk_frames') or DEFAULT_COVERAGE_CHUNK_FRAMES))
+                if min(coverage) < 1:
+                    raise ValueError("Coverage strides and chunk size must be positive")
+
+            # 'final' jobs carry no tier, so their fingerprints match renders from before tiers existed.
+            job_batch = JobBatch(batch_id, trace_id, common_settings,
+                                 enabled_sequences, enabled_scene_presets, enabled_resolutions,
+                                 asset_hashes, derived_resolutions, bool(form_data.get('batch_scene_variants')),
+                                 tiling, None if quality_tier == 'final' else quality_tier, coverage)
+            if tiling:
+                job_batch.add_stitch_jobs()
+
+            # --- Optional: a draft of every combination ahead of the full-cost renders ---
+            if form_data.get('draft_first') and quality_tier != 'draft':
+                # Drafts cover the rendered (not derived) presets, untiled, in the same combination order.
+                draft_resolutions = scale_resolutions(enabled_resolutions,
+                                                      QUALITY_TIERS['draft']['resolution_scale'] / tier_scale)
+                job_batch.draft_batch = JobBatch(f"{batch_id}_draft", trace_id, common_settings,
+                                                 enabled_sequences, enabled_scene_presets, draft_resolutions,
+                                                 asset_hashes, None, bool(form_data.get('batch_scene_variants')),
+                                                 None, 'draft')
+                job_batch.held = bool(form_data.get('hold_finals'))
+
+            # --- Optional: contact sheets once the sweep has rendered ---
+            if form_data.get('contact_sheet'):
+                frame_selectors = [f.strip() for f in str(form_data.get('contact_sheet_frames') or 'middle').split(',') if f.strip()]
+                for batch in (job_batch.draft_batch, job_batch):
+                    if batch:
+                        batch.add_contact_sheet_job(frame_selectors)
+            return job_batch
+        except (ValueError, TypeError, KeyError, OSError) as e:
             print(f"Error creating job batch: {e}")
-            return []
+            return None
 
-    def _get_enabled_sequences(self, sequences_data):
-        """Helper to flatten the sequence tree into a list of {path, camera} dicts."""
+    def _parse_console_variables(self, text):
+        """Parses 'r.Name value' lines into a dict; numeric values become numbers."""
+        if isinstance(text, dict):
+            return text
+        variables = {}
+        for line in (text or '').splitlines():
+            name, _, value = line.strip().partition(' ')
+            if not name:
+                continue
+            value = value.strip()
+            for number_type in (int, float):
+                try:
+                    value = number_type(value)
+                    break
+                except ValueError:
+                    continue
+            variables[name] = value
+        return variables
+
+    def _split_derivable_resolutions(self, resolutions):
+        """
+        Picks the largest resolution preset and finds every other preset that is a
+        pure downscale of it (same aspect ratio, no larger on either axis). Presets
+        that cannot be derived are still rendered directly.
+        :return: (resolutions_to_render, {largest: [derivable, ...]})
+        """
+        unique = list(dict.fromkeys(resolutions))
+        largest = max(unique, key=lambda r: r[0] * r[1])
+        largest_aspect = largest[0] / largest[1]
+
+        derivable, to_render = [], [largest]
+        for res in unique:
+            if res == largest:
+                continue
+            same_aspect = abs(res[0] / res[1] - largest_aspect) < 0.01
+            if same_aspect and res[0] <= largest[0] and res[1] <= largest[1]:
+                derivable.append(res)
+            else:
+                to_render.append(res)
+        return to_render, {largest: derivable} if derivable else {}
+
+    def _get_enabled_sequences(self, sequences_data, group_cameras=False):
+        """
+        Helper to flatten the sequence tree into a list of {path, camera} dicts.
+        With group_cameras, each sequence instead becomes one {path, cameras} entry
+        so the executor renders all of its cameras after a single map load.
+        """
         flat_list = []
         for seq in sequences_data:
-            for cam in seq.get('cameras', []):
+            cameras = seq.get('cameras', [])
+            if group_cameras:
+                if cameras:
+                    flat_list.append({'path': seq.get('path'), 'cameras': list(cameras)})
+                continue
+            for cam in cameras:
                 flat_list.append({'path': seq.get('path'), 'camera': cam})
         return flat_list
-
@@ -0,0 +1,138 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+JOB_HISTORY_FILE = 'director_history.jsonl'
+
+# Job keys copied into 'queued' events; enough to replay a job without its full settings.
+HISTORY_JOB_KEYS = ('job_type', 'level_path', 'sequence_path', 'resolution', 'frame_range', 'trace_id',
+                    'launch_profile')
+
+
+class JobHistory:
+    """
+    An append-only JSONL log of what the Director did: jobs queued, dispatched
+    and finished, and agents connecting and disconnecting. It is the input to
+    Simulator/replay_sim.py, which replays a farm's real arrivals, durations
+    and agent availability under other scheduling policies.
+
+    Events are buffered and written in batches, so recording a dispatch costs
+    a list append; at most flush_interval seconds of history are lost if the
+    Director is killed.
+    """
+    def __init__(self, path=JOB_HISTORY_FILE, flush_interval=5.0, flush_lines=500):
+        self.path = os.path.abspath(path)
+        self.flush_interval = flush_interval
+        self.flush_lines = flush_lines
+        self.lock = threading.Lock()
+        self.pending = []
+        self.last_flush = time.time()
+        atexit.register(self.flush)
+
+    # --- Recording ---
+
+    def record_queued(self, job, queued_at=None):
+        fields = {key: job[key] for key in HISTORY_JOB_KEYS if key in job}
+        self.record('queued', queued_at, job_id=job['job_id'], **fields)
+
+    def record_dispatched(self, job_id, agent_id, dispatched_at=None):
+        self.record('dispatched', dispatched_at, job_id=job_id, agent_id=agent_id)
+
+    def record_finished(self, job_id, agent_id, status):
+        self.record('finished', None, job_id=job_id, agent_id=agent_id, status=status)
+
+    def record_agent(self, agent_id, connected):
+        self.record('agent_connected' if connected else 'agent_disconnected', None, agent_id=agent_id)
+
+    def record(self, event, timestamp=None, **fields):
+        line = json.dumps(dict(fields, event=event, t=timestamp or time.time()))
+        with self.lock:
+            self.pending.append(line)
+            due = len(self.pending) >= self.flush_lines or time.time() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            lines, self.pending = self.pending, []
+            self.last_flush = time.time()
+            if not lines:
+                return
+            try:
+                with open(self.path, 'a') as f:
+                    f.write('\n'.join(lines) + '\n')
+            except IOError as e:
+                print(f"Could not write job history: {e}")
+
+
+def load_history(path, start=None, end=None):
+    """
+    Reads a history log into the jobs and agent availability a replay needs.
+    Jobs that were never dispatched (cache hits, still queued) or never
+    finished are left out.
+    :param start, end: Optional epoch seconds bounding the events read.
+    :return: (jobs, agents). jobs is a list of dicts sorted by arrival with
+             arrival, dispatched, finished, duration, agent_id and status plus the
+             recorded job keys. agents is {agent_id: [(up, down or None), ...]}.
+    """
+    queued, dispatched, finished = {}, {}, {}
+    agent_events = {}
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue # A killed Director can leave a truncated last line
+            t = event.get('t')
+            if t is None or (start is not None and t < start) or (end is not None and t > end):
+                continue
+            kind = event.get('event')
+            if kind == 'queued':
+                # The first arrival wins; later ones are re-queues of the same job.
+                queued.setdefault(event['job_id'], event)
+            elif kind == 'dispatched':
+                # A re-dispatched job (e.g. after its agent dropped) ran on its last agent.
+                dispatched[event['job_id']] = event
+            elif kind == 'finished':
+                finished[event['job_id']] = event
+            elif kind in ('agent_connected', 'agent_disconnected'):
+                agent_events.setdefault(event['agent_id'], []).append((t, kind == 'agent_connected'))
+
+    jobs = []
+    for job_id, finish in finished.items():
+        dispatch = dispatched.get(job_id)
+        if not dispatch or finish['t'] < dispatch['t']:
+            continue
+        job = {key: value for key, value in queued.get(job_id, {}).items() if key not in ('event', 't')}
+        job.update({
+            "job_id": job_id, "arrival": min(queued[job_id]['t'], dispatch['t']) if job_id in queued else dispatch['t'],
+            "dispatched": dispatch['t'], "finished": finish['t'], "duration": finish['t'] - dispatch['t'],
+            "agent_id": dispatch['agent_id'], "status": finish.get('status')
+        })
+        jobs.append(job)
+    jobs.sort(key=lambda job: (job['arrival'], job['dispatched']))
+
+    # Agents that only appear in dispatches were connected before the log started. Disconnects
+    # after the last job finished (the Director or the farm shutting down) don't limit a replay.
+    last_finish = max((job['finished'] for job in jobs), default=None)
+    first_event = min([job['arrival'] for job in jobs] + [t for events in agent_events.values() for t, _ in events],
+                      default=0)
+    for job in jobs:
+        agent_events.setdefault(job['agent_id'], [])
+    agents = {}
+    for agent_id, events in agent_events.items():
+        intervals, up = [], None
+        for t, connected in sorted(events):
+            if connected and up is None:
+                up = t
+            elif not connected:
+                intervals.append((first_event if up is None else up, t))
+                up = None
+        if up is not None or not intervals:
+            intervals.append((first_event if up is None else up, None))
+        elif last_finish is not None and intervals[-1][1] >= last_finish:
+            intervals[-1] = (intervals[-1][0], None)
+        agents[agent_id] = intervals
+    return jobs, agents
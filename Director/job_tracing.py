@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict
+
+DIRECTOR_HOST = 'director'
+BATCH_LANE = 'batch'
+# Executors report a span per frame; spans past this many in one trace are counted instead of kept.
+MAX_SPANS_PER_TRACE = 20000
+
+class JobTracer:
+    """
+    Collects timing spans for jobs as they travel from the UI through the
+    Director, the Agent and the in-engine executor. Spans are grouped by the
+    trace ID carried in each job dict and can be exported as Chrome trace JSON
+    (load it in chrome://tracing or ui.perfetto.dev).
+
+    Timestamps recorded on other machines are kept in their own clock and
+    shifted onto the Director's clock at export time, using an offset
+    estimated from the timestamps agents put on every status message.
+    """
+    def __init__(self, max_traces=500, max_spans_per_trace=MAX_SPANS_PER_TRACE):
+        self.lock = threading.Lock()
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        self.traces = OrderedDict()   # trace_id -> list of span dicts
+        self.dropped_spans = {}       # trace_id -> spans not kept because the trace was full
+        self.open_spans = {}          # trace_id -> {(job_id, name): (start, args)}
+        self.clock_offsets = {}       # host -> seconds to add to a remote timestamp
+
+    # --- Recording ---
+
+    def add_span(self, trace_id, job_id, name, start, end=None, host=DIRECTOR_HOST, args=None):
+        """
+        Records a finished span. A span without an end is exported as an instant event.
+        :param job_id: The lane the span is drawn in. None puts it in the batch lane.
+        :param host: Whose clock 'start' and 'end' were measured on.
+        """
+        if not trace_id:
+            return
+        span = {
+            "name": name, "host": host, "job_id": job_id or BATCH_LANE,
+            "start": start, "end": end, "args": args or {}
+        }
+        with self.lock:
+            spans = self.traces.get(trace_id)
+            if spans is None:
+                spans = self.traces[trace_id] = []
+                # Keep memory bounded on a long-running Director.
+                while len(self.traces) > self.max_traces:
+                    evicted_id, _ = self.traces.popitem(last=False)
+                    self.dropped_spans.pop(evicted_id, None)
+                    self.open_spans.pop(evicted_id, None)
+            if len(spans) >= self.max_spans_per_trace:
+                self.dropped_spans[trace_id] = self.dropped_spans.get(trace_id, 0) + 1
+                return
+            spans.append(span)
+
+    def begin(self, trace_id, job_id, name, args=None):
+        """Opens a Director-side span that will be closed later by end()."""
+        if not trace_id:
+            return
+        with self.lock:
+            self.open_spans.setdefault(trace_id, {})[(job_id, name)] = (time.time(), args)
+
+    def end(self, trace_id, job_id, name, args=None):
+        """Closes a span opened by begin(). Does nothing if it was never opened."""
+        if not trace_id:
+            return
+        with self.lock:
+            trace_open_spans = self.open_spans.get(trace_id, {})
+            opened = trace_open_spans.pop((job_id, name), None)
+            if not trace_open_spans:
+                self.open_spans.pop(trace_id, None)
+        if opened:
+            start, start_args = opened
+            merged_args = dict(start_args or {})
+            merged_args.update(args or {})
+            self.add_span(trace_id, job_id, name, start, time.time(), args=merged_args)
+
+    def discard(self, trace_id, job_id):
+        """Forgets the spans still open for a job that was dropped or will start over, without recording them."""
+        if not trace_id:
+            return
+        with self.lock:
+            trace_open_spans = self.open_spans.get(trace_id, {})
+            for key in [key for key in trace_open_spans if key[0] == job_id]:
+                del trace_open_spans[key]
+            if not trace_open_spans:
+                self.open_spans.pop(trace_id, None)
+
+    def add_remote_events(self, host, trace_id, job_id, events):
+        """
+        Records events reported by an agent or executor.
+        :param events: A list of {"name", "ts", optional "dur", optional "args"} dicts,
+                       timestamped on the remote host's clock.
+        """
+        for event in events or []:
+            try:
+                start = float(event["ts"])
+                dur = event.get("dur")
+                end = start + float(dur) if dur is not None else None
+                self.add_span(trace_id, job_id, event["name"], start, end,
+                              host=host, args=event.get("args"))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def record_clock_sample(self, host, remote_timestamp, local_time=None):
+        """
+        Refines the clock offset for a host from one message it sent.
+        (local receive time - remote send time) is the true offset plus the
+        one-way network delay, so the smallest value seen is the best estimate.
+        """
+        if host is None or remote_timestamp is None:
+            return
+        local_time = local_time if local_time is not None else time.time()
+        try:
+            sample = local_time - float(remote_timestamp)
+        except (TypeError, ValueError):
+            return
+        with self.lock:
+            current = self.clock_offsets.get(host)
+            if current is None or sample < current:
+                self.clock_offsets[host] = sample
+
+    # --- Export ---
+
+    def get_trace_ids(self):
+        with self.lock:
+            return list(self.traces.keys())
+
+    def export_chrome_trace(self, trace_id=None):
+        """
+        Builds a Chrome trace event dict. Each host becomes a process and each
+        job a thread, so queueing, startup and rendering line up per job.
+        :param trace_id: Export a single trace, or every retained trace if None.
+        """
+        with self.lock:
+            if trace_id is not None:
+                selected = {trace_id: list(self.traces.get(trace_id, []))}
+            else:
+                selected = {tid: list(spans) for tid, spans in self.traces.items()}
+            offsets = dict(self.clock_offsets)
+            dropped_spans = {tid: self.dropped_spans[tid] for tid in selected if tid in self.dropped_spans}
+
+        events = []
+        pids, tids = {}, {}
+        for current_trace_id, spans in selected.items():
+            for span in spans:
+                host = span["host"]
+                if host not in pids:
+                    pids[host] = len(pids) + 1
+                    events.append({"name": "process_name", "ph": "M", "pid": pids[host], "tid": 0,
+                                   "args": {"name": host}})
+                lane = (host, span["job_id"])
+                if lane not in tids:
+                    tids[lane] = len(tids) + 1
+                    events.append({"name": "thread_name", "ph": "M", "pid": pids[host], "tid": tids[lane],
+                                   "args": {"name": span["job_id"]}})
+
+                offset = 0.0 if host == DIRECTOR_HOST else offsets.get(host, 0.0)
+                args = dict(span["args"])
+                args["trace_id"] = current_trace_id
+                event = {
+                    "name": span["name"], "cat": host,
+                    "ts": int((span["start"] + offset) * 1e6),
+                    "pid": pids[host], "tid": tids[lane], "args": args
+                }
+                if span["end"] is None:
+                    event.update({"ph": "i", "s": "t"})
+                else:
+                    event.update({"ph": "X", "dur": max(0, int((span["end"] - span["start"]) * 1e6))})
+                events.append(event)
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"clock_offsets": offsets, "dropped_spans": dropped_spans}
+        }
@@ -0,0 +1,272 @@
+import argparse
+import copy
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_FILE_NAME_FORMAT = '{sequence_name}.{frame_number}'
+
+# Leading bytes of each output format; enough to tell a real frame from a truncated or empty one.
+HEADER_SIGNATURES = {
+    '.png': (b'\x89PNG\r\n\x1a\n',),
+    '.exr': (b'\x76\x2f\x31\x01',),
+    '.jpg': (b'\xff\xd8\xff',),
+    '.jpeg': (b'\xff\xd8\xff',),
+    '.tif': (b'II*\x00', b'MM\x00*'),
+    '.tiff': (b'II*\x00', b'MM\x00*'),
+    '.bmp': (b'BM',),
+}
+HEADER_READ_SIZE = 8
+
+# Repair jobs for gaps closer than this many frames are merged, since every job pays for an engine start.
+REPAIR_MERGE_GAP = 8
+
+
+def to_ranges(frames):
+    """Compacts frame numbers into inclusive [first, last] ranges, e.g. [1, 2, 3, 7] -> [[1, 3], [7, 7]]."""
+    ranges = []
+    for frame in sorted(set(frames)):
+        if ranges and frame == ranges[-1][1] + 1:
+            ranges[-1][1] = frame
+        else:
+            ranges.append([frame, frame])
+    return ranges
+
+
+def merge_ranges(ranges, max_gap):
+    """Joins ranges separated by at most max_gap frames."""
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first - merged[-1][1] - 1 <= max_gap:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+
+def compile_file_name_pattern(file_name_format):
+    """
+    Turns a Movie Render Graph file name format into a regex over file names.
+    {frame_number} captures the frame, other {tokens} match anything, and any
+    extension is accepted.
+    """
+    pattern = ''
+    for literal, token in re.findall(r'([^{]*)(\{[^}]*\})?', file_name_format):
+        pattern += re.escape(literal)
+        if token == '{frame_number}':
+            pattern += r'(?P<frame>\d+)'
+        elif token:
+            pattern += r'.*?'
+    return re.compile(r'^' + pattern + r'(?P<ext>\.[A-Za-z0-9]+)$')
+
+
+def job_output_passes(job_dict):
+    """
+    Lists the directories a job writes frames into, mirroring how the executor
+    splits a job into passes, with the job keys that select each pass.
+    :return: A list of (output_dir, overrides) tuples.
+    """
+    variants = job_dict.get('scene_variants') or [None]
+    cameras = job_dict.get('camera_actor_names') or [None]
+    passes = []
+    for variant in variants:
+        base_dir = variant['output_path'] if variant else job_dict['output_path']
+        for camera in cameras:
+            overrides = {}
+            if variant:
+                overrides['scene_settings'] = variant['scene_settings']
+            if camera:
+                overrides['camera_actor_name'] = camera
+            passes.append((f"{base_dir}/{camera}" if camera else base_dir, overrides))
+    return passes
+
+
+class OutputVerifier:
+    """
+    Checks that a finished job left a valid file for every expected frame.
+    Directories are listed in parallel and the per-file checks (size and the
+    first few header bytes) are spread over the same thread pool in chunks,
+    so verifying a large batch does not degrade into one long serial run of
+    stat calls.
+    """
+    def __init__(self, workers=16, chunk_size=512):
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    # --- Public Methods ---
+
+    def verify(self, directories, frame_range, file_name_format=DEFAULT_FILE_NAME_FORMAT, check_headers=True,
+               frame_set=None):
+        """
+        Verifies that each directory holds frames frame_range[0]..frame_range[1].
+        :param frame_set: Only expect these frames, e.g. of a progressive coverage job
+                          sharing its directory with jobs rendering the frames in between.
+        :return: {directory: {"found": count, "missing": ranges, "invalid": ranges, "unverifiable": reason}}
+                 where "unverifiable" is None unless the directory could not be listed, e.g. on an
+                 unreachable share. Such a directory reports no missing frames.
+        """
+        pattern = compile_file_name_pattern(file_name_format)
+        first, last = int(frame_range[0]), int(frame_range[1])
+        wanted = set(frame_set) if frame_set else None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            listings = list(pool.map(lambda d: self._list_frames(d, pattern, first, last, wanted), directories))
+
+            # Fan the per-file checks of all directories out over the pool together.
+            futures = []
+            for dir_index, (candidates, _) in enumerate(listings):
+                for start in range(0, len(candidates), self.chunk_size):
+                    chunk = candidates[start:start + self.chunk_size]
+                    futures.append((dir_index, pool.submit(self._check_files, chunk, check_headers)))
+
+            valid = [set() for _ in directories]
+            invalid = [set() for _ in directories]
+            for dir_index, future in futures:
+                good, bad = future.result()
+                valid[dir_index].update(good)
+                invalid[dir_index].update(bad)
+
+        report = {}
+        expected = sorted(wanted) if wanted else range(first, last + 1)
+        for dir_index, directory in enumerate(directories):
+            error = listings[dir_index][1]
+            if error:
+                report[directory] = {"found": 0, "missing": [], "invalid": [], "unverifiable": error}
+                continue
+            # A frame is fine if any of its files (e.g. one per render layer) is valid and none is broken.
+            bad_frames = invalid[dir_index]
+            good_frames = valid[dir_index] - bad_frames
+            report[directory] = {
+                "found": len(good_frames),
+                "missing": to_ranges(f for f in expected if f not in good_frames and f not in bad_frames),
+                "invalid": to_ranges(bad_frames),
+                "unverifiable": None
+            }
+        return report
+
+    def verify_job(self, job_dict, check_headers=True):
+        """Verifies every pass directory of a job that carries a 'frame_range' (and maybe a 'frame_set')."""
+        passes = job_output_passes(job_dict)
+        return self.verify([directory for directory, _ in passes], job_dict['frame_range'],
+                           job_dict.get('file_name_format', DEFAULT_FILE_NAME_FORMAT), check_headers,
+                           job_dict.get('frame_set'))
+
+    def build_repair_jobs(self, job_dict, report):
+        """
+        Creates sub-jobs that re-render only the missing or invalid frames of a job.
+        Each repair job targets one pass directory and one frame range, or for a
+        job with a 'frame_set', one pass directory and exactly the frames it lacks.
+        """
+        repair_jobs = []
+        for directory, overrides in job_output_passes(job_dict):
+            result = report.get(directory)
+            if not result:
+                continue
+            gaps = result['missing'] + result['invalid']
+            if job_dict.get('frame_set'):
+                # Merging sparse gaps would re-render frames that other coverage jobs own.
+                frames = sorted(frame for first, last in gaps for frame in range(first, last + 1))
+                repairs = [([frames[0], frames[-1]], frames)] if frames else []
+            else:
+                repairs = [(frame_range, None) for frame_range in merge_ranges(gaps, REPAIR_MERGE_GAP)]
+            for (first, last), frame_set in repairs:
+                repair_job = copy.deepcopy(job_dict)
+                for key in ('fingerprint', 'dependent_jobs', 'depends_on', 'camera_actor_names', 'scene_variants',
+                            'coverage'):
+                    repair_job.pop(key, None)
+                if frame_set:
+                    repair_job["frame_set"] = frame_set
+                repair_job.update(overrides)
+                repair_job.update({
+                    "job_id": f"{job_dict['job_id']}_repair{len(repair_jobs)}",
+                    "output_path": directory,
+                    "frame_range": [first, last],
+                    "repair_of": job_dict.get('repair_of', job_dict['job_id']),
+                    "repair_attempt": job_dict.get('repair_attempt', 0) + 1
+                })
+                repair_jobs.append(repair_job)
+        return repair_jobs
+
+    @staticmethod
+    def has_gaps(report):
+        return any(result['missing'] or result['invalid'] for result in report.values())
+
+    @staticmethod
+    def unverifiable(report):
+        """{directory: reason} for the directories that could not be listed."""
+        return {directory: result['unverifiable'] for directory, result in report.items() if result.get('unverifiable')}
+
+    # --- Scanning ---
+
+    @staticmethod
+    def _list_frames(directory, pattern, first, last, wanted=None):
+        """
+        Lists (frame, DirEntry) pairs for the files in one directory that fall inside the range (and set).
+        :return: (candidates, error), where error says why the directory could not be listed, or is None.
+        """
+        candidates = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    match = pattern.match(entry.name)
+                    if not match:
+                        continue
+                    frame = int(match.group('frame'))
+                    if first <= frame <= last and (wanted is None or frame in wanted):
+                        candidates.append((frame, entry))
+        except FileNotFoundError as e:
+            # A missing directory reports every frame as missing, but only if the volume or share holding it is there.
+            if not OutputVerifier._has_existing_ancestor(directory):
+                return [], str(e)
+        except OSError as e:
+            return [], str(e)
+        return candidates, None
+
+    @staticmethod
+    def _has_existing_ancestor(path):
+        parent = os.path.dirname(os.path.abspath(path))
+        while True:
+            if os.path.isdir(parent):
+                return True
+            next_parent = os.path.dirname(parent)
+            if next_parent == parent:
+                return False
+            parent = next_parent
+
+    @staticmethod
+    def _check_files(candidates, check_headers):
+        """Checks size and header bytes of a chunk of files. Returns (valid_frames, invalid_frames)."""
+        valid, invalid = [], []
+        for frame, entry in candidates:
+            try:
+                if entry.stat().st_size < HEADER_READ_SIZE:
+                    invalid.append(frame)
+                    continue
+                signatures = HEADER_SIGNATURES.get(os.path.splitext(entry.name)[1].lower())
+                if check_headers and signatures:
+                    with open(entry.path, 'rb') as f:
+                        header = f.read(HEADER_READ_SIZE)
+                    if not header.startswith(signatures):
+                        invalid.append(frame)
+                        continue
+            except OSError:
+                invalid.append(frame)
+                continue
+            valid.append(frame)
+        return valid, invalid
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check rendered frame sequences for missing or broken frames.")
+    parser.add_argument('directories', nargs='+')
+    parser.add_argument('--first', type=int, required=True)
+    parser.add_argument('--last', type=int, required=True)
+    parser.add_argument('--format', default=DEFAULT_FILE_NAME_FORMAT, help="File name format, e.g. '{sequence_name}.{frame_number}'")
+    parser.add_argument('--no-headers', action='store_true', help="Only check existence and size.")
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    verifier = OutputVerifier(workers=args.workers)
+    result = verifier.verify(args.directories, (args.first, args.last), args.format, not args.no_headers)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+RENDER_CACHE_FILE = 'render_cache.jsonl'
+
+# Bump when the meaning of a job parameter changes so old outputs stop matching.
+FINGERPRINT_VERSION = 1
+
+# Job keys that identify a particular submission rather than what gets rendered.
+NON_RENDER_KEYS = ('job_id', 'trace_id', 'output_path', 'fingerprint',
+                   'source_path', 'source_paths', 'depends_on', 'dependent_jobs', 'coverage')
+
+
+def job_fingerprint(job_dict, asset_hashes=None):
+    """
+    Builds a deterministic fingerprint of everything that affects a job's pixels:
+    the job parameters (including graph_path) and, optionally, content hashes of
+    asset files such as the level or graph packages.
+    :param asset_hashes: A dictionary of {path: sha256}, see RenderCache.hash_assets.
+    """
+    render_params = {k: v for k, v in job_dict.items() if k not in NON_RENDER_KEYS}
+    if 'scene_variants' in render_params:
+        # Variant output paths are per submission too; only the settings affect the frames.
+        render_params['scene_variants'] = [v['scene_settings'] for v in render_params['scene_variants']]
+    payload = {
+        "version": FINGERPRINT_VERSION,
+        "params": render_params,
+        "assets": asset_hashes or {}
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    A persistent index mapping job fingerprints to the output directory of a
+    completed render. A resubmitted permutation whose fingerprint is already
+    in the index is satisfied by copying the existing frames instead of
+    rendering them again.
+
+    The index is an append-only JSONL journal, so recording a completion
+    costs one short write no matter how large the cache grows.
+    """
+    def __init__(self, index_path=RENDER_CACHE_FILE):
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.entries = self._load_index()
+        self.file_hashes = {} # (path, size, mtime) -> sha256, so unchanged assets are hashed once
+
+    # --- Public Methods ---
+
+    def is_empty(self):
+        with self.lock:
+            return not self.entries
+
+    def hash_assets(self, asset_paths):
+        """Returns {path: sha256} for the given files. Missing files hash to None."""
+        hashes = {}
+        for path in asset_paths or []:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                hashes[path] = None
+                continue
+
+            key = (path, stat.st_size, stat.st_mtime)
+            if key not in self.file_hashes:
+                digest = hashlib.sha256()
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                self.file_hashes[key] = digest.hexdigest()
+            hashes[path] = self.file_hashes[key]
+        return hashes
+
+    def lookup(self, fingerprint, check_outputs=True):
+        """
+        Returns the cache entry for a fingerprint, or None if missing or its outputs are gone.
+        :param check_outputs: Whether to stat the output directory, which may be on a slow
+                              share. Without it, materialize() finds out instead.
+        """
+        if not fingerprint:
+            return None
+        with self.lock:
+            entry = self.entries.get(fingerprint)
+        if entry and check_outputs and not os.path.isdir(entry['output_path']):
+            self.invalidate(fingerprint)
+            return None
+        return entry
+
+    def record(self, fingerprint, job_dict):
+        """Adds a successfully completed job's outputs to the index."""
+        if not fingerprint:
+            return
+        with self.lock:
+            entry = {
+                "output_path": job_dict['output_path'],
+                "job_id": job_dict['job_id'],
+                "completed_at": time.time()
+            }
+            self.entries[fingerprint] = entry
+            self._append_to_index(dict(entry, fingerprint=fingerprint))
+
+    def invalidate(self, fingerprint):
+        with self.lock:
+            if self.entries.pop(fingerprint, None) is not None:
+                self._append_to_index({"fingerprint": fingerprint, "removed": True})
+
+    def materialize(self, entry, destination):
+        """
+        Copies the cached outputs to a new job's output path. The files are not
+        hard-linked, so repairing or overwriting the new job's frames can't
+        change the cached originals.
+        :return: The number of files placed.
+        :raises FileNotFoundError: If the cached outputs are gone.
+        """
+        source = entry['output_path']
+        if os.path.normcase(os.path.abspath(source)) == os.path.normcase(os.path.abspath(destination)):
+            return 0
+        if not os.path.isdir(source):
+            raise FileNotFoundError(f"Cached outputs at '{source}' are gone")
+
+        placed = 0
+        for root, _, files in os.walk(source):
+            target_dir = os.path.join(destination, os.path.relpath(root, source))
+            os.makedirs(target_dir, exist_ok=True)
+            for name in files:
+                src_file = os.path.join(root, name)
+                dst_file = os.path.join(target_dir, name)
+                if os.path.exists(dst_file):
+                    continue
+                shutil.copy2(src_file, dst_file)
+                placed += 1
+        return placed
+
+    # --- Persistence ---
+
+    def _load_index(self):
+        """Replays the journal. Later lines override earlier ones."""
+        entries = {}
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue # Tolerate a torn last line
+                        fingerprint = record.pop('fingerprint', None)
+                        if not fingerprint:
+                            continue
+                        if record.get('removed'):
+                            entries.pop(fingerprint, None)
+                        else:
+                            entries[fingerprint] = record
+        except IOError as e:
+            print(f"Could not load render cache index: {e}")
+        return entries
+
+    def _append_to_index(self, record):
+        """Appends one journal line. Must hold self.lock."""
+        try:
+            with open(self.index_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        except IOError as e:
+            print(f"Could not update render cache index: {e}")
@@ -1,8 +1,10 @@
 class AgentCard {
-    constructor(agentData, disconnectCallback) {
+    constructor(agentData, disconnectCallback, calibrateCallback) {
         this.agentData = agentData;
         this.disconnectCallback = disconnectCallback;
+        this.calibrateCallback = calibrateCallback;
         this.expanded = false; // Track expanded state
+        this.preview = null; // Latest thumbnail pushed by the agent
         this.element = this._createCardElement();
         this.update(agentData);
         this._bindEvents();
@@ -30,7 +32,8 @@ class AgentCard {
 
         // Always show circular progress indicator if progress is available
         let progressBarHtml = '';
-        if (status === 'Rendering' && typeof this.agentData.progress === 'number') {
+        const isWorking = status === 'Rendering' || status === 'Processing' || status === 'Uploading' || status === 'Calibrating';
+        if (isWorking && typeof this.agentData.progress === 'number') {
             const percent = Math.max(0, Math.min(100, this.agentData.progress * 100));
             const radius = 32;
             const stroke = 8;
@@ -73,11 +76,24 @@ class AgentCard {
         }
         // Show progress details only if rendering and expanded
         let progressDetailsHtml = '';
-        if (status === 'Rendering' && wasExpanded) {
+        if (isWorking && wasExpanded) {
             progressDetailsHtml = `
                 <div class="status-line">Progress: <strong>${(this.agentData.progress * 100).toFixed(1)}%</strong> (Frame: ${this.agentData.current_frame})</div>
             `;
         }
+        if (isWorking && wasExpanded && this.agentData.frames_total) {
+            progressDetailsHtml += `<div class="status-line">Frames: <strong>${this.agentData.frames_done} / ${this.agentData.frames_total}</strong></div>`;
+        }
+        if (isWorking && wasExpanded && this.agentData.render_pass_count > 1) {
+            const variant = this.agentData.variant;
+            progressDetailsHtml += `
+                <div class="status-line">Pass ${this.agentData.render_pass + 1} of ${this.agentData.render_pass_count}${variant !== null && variant !== undefined ? ` (variant ${variant})` : ''}: <strong>${((this.agentData.pass_progress || 0) * 100).toFixed(1)}%</strong></div>
+                <div class="status-line">Output: ${this.agentData.output_path || 'N/A'}</div>
+            `;
+        }
+        if (isWorking && wasExpanded && typeof this.agentData.eta_seconds === 'number') {
+            progressDetailsHtml += `<div class="status-line">ETA: <strong>${formatDuration(this.agentData.eta_seconds)}</strong></div>`;
+        }
 
         // Move circular progress outside of .agent-card-details so it's always visible
         this.element.innerHTML = `
@@ -86,10 +102,14 @@ class AgentCard {
                 <div class="status-line"><strong>Status:</strong> <span class="status-text">${status}</span></div>
             </div>
             ${progressBarHtml}
+            ${this._previewHtml(isWorking)}
             <div class="agent-card-details">
                 <div class="status-line"><strong>IP Address:</strong> ${this.agentData.ip}</div>
                 <div class="status-line"><strong>Current Job:</strong> ${this.agentData.job_id || 'N/A'}</div>
+                <div class="status-line"><strong>Speed:</strong> ${this._speedText()}</div>
+                ${this._timingHtml()}
                 ${progressDetailsHtml}
+                <button class="btn-calibrate" data-agent-id="${this.agentData.agent_id}">Calibrate</button>
                 <button class="btn-disconnect" data-agent-id="${this.agentData.agent_id}">Disconnect</button>
             </div>
         `;
@@ -97,6 +117,50 @@ class AgentCard {
         this._bindEvents();
     }
 
+    setPreview(preview) {
+        this.preview = preview;
+        const img = this.element.querySelector('.agent-preview img');
+        if (img && this.preview.job_id === this.agentData.job_id) {
+            // Swap the image in place so a rate-limited push never rebuilds the whole card.
+            img.src = this.preview.image;
+            img.title = this.preview.frame;
+        } else {
+            this.update(this.agentData);
+        }
+    }
+
+    _speedText() {
+        const profile = this.agentData.profile;
+        if (!profile || !profile.classes) {
+            return 'Not calibrated';
+        }
+        const speeds = Object.entries(profile.classes).map(([name, result]) => `${name.toUpperCase()} ${result.fps.toFixed(2)} fps`);
+        const stale = profile.hardware_id !== this.agentData.hardware_id ? ' (hardware changed)' : '';
+        return speeds.join(', ') + stale;
+    }
+
+    _timingHtml() {
+        // The executor's summary of the agent's last completed render.
+        const timing = this.agentData.timing;
+        if (!timing || !timing.startup) {
+            return '';
+        }
+        const startup = timing.startup;
+        let html = `<div class="status-line"><strong>Last Startup:</strong> ${typeof timing.time_to_first_frame === 'number' ? formatDuration(timing.time_to_first_frame) : 'N/A'}`
+            + ` (map ${startup.map_load.toFixed(1)}s, init ${startup.pipeline_initialize.toFixed(1)}s, warm-up ${startup.warmup.toFixed(1)}s)</div>`;
+        if (timing.frames) {
+            html += `<div class="status-line"><strong>Last Frames:</strong> ${timing.frames}, p50 ${timing.frame_p50.toFixed(2)}s, p95 ${timing.frame_p95.toFixed(2)}s</div>`;
+        }
+        return html;
+    }
+
+    _previewHtml(isWorking) {
+        if (!isWorking || !this.preview || this.preview.job_id !== this.agentData.job_id) {
+            return '';
+        }
+        return `<div class="agent-preview"><img src="${this.preview.image}" title="${this.preview.frame}" alt="Latest frame"></div>`;
+    }
+
     _bindEvents() {
         const header = this.element.querySelector('.agent-card-header');
         if (header) {
@@ -108,6 +172,14 @@ class AgentCard {
             });
         }
 
+        const calibrateBtn = this.element.querySelector('.btn-calibrate');
+        if (calibrateBtn && this.calibrateCallback) {
+            calibrateBtn.addEventListener('click', (e) => {
+                e.stopPropagation();
+                this.calibrateCallback(this.agentData.agent_id);
+            });
+        }
+
         const disconnectBtn = this.element.querySelector('.btn-disconnect');
         if (disconnectBtn) {
             disconnectBtn.addEventListener('click', (e) => {
@@ -123,3 +195,13 @@ class AgentCard {
         this.element.remove();
     }
 }
+
+function formatDuration(seconds) {
+    const total = Math.max(0, Math.round(seconds));
+    const hours = Math.floor(total / 3600);
+    const minutes = Math.floor((total % 3600) / 60);
+    if (hours > 0) {
+        return `${hours}h ${minutes}m`;
+    }
+    return minutes > 0 ? `${minutes}m ${total % 60}s` : `${total}s`;
+}
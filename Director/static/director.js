@@ -8,6 +8,8 @@ document.addEventListener('DOMContentLoaded', () => {
     const addAgentBtn = document.getElementById('btn-add-agent');
     const agentIpInput = document.getElementById('agent-ip');
     const jobQueueList = document.getElementById('job-queue-list');
+    const rejectDraftIdsInput = document.getElementById('reject-draft-ids');
+    const rejectDraftsBtn = document.getElementById('btn-reject-drafts');
     window.agentStatusContainer = document.getElementById('agent-status-container'); // Make global for AgentCard
 
     // --- State Management ---
@@ -15,7 +17,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // --- Component Initialization ---
     const jobFactory = new JobFactoryUI((formData) => {
-        socket.emit('submit_job', { form_data: formData });
+        socket.emit('submit_job', { form_data: formData, submitted_at: Date.now() / 1000 });
     });
 
     // --- Socket.IO Event Handlers ---
@@ -29,10 +31,18 @@ document.addEventListener('DOMContentLoaded', () => {
         } else {
             agentCards[agentId] = new AgentCard(data, (id) => {
                 socket.emit('disconnect_agent_request', { agent_id: id });
+            }, (id) => {
+                socket.emit('calibrate_agent_request', { agent_id: id });
             });
         }
     });
 
+    socket.on('agent_preview', (data) => {
+        if (agentCards[data.agent_id]) {
+            agentCards[data.agent_id].setPreview(data);
+        }
+    });
+
     socket.on('disconnect_agent', (data) => {
         const agentId = data.agent_id;
         if (agentCards[agentId]) {
@@ -42,7 +52,7 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     socket.on('queue_update', (data) => {
-        updateJobQueue(data.queue);
+        updateJobQueue(data.queue, data.eta_seconds, data.coverage);
     });
 
     // --- Global Event Listeners ---
@@ -53,6 +63,14 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    rejectDraftsBtn.addEventListener('click', () => {
+        const jobIds = rejectDraftIdsInput.value.split(',').map(id => id.trim()).filter(id => id.length > 0);
+        if (jobIds.length > 0) {
+            socket.emit('reject_drafts_request', { job_ids: jobIds });
+            rejectDraftIdsInput.value = '';
+        }
+    });
+
     // --- Helper Functions ---
     function addLogMessage(message) {
         const time = new Date().toLocaleTimeString();
@@ -60,17 +78,48 @@ document.addEventListener('DOMContentLoaded', () => {
         logOutput.scrollTop = logOutput.scrollHeight;
     }
 
-    function updateJobQueue(queue) {
+    function updateJobQueue(queue, etaSeconds, coverage) {
         jobQueueList.innerHTML = '';
+        // Progressive batches keep reporting coverage after their last job has left the queue.
+        (coverage || []).forEach(batch => {
+            const coverageItem = document.createElement('div');
+            coverageItem.className = 'job-queue-item queue-coverage';
+            const percent = Math.floor(100 * batch.frames_done / Math.max(1, batch.frames_total));
+            coverageItem.textContent = `Coverage: ${batch.batch_id} ${percent}% of frames`;
+            if (batch.stride) {
+                coverageItem.textContent += batch.stride === 1 ? ', all frames rendered' : `, 1 in ${batch.stride} frames ready for review`;
+            }
+            jobQueueList.appendChild(coverageItem);
+        });
         if (!queue || queue.length === 0) {
-            jobQueueList.innerHTML = '<div class="queue-empty-message">The job queue is empty.</div>';
+            jobQueueList.insertAdjacentHTML('beforeend', '<div class="queue-empty-message">The job queue is empty.</div>');
             return;
         }
         queue.forEach(job => {
             const jobItem = document.createElement('div');
             jobItem.className = 'job-queue-item';
-            jobItem.textContent = `Queued: ${job.job_id}`;
+            if (job.batch_id) {
+                const tier = job.quality_tier !== 'final' ? ` [${job.quality_tier}]` : '';
+                jobItem.textContent = `Batch: ${job.batch_id}${tier} (${job.remaining} of ${job.total} remaining)`;
+                if (job.held) {
+                    jobItem.textContent += ' - held for draft review';
+                    const releaseBtn = document.createElement('button');
+                    releaseBtn.className = 'btn-release';
+                    releaseBtn.textContent = 'Release';
+                    releaseBtn.addEventListener('click', () => socket.emit('release_batch_request', { batch_id: job.batch_id }));
+                    jobItem.appendChild(releaseBtn);
+                }
+            } else {
+                jobItem.textContent = `Queued: ${job.job_id}`;
+            }
             jobQueueList.appendChild(jobItem);
         });
+        if (typeof etaSeconds === 'number') {
+            // formatDuration comes from agent_card.js
+            const etaItem = document.createElement('div');
+            etaItem.className = 'queue-empty-message';
+            etaItem.textContent = `Estimated time to drain the queue: ${formatDuration(etaSeconds)}`;
+            jobQueueList.appendChild(etaItem);
+        }
     }
 });
@@ -136,9 +136,32 @@ class JobFactoryUI {
             project_path: document.getElementById('project_path').value,
             graph_path: document.getElementById('graph_path').value,
             level_path: document.getElementById('level_path').value,
+            use_render_cache: document.getElementById('use_render_cache').checked,
+            cache_asset_paths: document.getElementById('cache_asset_paths').value
+                .split('\n').map(line => line.trim()).filter(line => line.length > 0),
+            frame_start: document.getElementById('frame_start').value,
+            frame_end: document.getElementById('frame_end').value,
+            progressive_coverage: document.getElementById('progressive_coverage').checked,
+            coverage_stride: document.getElementById('coverage_stride').value,
+            coverage_finest_stride: document.getElementById('coverage_finest_stride').value,
+            coverage_chunk_frames: document.getElementById('coverage_chunk_frames').value,
+            file_name_format: document.getElementById('file_name_format').value,
+            quality_tier: document.getElementById('quality_tier').value,
+            draft_first: document.getElementById('draft_first').checked,
+            hold_finals: document.getElementById('hold_finals').checked,
+            launch_profile: document.getElementById('launch_profile').value.trim(),
+            console_variable_overrides: document.getElementById('console_variable_overrides').value,
             sequences,
             scene_presets,
             resolution_presets,
+            derive_resolutions: document.getElementById('derive_resolutions').checked,
+            tile_columns: document.getElementById('tile_columns').value,
+            tile_rows: document.getElementById('tile_rows').value,
+            tile_overlap: document.getElementById('tile_overlap').value,
+            contact_sheet: document.getElementById('contact_sheet').checked,
+            contact_sheet_frames: document.getElementById('contact_sheet_frames').value,
+            group_cameras: document.getElementById('group_cameras').checked,
+            batch_scene_variants: document.getElementById('batch_scene_variants').checked,
         };
     }
     
@@ -0,0 +1,129 @@
+import os
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+from director import DirectorLogic
+from job_factory import JobBatch
+
+
+def create_director():
+    """A DirectorLogic with no agents, no saved agent list and no history file."""
+    with mock.patch.object(DirectorLogic, '_load_and_connect_agents'):
+        logic = DirectorLogic(lambda message: None, defaultdict(lambda: lambda *args: None))
+    logic.history.path = os.devnull
+    return logic
+
+
+def create_tiled_batch():
+    """Two scene presets, each image split into two tiles, stitched, and shown on one contact sheet."""
+    common_settings = {"project_path": "P.uproject", "graph_path": "/Game/Graph", "level_path": "/Game/Level",
+                       "project_dir": "P"}
+    job_batch = JobBatch("batch", "trace", common_settings, [{"path": "/Game/Seq", "camera": "Cam"}],
+                         [{"Time": 1}, {"Time": 2}], [(1920, 1080)], tiling=(2, 1, 16))
+    job_batch.add_stitch_jobs()
+    job_batch.add_contact_sheet_job(["first"])
+    return job_batch
+
+
+class DependencyTests(unittest.TestCase):
+
+    def test_contact_sheet_runs_after_a_failed_tile_drops_its_stitch(self):
+        logic = create_director()
+        job_batch = create_tiled_batch()
+        logic.add_job_batch_to_queue(job_batch)
+        tiles = [job_batch.job_at(index)['job_id'] for index in range(len(job_batch))]
+
+        logic._release_dependent_jobs(tiles[0], succeeded=False)
+        self.assertNotIn("batch_0_stitch", logic.waiting_jobs)
+        self.assertIn("batch_contact", logic.waiting_jobs)
+
+        for tile in tiles[1:]:
+            logic._release_dependent_jobs(tile, succeeded=True)
+        self.assertEqual(logic.job_queue[0]['job_id'], "batch_1_stitch")
+
+        logic._release_dependent_jobs("batch_1_stitch", succeeded=True)
+        self.assertEqual(logic.job_queue[0]['job_id'], "batch_contact")
+        self.assertEqual(logic.waiting_jobs, {})
+        self.assertEqual(logic.unmet_dependencies, {})
+
+    def test_rejected_draft_drops_a_final_placement_passed_over(self):
+        logic = create_director()
+        job_batch = create_tiled_batch()
+        logic.add_job_batch_to_queue(job_batch)
+        logic.draft_batches["draft"] = job_batch
+
+        # Speed-weighted placement took the first tiles from the batch and pushed them back unplaced.
+        with logic.agents_lock:
+            window = [logic._pop_next_job([]) for _ in range(3)]
+            for job in reversed(window):
+                logic.job_queue.appendleft(job)
+
+        logic.reject_drafts(["draft_0"])
+        self.assertEqual(logic.job_queue[0]['job_id'], window[2]['job_id'])
+        self.assertIs(logic.job_queue[1], job_batch)
+        self.assertNotIn("batch_0_stitch", logic.waiting_jobs)
+        self.assertIn("batch_contact", logic.waiting_jobs)
+
+
+class RepairTests(unittest.TestCase):
+
+    def setUp(self):
+        self.logic = create_director()
+        self.logic.render_cache = mock.Mock()
+        self.logic._check_queue_and_assign_jobs = mock.Mock()
+        self.job = {"job_id": "job", "fingerprint": "print", "output_path": "/out", "frame_range": [0, 9]}
+
+    def verify(self, job, report):
+        with mock.patch.object(self.logic.output_verifier, 'verify_job', return_value=report):
+            self.logic._verify_and_finish_job(job)
+
+    def cached_jobs(self):
+        """The jobs recorded in the render cache; repair jobs carry no fingerprint and are never stored."""
+        return [call.args for call in self.logic.render_cache.record.call_args_list if call.args[0]]
+
+    def test_job_is_cached_once_its_repairs_succeed(self):
+        self.verify(self.job, {"/out": {"found": 8, "missing": [[2, 2]], "invalid": [[7, 7]], "unverifiable": None}})
+        repairs = list(self.logic.job_queue)
+        self.assertEqual(len(repairs), 1)
+        self.assertEqual(self.cached_jobs(), [])
+
+        # The repair still has a gap, so it is repaired in turn before the job counts as whole.
+        self.verify(repairs[0], {"/out": {"found": 5, "missing": [[7, 7]], "invalid": [], "unverifiable": None}})
+        second_repair = self.logic.job_queue[0]
+        self.assertEqual(second_repair['repair_of'], "job")
+        self.assertEqual(self.cached_jobs(), [])
+
+        self.verify(second_repair, {"/out": {"found": 1, "missing": [], "invalid": [], "unverifiable": None}})
+        self.assertEqual(self.cached_jobs(), [("print", self.job)])
+        self.assertEqual(self.logic.pending_repairs, {})
+
+    def test_failed_repair_is_not_cached(self):
+        self.verify(self.job, {"/out": {"found": 9, "missing": [[2, 2]], "invalid": [], "unverifiable": None}})
+        self.logic._finish_job(self.logic.job_queue[0], False)
+        self.assertEqual(self.cached_jobs(), [])
+        self.assertEqual(self.logic.pending_repairs, {})
+
+    def test_unverifiable_output_completes_without_repairs(self):
+        self.logic.dependents_of["job"] = ["contact"]
+        self.logic.unmet_dependencies["contact"] = {"job"}
+        self.logic.waiting_jobs["contact"] = {"job_id": "contact"}
+        self.verify(self.job, {"/out": {"found": 0, "missing": [], "invalid": [], "unverifiable": "share offline"}})
+        self.assertEqual([job['job_id'] for job in self.logic.job_queue], ["contact"])
+
+
+class AgentStateTests(unittest.TestCase):
+
+    def test_rejected_job_is_requeued(self):
+        logic = create_director()
+        logic.agents["agent"] = {'internal': {'socket': mock.Mock()}, 'public': {'status': "Rendering"}}
+        logic.active_jobs["agent"] = {"job_id": "job"}
+
+        logic._update_agent_state("agent", {"status": "error", "message": "Agent is busy with another job."})
+        self.assertEqual(logic.active_jobs, {})
+        self.assertEqual([job['job_id'] for job in logic.job_queue], ["job"])
+        self.assertEqual(logic.agents["agent"]['public']['status'], "Rendering")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from job_tracing import JobTracer
+
+
+class JobTracerTests(unittest.TestCase):
+
+    def test_spans_past_the_cap_are_counted(self):
+        tracer = JobTracer(max_spans_per_trace=3)
+        for frame in range(5):
+            tracer.add_span("trace", "job", "frame", frame, frame + 1)
+        export = tracer.export_chrome_trace("trace")
+        self.assertEqual(len([event for event in export["traceEvents"] if event["name"] == "frame"]), 3)
+        self.assertEqual(export["otherData"]["dropped_spans"], {"trace": 2})
+
+    def test_evicted_trace_forgets_its_open_spans(self):
+        tracer = JobTracer(max_traces=1)
+        tracer.begin("old", "job", "running")
+        tracer.add_span("old", "job", "dispatch", 0, 1)
+        tracer.add_span("new", "job", "dispatch", 0, 1)
+        self.assertEqual(tracer.get_trace_ids(), ["new"])
+        self.assertEqual(tracer.open_spans, {})
+
+    def test_discard_forgets_only_that_job(self):
+        tracer = JobTracer()
+        tracer.begin("trace", "dropped", "queued")
+        tracer.begin("trace", "kept", "queued")
+        tracer.discard("trace", "dropped")
+        tracer.end("trace", "dropped", "queued")
+        tracer.end("trace", "kept", "queued")
+        self.assertEqual([span["job_id"] for span in tracer.traces["trace"]], ["kept"])
+        self.assertEqual(tracer.open_spans, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
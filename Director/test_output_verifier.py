@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from output_verifier import OutputVerifier
+
+
+class OutputVerifierTests(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='test_output_verifier_')
+        self.verifier = OutputVerifier(workers=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def write_frames(self, directory, frames):
+        os.makedirs(directory, exist_ok=True)
+        for frame in frames:
+            with open(os.path.join(directory, f"Shot.{frame:04d}.exr"), 'wb') as f:
+                f.write(b'\x76\x2f\x31\x01' + b'\0' * 12)
+
+    def test_gaps_are_reported_as_ranges(self):
+        directory = os.path.join(self.work_dir, 'export')
+        self.write_frames(directory, [0, 1, 4])
+        report = self.verifier.verify([directory], (0, 5))
+        self.assertEqual(report[directory]["missing"], [[2, 3], [5, 5]])
+        self.assertIsNone(report[directory]["unverifiable"])
+
+    def test_missing_directory_on_a_reachable_volume_is_missing_every_frame(self):
+        directory = os.path.join(self.work_dir, 'never_written', 'export')
+        report = self.verifier.verify([directory], (0, 3))
+        self.assertEqual(report[directory]["missing"], [[0, 3]])
+        self.assertEqual(self.verifier.unverifiable(report), {})
+
+    def test_directory_that_cannot_be_listed_is_unverifiable(self):
+        directory = os.path.join(self.work_dir, 'export')
+        with open(directory, 'w') as f:
+            f.write("not a directory")
+        report = self.verifier.verify([directory], (0, 3))
+        self.assertFalse(OutputVerifier.has_gaps(report))
+        self.assertIn(directory, self.verifier.unverifiable(report))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from render_cache import RenderCache
+
+
+class RenderCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='test_render_cache_')
+        self.cache = RenderCache(os.path.join(self.work_dir, 'render_cache.jsonl'))
+        self.source = os.path.join(self.work_dir, 'source')
+        os.makedirs(self.source)
+        with open(os.path.join(self.source, 'frame.0001.exr'), 'wb') as f:
+            f.write(b'cached')
+        self.cache.record('fingerprint', {'output_path': self.source, 'job_id': 'source_job'})
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_materialize_copies_so_the_original_stays_intact(self):
+        destination = os.path.join(self.work_dir, 'destination')
+        self.assertEqual(self.cache.materialize(self.cache.lookup('fingerprint'), destination), 1)
+        with open(os.path.join(destination, 'frame.0001.exr'), 'wb') as f:
+            f.write(b'repaired')
+        with open(os.path.join(self.source, 'frame.0001.exr'), 'rb') as f:
+            self.assertEqual(f.read(), b'cached')
+
+    def test_materialize_fails_when_the_outputs_are_gone(self):
+        entry = self.cache.lookup('fingerprint')
+        shutil.rmtree(self.source)
+        self.assertIs(self.cache.lookup('fingerprint', check_outputs=False), entry)
+        with self.assertRaises(FileNotFoundError):
+            self.cache.materialize(entry, os.path.join(self.work_dir, 'destination'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# Realis Render Farm System.
+import unreal
+import json
+import os
+
+# A Rendering status is written at most this often...
+STATUS_MIN_INTERVAL = 0.5
+# ...and only once progress has moved this much, or the frame count changed and this long has passed.
+STATUS_MIN_DELTA = 0.01
+STATUS_HEARTBEAT_INTERVAL = 5.0
+
+# Output file buffer size. Status lines flush on write; trace lines ride along with them.
+FILE_BUFFER_SIZE = 64 * 1024
+
+
+class ProgressReporter:
+    """
+    Owns the executor's status, trace and ledger files for a whole run.
+    on_begin_frame runs on the game thread every engine tick, so each file is
+    opened once and kept open, and the tick asks due() (a clock read) before
+    querying the pipeline for progress at all.
+
+    Status lines are flushed as they are written so the agent sees them, and
+    pending trace lines are flushed with them. Ledger lines are flushed
+    immediately, since crash resume depends on them.
+    """
+    def __init__(self, progress_file_path, trace_file_path="", ledger_file_path="",
+                 min_interval=STATUS_MIN_INTERVAL, min_delta=STATUS_MIN_DELTA,
+                 heartbeat_interval=STATUS_HEARTBEAT_INTERVAL):
+        self.min_interval = min_interval
+        self.min_delta = min_delta
+        self.heartbeat_interval = heartbeat_interval
+        self.status_file = self._open(progress_file_path, "progress")
+        self.trace_file = self._open(trace_file_path, "trace")
+        self.ledger_file = self._open(ledger_file_path, "ledger")
+        self.last_check_time = 0.0
+        self.last_report_time = 0.0
+        self.last_progress = -1.0
+        self.last_frames_done = -1
+        # Per-tick cost of on_begin_frame, see record_tick().
+        self.tick_count = 0
+        self.tick_seconds = 0.0
+        self.tick_max_seconds = 0.0
+
+    # --- Files ---
+
+    @staticmethod
+    def _open(path, kind):
+        if not path:
+            return None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            return open(path, 'a', buffering=FILE_BUFFER_SIZE)
+        except OSError as e:
+            unreal.log_error(f"RealisProgressReporter: Could not open {kind} file {path}. Error: {e}")
+            return None
+
+    def _write_line(self, handle, record, flush):
+        try:
+            handle.write(json.dumps(record) + '\n')
+            if flush:
+                handle.flush()
+        except (OSError, ValueError) as e:
+            unreal.log_warning(f"RealisProgressReporter: Could not write to {handle.name}. Error: {e}")
+
+    def write_status(self, status_dict):
+        """Appends a status line and makes it (and any pending trace lines) visible to the agent."""
+        if self.trace_file:
+            self.flush_trace()
+        if self.status_file:
+            self._write_line(self.status_file, status_dict, True)
+
+    def write_trace_event(self, event):
+        if self.trace_file:
+            self._write_line(self.trace_file, event, False)
+
+    def write_ledger_entry(self, entry):
+        if self.ledger_file:
+            self._write_line(self.ledger_file, entry, True)
+
+    def flush_trace(self):
+        try:
+            self.trace_file.flush()
+        except (OSError, ValueError):
+            pass
+
+    def close(self):
+        for handle in (self.status_file, self.trace_file, self.ledger_file):
+            if handle:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+        self.status_file = self.trace_file = self.ledger_file = None
+
+    # --- Throttling ---
+
+    def due(self, now):
+        """True at most once per min_interval; a clock comparison, cheap enough for every tick."""
+        if now - self.last_check_time < self.min_interval:
+            return False
+        self.last_check_time = now
+        return True
+
+    def should_report(self, now, progress, frames_done):
+        """Progress moved by min_delta, or frames were output and the last status is heartbeat_interval old."""
+        if progress >= self.last_progress + self.min_delta:
+            return True
+        return frames_done != self.last_frames_done and now - self.last_report_time >= self.heartbeat_interval
+
+    def report(self, now, status_dict):
+        """Writes a Rendering status that should_report() allowed and remembers what it showed."""
+        self.last_report_time = now
+        self.last_progress = status_dict["progress"]
+        self.last_frames_done = status_dict["frames_done"]
+        status_dict["tick_us"] = self.tick_microseconds()["mean"]
+        self.write_status(status_dict)
+
+    # --- Tick Cost ---
+
+    def record_tick(self, seconds):
+        self.tick_count += 1
+        self.tick_seconds += seconds
+        if seconds > self.tick_max_seconds:
+            self.tick_max_seconds = seconds
+
+    def tick_microseconds(self):
+        """Mean and max Python time spent in on_begin_frame per tick, in microseconds."""
+        mean = self.tick_seconds / self.tick_count if self.tick_count else 0.0
+        return {"ticks": self.tick_count, "mean": round(mean * 1e6, 1), "max": round(self.tick_max_seconds * 1e6, 1)}
@@ -4,6 +4,14 @@ import unreal
 import json
 import time
 import os
+import re
+from RealisProgressReporter import ProgressReporter
+
+# Frame number in an output file name, e.g. "Plate.0042.exr" -> 42.
+FRAME_NUMBER_PATTERN = re.compile(r'(\d+)\.[A-Za-z0-9]+$')
+
+# Trace spans summed into the startup breakdown of the final status, in the order they happen.
+STARTUP_PHASES = ("map_load", "load_graph", "apply_scene_settings", "pipeline_initialize", "warmup")
 
 @unreal.uclass()
 class RealisVirtualPlateRenderExecutor(unreal.MoviePipelinePythonHostExecutor):
@@ -12,6 +20,23 @@ class RealisVirtualPlateRenderExecutor(unreal.MoviePipelinePythonHostExecutor):
     This class is instantiated by the engine when launched with the correct
     command-line arguments. It's responsible for parsing a job description
     file, executing a single render job, and reporting progress to a file.
+
+    A job is rendered as one or more render passes. Multi-camera jobs run one
+    pass per camera back to back in the same process, so the map is loaded
+    and streamed in only once.
+
+    Progressive coverage jobs carry a sparse 'frame_set'; it is rendered as
+    one pass per contiguous run of frames, still without reloading the map.
+
+    Every finished frame is appended to a ledger file. When the agent
+    relaunches a crashed job with -Resume, passes already completed are
+    skipped and the interrupted pass restarts at its first missing frame.
+
+    Startup phases and every frame are written to the trace file as timed
+    spans, and the final status summarizes them (startup breakdown, p50/p95
+    frame time) so slow nodes, shader compiles and cold starts stand out.
+    Files are written through a ProgressReporter that keeps them open for the
+    whole run, so the per-tick cost stays in the microseconds.
     """
     # --- UPROPERTY Declarations ---
     # These decorators tell Unreal's Garbage Collector that these Python
@@ -20,7 +45,29 @@ class RealisVirtualPlateRenderExecutor(unreal.MoviePipelinePythonHostExecutor):
     active_movie_pipeline = unreal.uproperty(unreal.MoviePipelineBase)
     progress_file_path = unreal.uproperty(str)
     job_id = unreal.uproperty(str)
-    last_progress = unreal.uproperty(float)
+    trace_file_path = unreal.uproperty(str)
+    has_produced_frames = unreal.uproperty(bool)
+    last_frame_number = unreal.uproperty(int)
+    last_frame_time = unreal.uproperty(float)
+    graph_preset = unreal.uproperty(unreal.MovieGraphConfig)
+    job_data_json = unreal.uproperty(str)
+    render_passes_json = unreal.uproperty(str)
+    render_pass_index = unreal.uproperty(int)
+    render_pass_count = unreal.uproperty(int)
+    ledger_file_path = unreal.uproperty(str)
+    resume_state_json = unreal.uproperty(str)
+    current_output_path = unreal.uproperty(str)
+    current_frame_run = unreal.uproperty(str)
+    original_sensor_widths_json = unreal.uproperty(str)
+    original_playback_range_json = unreal.uproperty(str)
+    created_at = unreal.uproperty(float)
+    pass_initialized_at = unreal.uproperty(float)
+    is_graph_pipeline = unreal.uproperty(bool)
+    completed_frames = unreal.uproperty(int)
+    pass_frames_total = unreal.uproperty(int)
+    later_pass_frames = unreal.uproperty(int)
+    later_unknown_passes = unreal.uproperty(int)
+    reporter_closed = unreal.uproperty(bool)
 
     def _post_init(self):
         """Constructor for the executor."""
@@ -28,23 +75,193 @@ class RealisVirtualPlateRenderExecutor(unreal.MoviePipelinePythonHostExecutor):
         self.active_movie_pipeline = None
         self.progress_file_path = ""
         self.job_id = ""
-        self.last_progress = -1.0
+        self.trace_file_path = ""
+        self.has_produced_frames = False
+        self.last_frame_number = -1
+        self.last_frame_time = 0.0
+        self.graph_preset = None
+        self.job_data_json = ""
+        self.render_passes_json = "[]"
+        self.render_pass_index = 0
+        self.render_pass_count = 0
+        self.ledger_file_path = ""
+        self.resume_state_json = "{}"
+        self.current_output_path = ""
+        self.current_frame_run = ""
+        self.original_sensor_widths_json = "{}"
+        self.original_playback_range_json = ""
+        self.created_at = time.time()
+        self.pass_initialized_at = 0.0
+        self.is_graph_pipeline = False
+        self.completed_frames = 0 # Frames output by the passes of this run that have finished
+        self.pass_frames_total = 0
+        self.later_pass_frames = 0 # Planned frames of the passes after the current one...
+        self.later_unknown_passes = 0 # ...and how many of them render the whole sequence
+        self.reporter_closed = False
+        self.reporter = None # Not a uproperty; always go through get_reporter()
         unreal.log("RealisVirtualPlateRenderExecutor: Initialized.")
 
+    def get_reporter(self):
+        """
+        The ProgressReporter writing this run's files. It is a plain Python
+        object, which the engine does not keep across the executor's lifecycle
+        the way it keeps uproperties, so it is rebuilt from the file paths if it
+        has gone missing. Its files are opened for appending, so a rebuilt
+        reporter carries on where the lost one stopped.
+        :return: The reporter, or None before the paths are known and after close_reporter().
+        """
+        reporter = getattr(self, 'reporter', None)
+        if reporter is None and self.progress_file_path and not self.reporter_closed:
+            reporter = self.reporter = ProgressReporter(self.progress_file_path, self.trace_file_path, self.ledger_file_path)
+        return reporter
+
+    def close_reporter(self):
+        reporter = getattr(self, 'reporter', None)
+        if reporter:
+            reporter.close()
+        self.reporter = None
+        self.reporter_closed = True
+
     def write_status(self, status_dict):
         """Appends a JSON status object to the progress file."""
-        if not self.progress_file_path:
+        reporter = self.get_reporter()
+        if reporter:
+            reporter.write_status(status_dict)
+
+    def write_trace_event(self, name, start=None, duration=None, **args):
+        """Appends one timing event to the trace file. The agent forwards these to the Director."""
+        reporter = self.get_reporter()
+        if not reporter:
             return
 
+        event = {"name": name, "ts": start if start is not None else time.time()}
+        if duration is not None:
+            event["dur"] = duration
+        if args:
+            event["args"] = args
+        reporter.write_trace_event(event)
+
+    def summarize_timing(self):
+        """
+        Condenses this run's trace into the final status: seconds spent in each
+        startup phase, time from launch to the first rendered frame, frame
+        time percentiles and the Python cost of on_begin_frame per tick.
+        """
+        reporter = self.get_reporter()
+        if not reporter or not reporter.trace_file:
+            return None
+        reporter.flush_trace()
+        events = []
         try:
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(self.progress_file_path), exist_ok=True)
-            
-            # Append the status as a new line in the file
-            with open(self.progress_file_path, 'a') as f:
-                f.write(json.dumps(status_dict) + '\n')
-        except Exception as e:
-            unreal.log_error(f"RealisVirtualPlateRenderExecutor: Could not write to progress file. Error: {e}")
+            with open(self.trace_file_path, 'r') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except Exception:
+            return None
+
+        # A resumed run appends to the trace; only summarize this process.
+        events = [event for event in events if event["ts"] >= self.created_at]
+        startup = {phase: round(sum((event.get("dur", 0.0) for event in events if event["name"] == phase), 0.0), 3)
+                   for phase in STARTUP_PHASES}
+        frame_times = sorted(event["dur"] for event in events if event["name"] == "frame")
+        first_frame = next((event["ts"] for event in events if event["name"] == "first_producing_frames"), None)
+
+        def percentile(fraction):
+            return round(frame_times[min(len(frame_times) - 1, int(fraction * len(frame_times)))], 4) if frame_times else None
+
+        return {
+            "startup": startup,
+            "time_to_first_frame": round(first_frame - self.created_at, 3) if first_frame else None,
+            "frames": len(frame_times),
+            "frame_p50": percentile(0.5),
+            "frame_p95": percentile(0.95),
+            "frame_max": round(frame_times[-1], 4) if frame_times else None,
+            "render_seconds": round(sum(frame_times), 3),
+            "tick_us": reporter.tick_microseconds()
+        }
+
+    # --- Frame Ledger ---
+
+    @staticmethod
+    def ledger_key(output_path, frame_run=""):
+        """Passes are tracked by output path, and by frame run when several passes share a directory."""
+        return f"{output_path}@{frame_run}" if frame_run else output_path
+
+    def write_ledger_entry(self, entry):
+        """Appends one line to the frame ledger, e.g. a finished frame or a finished pass."""
+        reporter = self.get_reporter()
+        if not reporter:
+            return
+        if self.current_frame_run:
+            entry["frame_run"] = self.current_frame_run
+        reporter.write_ledger_entry(entry)
+
+    def load_ledger(self):
+        """
+        Reads the ledger left by a previous, crashed run of this job.
+        :return: {ledger_key: {"frames": [...], "completed": bool}}
+        """
+        state = {}
+        if not self.ledger_file_path or not os.path.exists(self.ledger_file_path):
+            return state
+        with open(self.ledger_file_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # The crash may have torn the last line.
+                key = self.ledger_key(entry["output_path"], entry.get("frame_run", ""))
+                pass_state = state.setdefault(key, {"frames": [], "completed": False})
+                if entry.get("completed"):
+                    pass_state["completed"] = True
+                elif "frame" in entry:
+                    pass_state["frames"].append(entry["frame"])
+        return state
+
+    def scan_output_frames(self, output_path):
+        """Returns the frame numbers that have at least one non-empty file under output_path."""
+        frames = set()
+        pending_dirs = [output_path]
+        while pending_dirs:
+            try:
+                entries = list(os.scandir(pending_dirs.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    pending_dirs.append(entry.path)
+                    continue
+                match = FRAME_NUMBER_PATTERN.search(entry.name)
+                if match and entry.stat().st_size > 0:
+                    frames.add(int(match.group(1)))
+        return frames
+
+    def find_resume_frame(self, render_pass):
+        """
+        Finds the first frame of a pass that still has to be rendered. A frame
+        only counts as done if the ledger has it and its file is on disk, since
+        the crash can happen between finishing a frame and writing it out.
+        :return: The frame to restart from, or None to render the whole pass.
+        """
+        pass_state = json.loads(self.resume_state_json).get(self.pass_ledger_key(render_pass))
+        if not pass_state or not pass_state["frames"]:
+            return None
+
+        frames_on_disk = self.scan_output_frames(render_pass["output_path"])
+        resume_frame = None
+        for frame in sorted(set(pass_state["frames"])):
+            if frame not in frames_on_disk:
+                return frame
+            resume_frame = frame + 1
+        if render_pass.get("frame_run") and resume_frame > render_pass["frame_range"][1]:
+            return None # Only the completion record is missing; the run is short, so render it again.
+        return resume_frame
+
+    def pass_ledger_key(self, render_pass):
+        return self.ledger_key(render_pass["output_path"], render_pass.get("frame_run", ""))
 
 
     @unreal.ufunction(override=True)
@@ -53,13 +270,20 @@ class RealisVirtualPlateRenderExecutor(unreal.MoviePipelinePythonHostExecutor):
         This is the main entry point for the executor, called by the engine
         after the specified map has finished loading.
         """
+        execute_start = time.time()
         unreal.log("RealisVirtualPlateRenderExecutor: execute_delayed started.")
 
         # --- Parse Command Line ---
-        (_, _, cmd_parameters) = unreal.SystemLibrary.parse_command_line(unreal.SystemLibrary.get_command_line())
+        (_, cmd_switches, cmd_parameters) = unreal.SystemLibrary.parse_command_line(unreal.SystemLibrary.get_command_line())
         job_path = cmd_parameters.get('JobPath')
         graph_path = cmd_parameters.get('GraphPath')
         self.progress_file_path = cmd_parameters.get('ProgressFile')
+        self.trace_file_path = cmd_parameters.get('TraceFile', "")
+        self.ledger_file_path = cmd_parameters.get('LedgerFile', "")
+        is_resume = 'Resume' in cmd_switches
+        # The executor is created before the map loads; execute_delayed runs once it has.
+        self.write_trace_event("map_load", self.created_at, execute_start - self.created_at)
+        self.write_trace_event("execute_delayed", execute_start)
 
         if not job_path or not graph_path or not self.progress_file_path:
             unreal.log_error("RealisVirtualPlateRenderExecutor: Missing -JobPath, -GraphPath, or -ProgressFile arguments. Shutting down.")
@@ -76,58 +300,336 @@ class RealisVirtualPlateRenderExecutor(unreal.MoviePipelinePythonHostExecutor):
             self.on_executor_errored(None, True, "Failed to load job file.")
             return
 
-        # --- Build and Configure the Job ---
+        load_start = time.time()
+        graph_preset = unreal.load_asset(graph_path)
+        self.write_trace_event("load_graph", load_start, time.time() - load_start)
+        if not isinstance(graph_preset, unreal.MovieGraphConfig):
+            unreal.log_error(f"RealisVirtualPlateRenderExecutor: Asset at {graph_path} is not a valid MovieGraphConfig.")
+            self.on_executor_errored(None, True, "Invalid Graph Preset.")
+            return
+        self.graph_preset = graph_preset
+
+        # --- Plan Render Passes ---
+        render_passes = self.build_render_passes(job_data)
+        self.job_data_json = json.dumps(job_data)
+        self.render_passes_json = json.dumps(render_passes)
+        self.render_pass_index = 0
+        self.render_pass_count = len(render_passes)
+
+        # --- Resume After a Crash ---
+        if is_resume:
+            resume_state = self.load_ledger()
+            self.resume_state_json = json.dumps(resume_state)
+            while (self.render_pass_index < self.render_pass_count and
+                   resume_state.get(self.pass_ledger_key(render_passes[self.render_pass_index]), {}).get("completed")):
+                self.render_pass_index += 1
+            self.write_trace_event("resume", skipped_passes=self.render_pass_index)
+            if self.render_pass_index == self.render_pass_count:
+                unreal.log("RealisVirtualPlateRenderExecutor: Ledger shows every pass finished; nothing to resume.")
+                self.write_status({"timestamp": time.time(), "job_id": self.job_id, "status": "Completed",
+                                   "output_paths": sorted({p["output_path"] for p in render_passes})})
+                self.on_executor_finished_impl()
+                return
+
         self.pipeline_queue = unreal.new_object(unreal.MoviePipelineQueue, outer=self)
+        self.start_render_pass()
+
+    def build_render_passes(self, job_data):
+        """
+        Splits a job into the pipeline runs it needs. Each pass is a dict with
+        the camera, scene settings, variant index and output path to use for that run.
+        Scene variants form the outer loop so the settings actor is only reapplied
+        once per variant, with every camera rendered in between. A 'frame_set'
+        adds an inner loop over its contiguous runs of frames.
+        """
+        variants = job_data.get("scene_variants")
+        if not variants:
+            variants = [{"scene_settings": job_data.get("scene_settings", {}), "output_path": job_data["output_path"]}]
+            variant_indices = [None]
+        else:
+            variant_indices = list(range(len(variants)))
+
+        cameras = job_data.get("camera_actor_names")
+        render_passes = []
+        for variant_index, variant in zip(variant_indices, variants):
+            if not cameras:
+                render_passes.append({"camera": job_data.get("camera_actor_name"), "variant": variant_index,
+                                      "scene_settings": variant["scene_settings"], "output_path": variant["output_path"]})
+                continue
+            # Multi-camera job: one pass per camera, each writing to its own sub-folder.
+            for camera in cameras:
+                render_passes.append({"camera": camera, "variant": variant_index,
+                                      "scene_settings": variant["scene_settings"],
+                                      "output_path": f"{variant['output_path']}/{camera}"})
+        if job_data.get("frame_set"):
+            frame_runs = self.frame_runs(job_data["frame_set"])
+            render_passes = [dict(render_pass, frame_range=frame_run, frame_run=f"{frame_run[0]}-{frame_run[1]}")
+                             for render_pass in render_passes for frame_run in frame_runs]
+        return render_passes
+
+    @staticmethod
+    def frame_runs(frames):
+        """Compacts frame numbers into inclusive [first, last] runs, e.g. [1, 2, 3, 7] -> [[1, 3], [7, 7]]."""
+        runs = []
+        for frame in sorted(set(frames)):
+            if runs and frame == runs[-1][1] + 1:
+                runs[-1][1] = frame
+            else:
+                runs.append([frame, frame])
+        return runs
+
+    def start_render_pass(self):
+        """Configures a fresh pipeline job for the current render pass and starts it on the loaded world."""
+        job_data = json.loads(self.job_data_json)
+        render_pass = json.loads(self.render_passes_json)[self.render_pass_index]
+
+        # --- Build and Configure the Job ---
+        self.pipeline_queue.delete_all_jobs()
         job = self.pipeline_queue.allocate_new_job(unreal.MoviePipelineExecutorJob)
 
-        job.job_name = self.job_id
+        job.job_name = self.job_id if self.render_pass_count == 1 else f"{self.job_id}_pass{self.render_pass_index}"
         job.sequence = unreal.SoftObjectPath(job_data["sequence_path"])
         job.map = unreal.SoftObjectPath(job_data["level_path"])
+        job.set_graph_preset(self.graph_preset)
 
-        graph_preset = unreal.load_asset(graph_path)
-        if not isinstance(graph_preset, unreal.MovieGraphConfig):
-            unreal.log_error(f"RealisVirtualPlateRenderExecutor: Asset at {graph_path} is not a valid MovieGraphConfig.")
-            self.on_executor_errored(None, True, "Invalid Graph Preset.")
-            return
-        job.set_graph_preset(graph_preset)
+        # --- Apply Console Variables ---
+        # The agent merges its launch profile's cvars with the job's own overrides.
+        if job_data.get("console_variable_overrides"):
+            self.apply_console_variables(job, job_data["console_variable_overrides"])
 
         # --- Apply Scene Settings ---
-        self.apply_scene_settings(job_data.get("scene_settings", {}))
+        # Consecutive passes of the same variant share settings, so only touch the actor when they change.
+        previous_pass = json.loads(self.render_passes_json)[self.render_pass_index - 1] if self.render_pass_index > 0 else None
+        if previous_pass is None or previous_pass["scene_settings"] != render_pass["scene_settings"]:
+            apply_start = time.time()
+            self.apply_scene_settings(render_pass["scene_settings"])
+            self.write_trace_event("apply_scene_settings", apply_start, time.time() - apply_start,
+                                   render_pass=self.render_pass_index)
 
         # --- Set Exposed Graph Variables ---
-        variable_overrides = job.get_or_create_variable_overrides(graph_preset)
-        
+        variable_overrides = job.get_or_create_variable_overrides(self.graph_preset)
+
         # Set Output path (DirectoryPath struct)
-        output_path_var = graph_preset.get_variable_by_name("Output path")
-        if output_path_var:
-            dir_path_struct = unreal.DirectoryPath()
-            dir_path_struct.path = job_data["output_path"]
-            variable_overrides.set_variable_assignment_enable_state(output_path_var, True)
-            variable_overrides.set_value_serialized_string(output_path_var, dir_path_struct.export_text())
-        
+        dir_path_struct = unreal.DirectoryPath()
+        dir_path_struct.path = render_pass["output_path"]
+        self.set_graph_variable(variable_overrides, "Output path", dir_path_struct.export_text())
+
         # Set Resolution (MovieGraphNamedResolution struct)
-        resolution_var = graph_preset.get_variable_by_name("Resolution")
-        if resolution_var:
-            res_x, res_y = job_data["resolution"]
-            resolution_string = f'(ProfileName="Custom",Resolution=(X={res_x},Y={res_y}),Description="Render Farm Job")'
-            variable_overrides.set_variable_assignment_enable_state(resolution_var, True)
-            variable_overrides.set_value_serialized_string(resolution_var, resolution_string)
+        res_x, res_y = job_data["resolution"]
+        resolution_string = f'(ProfileName="Custom",Resolution=(X={res_x},Y={res_y}),Description="Render Farm Job")'
+        self.set_graph_variable(variable_overrides, "Resolution", resolution_string)
+
+        # Look through the pass's camera. Without it every pass would render the sequence's own camera.
+        if render_pass["camera"] and not self.apply_camera(job_data["sequence_path"], render_pass["camera"]):
+            self.fail_render(f"Could not render through camera '{render_pass['camera']}'.")
+            return
+
+        # Restrict the frame range (repair jobs, runs of a frame_set) and skip the frames a crashed run already wrote.
+        frame_range = render_pass.get("frame_range") or job_data.get("frame_range")
+        resume_frame = self.find_resume_frame(render_pass)
+        start_frame = resume_frame if resume_frame is not None else (frame_range[0] if frame_range else None)
+        end_frame = frame_range[1] if frame_range else None
+        restart_reason = None
+        if not self.apply_frame_window(job_data["sequence_path"], variable_overrides, start_frame, end_frame):
+            if frame_range:
+                # The whole sequence would be rendered and reported as the frames the job asked for.
+                self.fail_render(f"Could not limit the render to frames {start_frame}-{end_frame}.")
+                return
+            # Only a resume point was asked for: start the pass over, and say so rather than claim a resume.
+            restart_reason = f"Could not start the render at frame {resume_frame}; rendering the whole pass again."
+            unreal.log_warning(f"RealisVirtualPlateRenderExecutor: {restart_reason}")
+            resume_frame = None
+        elif resume_frame is not None:
+            unreal.log(f"RealisVirtualPlateRenderExecutor: Resuming pass {self.render_pass_index} at frame {resume_frame}.")
+        if "file_name_format" in job_data:
+            self.set_graph_variable(variable_overrides, "FileNameFormat", job_data["file_name_format"])
+
+        # Quality tier settings, e.g. sample counts, for graphs that expose them.
+        for name, value in job_data.get("graph_variable_overrides", {}).items():
+            if not self.set_graph_variable(variable_overrides, name, str(value)) and self.render_pass_index == 0:
+                unreal.log_warning(f"RealisVirtualPlateRenderExecutor: Graph does not expose '{name}'; the {job_data.get('quality_tier', 'job')} setting is ignored.")
+
+        # Tile jobs of a split still render only their part of the frame.
+        if "tile" in job_data and not self.apply_tile(render_pass["camera"], job_data["tile"]):
+            # The whole frame would be rendered at the tile's size and stitched as if it were the tile.
+            self.fail_render(f"Could not find cine camera '{render_pass['camera']}' to render tile {job_data['tile']['rect']}.")
+            return
+        self.current_output_path = render_pass["output_path"]
+        self.current_frame_run = render_pass.get("frame_run", "")
+
+        # Frame counts for progress; a pass without a frame range learns its length from the pipeline.
+        later_passes = json.loads(self.render_passes_json)[self.render_pass_index + 1:]
+        later_frames = [self.planned_frames(later_pass, job_data) for later_pass in later_passes]
+        self.later_pass_frames = sum(later_frames)
+        self.later_unknown_passes = later_frames.count(0)
+        self.pass_frames_total = self.planned_frames(render_pass, job_data, start_frame if resume_frame is not None else None)
 
         # --- Start the Render ---
         world = self.get_last_loaded_world()
         self.active_movie_pipeline = unreal.new_object(self.target_pipeline_class, outer=world)
         self.active_movie_pipeline.on_movie_pipeline_work_finished_delegate.add_function_unique(self, "on_movie_pipeline_finished")
+        # Checked once here instead of on every tick.
+        self.is_graph_pipeline = isinstance(self.active_movie_pipeline, unreal.MovieGraphPipeline)
 
-        self.write_status({"timestamp": time.time(), "job_id": self.job_id, "status": "Initializing"})
-        unreal.log("RealisVirtualPlateRenderExecutor: Initializing pipeline and starting render.")
+        self.write_status({"timestamp": time.time(), "job_id": self.job_id, "status": "Initializing",
+                           "render_pass": self.render_pass_index, "render_pass_count": self.render_pass_count,
+                           "variant": render_pass.get("variant"), "output_path": render_pass["output_path"],
+                           "resumed_from_frame": resume_frame, "restart_reason": restart_reason})
+        unreal.log(f"RealisVirtualPlateRenderExecutor: Initializing pipeline for pass {self.render_pass_index + 1}/{self.render_pass_count}.")
 
-        if isinstance(self.active_movie_pipeline, unreal.MovieGraphPipeline):
+        initialize_start = time.time()
+        if self.is_graph_pipeline:
             init_config = unreal.MovieGraphInitConfig()
             self.active_movie_pipeline.initialize(job, init_config)
         else:
             self.active_movie_pipeline.initialize(job)
+        self.pass_initialized_at = time.time()
+        self.write_trace_event("pipeline_initialize", initialize_start, self.pass_initialized_at - initialize_start,
+                               render_pass=self.render_pass_index)
+
+    @staticmethod
+    def planned_frames(render_pass, job_data, start_frame=None):
+        """Frames a pass is set up to render, or 0 if it renders the whole (unknown length) sequence."""
+        frame_range = render_pass.get("frame_range") or job_data.get("frame_range")
+        if not frame_range:
+            return 0
+        return max(0, frame_range[1] - (frame_range[0] if start_frame is None else start_frame) + 1)
+
+    def apply_console_variables(self, job, console_variables):
+        """
+        Numeric cvars go into the job's console_variable_overrides, which the
+        graph applies after its own Console Variables nodes and reverts when
+        the render ends. Cvars with string values are set with a console command.
+        """
+        entries = []
+        for name, value in console_variables.items():
+            try:
+                numeric_value = float(value)
+            except (TypeError, ValueError):
+                unreal.SystemLibrary.execute_console_command(self.get_last_loaded_world(), f"{name} {value}")
+                continue
+            # The entry's fields are read-only to Python; set them as editor properties.
+            entry = unreal.MoviePipelineConsoleVariableEntry()
+            entry.set_editor_property("name", name)
+            entry.set_editor_property("value", numeric_value)
+            entry.set_editor_property("is_enabled", True)
+            entries.append(entry)
+        job.console_variable_overrides = entries
+        if self.render_pass_index == 0:
+            self.write_trace_event("console_variables", **{name: str(value) for name, value in console_variables.items()})
+
+    def apply_camera(self, sequence_path, camera_name):
+        """
+        Points every camera cut of the sequence at the camera's binding, so the
+        pass renders through that camera. The graph's CameraName is a built-in
+        variable that cannot be overridden, so the cut is edited instead, in
+        memory like the playback range. Bindings are matched by name, which for
+        a possessable is the label of the actor it is bound to.
+        :return: False if the sequence has no such binding or no camera cut to point at it.
+        """
+        sequence = unreal.load_asset(sequence_path, unreal.LevelSequence)
+        if not sequence:
+            unreal.log_error(f"RealisVirtualPlateRenderExecutor: Could not load sequence {sequence_path} to select camera '{camera_name}'.")
+            return False
+        bindings = sequence.get_bindings()
+        binding = next((b for b in bindings if b.get_name() == camera_name or str(b.get_display_name()) == camera_name), None)
+        if not binding:
+            unreal.log_error(f"RealisVirtualPlateRenderExecutor: Sequence {sequence_path} has no binding named '{camera_name}'. "
+                             f"Bindings: {', '.join(b.get_name() for b in bindings)}.")
+            return False
+        sections = [section for track in sequence.find_tracks_by_exact_type(unreal.MovieSceneCameraCutTrack)
+                    for section in track.get_sections()]
+        if not sections:
+            unreal.log_error(f"RealisVirtualPlateRenderExecutor: Sequence {sequence_path} has no camera cuts to point at '{camera_name}'.")
+            return False
+        binding_id = sequence.get_portable_binding_id(sequence, binding)
+        for section in sections:
+            section.set_camera_binding_id(binding_id)
+        return True
+
+    def apply_frame_window(self, sequence_path, variable_overrides, start_frame, end_frame):
+        """
+        Limits the render to frames start_frame-end_frame (inclusive; None keeps
+        the sequence's own bound). Graphs that expose 'StartFrame' and 'EndFrame'
+        take them as variables. MRG_DefaultPlateConfig does not, so otherwise the
+        sequence's playback range, which the pipeline renders, is narrowed in
+        memory. Passes share the loaded sequence, so a pass without a window gets
+        the range back that the sequence was loaded with.
+        :return: False if the window could not be applied.
+        """
+        if self.graph_preset.get_variable_by_name("StartFrame") and self.graph_preset.get_variable_by_name("EndFrame"):
+            if start_frame is not None:
+                self.set_graph_variable(variable_overrides, "StartFrame", str(start_frame))
+            if end_frame is not None:
+                self.set_graph_variable(variable_overrides, "EndFrame", str(end_frame))
+            return True
+
+        sequence = unreal.load_asset(sequence_path, unreal.LevelSequence)
+        if not sequence:
+            unreal.log_error(f"RealisVirtualPlateRenderExecutor: Could not load sequence {sequence_path} to set its playback range.")
+            return start_frame is None and end_frame is None
+        if not self.original_playback_range_json:
+            self.original_playback_range_json = json.dumps([sequence.get_playback_start(), sequence.get_playback_end()])
+        playback_start, playback_end = json.loads(self.original_playback_range_json)
+        if start_frame is not None:
+            playback_start = start_frame
+        if end_frame is not None:
+            playback_end = end_frame + 1 # The playback end is exclusive
+        sequence.set_playback_start(playback_start)
+        sequence.set_playback_end(playback_end)
+        # A locked sequence keeps its range; read it back rather than trust the setters.
+        return sequence.get_playback_start() == playback_start and sequence.get_playback_end() == playback_end
+
+    def fail_render(self, reason):
+        """Ends the job with an Error status, for a pass that cannot be set up to render what the job asked for."""
+        unreal.log_error(f"RealisVirtualPlateRenderExecutor: {reason}")
+        self.write_status({"timestamp": time.time(), "job_id": self.job_id, "status": "Error", "reason": reason})
+        self.close_reporter()
+        self.on_executor_errored(None, True, reason)
+
+    def set_graph_variable(self, variable_overrides, name, serialized_value):
+        """Enables and sets an exposed graph variable. Returns False if the graph does not expose it."""
+        variable = self.graph_preset.get_variable_by_name(name)
+        if not variable:
+            return False
+        variable_overrides.set_variable_assignment_enable_state(variable, True)
+        variable_overrides.set_value_serialized_string(variable, serialized_value)
+        return True
 
 
+    def apply_tile(self, camera_name, tile):
+        """
+        Narrows a cine camera to one tile of the full frame by shrinking its
+        filmback to the tile's share of the sensor and offsetting it to the
+        tile's centre: an off-axis crop of the same projection, so the tiles
+        line up when stitched. The Resolution variable already holds the tile size.
+        :return: False if the level has no cine camera with that label or name.
+        """
+        world = self.get_last_loaded_world()
+        cameras = unreal.GameplayStatics.get_all_actors_of_class(world, unreal.CineCameraActor)
+        matching = [c for c in cameras if c.get_actor_label() == camera_name or c.get_name() == camera_name]
+        if not matching:
+            return False
+
+        full_x, full_y = tile["full_resolution"]
+        x0, y0, x1, y1 = tile["rect"]
+        camera_component = matching[0].get_cine_camera_component()
+        filmback = camera_component.get_editor_property("filmback")
+        # Passes of later variants reuse the camera, so always crop from the untouched sensor.
+        original_widths = json.loads(self.original_sensor_widths_json)
+        camera_key = matching[0].get_path_name()
+        sensor_width = original_widths.setdefault(camera_key, filmback.sensor_width)
+        self.original_sensor_widths_json = json.dumps(original_widths)
+        # Derive the full sensor height from the still's aspect so tile pixels stay square.
+        sensor_height = sensor_width * full_y / full_x
+        filmback.sensor_width = sensor_width * (x1 - x0) / full_x
+        filmback.sensor_height = sensor_height * (y1 - y0) / full_y
+        filmback.sensor_horizontal_offset = ((x0 + x1) / 2 / full_x - 0.5) * sensor_width
+        filmback.sensor_vertical_offset = (0.5 - (y0 + y1) / 2 / full_y) * sensor_height
+        camera_component.set_editor_property("filmback", filmback)
+        unreal.log(f"RealisVirtualPlateRenderExecutor: Rendering tile {tile['rect']} of {full_x}x{full_y}.")
+        return True
+
     def apply_scene_settings(self, settings_dict):
         if not settings_dict: return
         world = self.get_last_loaded_world()
@@ -151,42 +653,108 @@ class RealisVirtualPlateRenderExecutor(unreal.MoviePipelinePythonHostExecutor):
     @unreal.ufunction(ret=None, params=[unreal.MoviePipelineOutputData])
     def on_movie_pipeline_finished(self, results):
         """Callback for when the active pipeline finishes a job."""
+        self.is_graph_pipeline = False
+        self.trace_last_frame(time.time())
+        self.write_trace_event("pipeline_finished", success=bool(results.success), render_pass=self.render_pass_index)
         if results.success:
+            self.write_ledger_entry({"output_path": self.current_output_path, "completed": True})
+            self.completed_frames += self.pass_frames_total
+        if results.success and self.render_pass_index + 1 < self.render_pass_count:
+            # More passes to go: reuse the loaded map instead of exiting.
+            self.render_pass_index += 1
+            self.start_render_pass()
+        elif results.success:
             unreal.log("RealisVirtualPlateRenderExecutor: Movie pipeline finished successfully.")
-            self.write_status({"timestamp": time.time(), "job_id": self.job_id, "status": "Completed"})
+            output_paths = sorted({p["output_path"] for p in json.loads(self.render_passes_json)})
+            self.write_trace_event("job_finished", render_passes=self.render_pass_count)
+            self.write_status({"timestamp": time.time(), "job_id": self.job_id, "status": "Completed",
+                               "output_paths": output_paths, "timing": self.summarize_timing()})
+            self.close_reporter()
             self.on_executor_finished_impl()
         else:
             unreal.log_error("RealisVirtualPlateRenderExecutor: Movie pipeline finished with errors.")
             self.write_status({"timestamp": time.time(), "job_id": self.job_id, "status": "Error", "reason": "Pipeline reported failure."})
+            self.close_reporter()
             self.on_executor_errored(None, True, "Rendering failed within the pipeline.")
 
+    def trace_frame_boundary(self, now):
+        """
+        Emits a span for the previous output frame whenever the current frame number changes.
+        :return: The current frame number.
+        """
+        if not self.has_produced_frames:
+            self.has_produced_frames = True
+            self.write_trace_event("first_producing_frames", now)
+        if self.pass_initialized_at:
+            # Warm-up frames, shader compiles and streaming between initialize and the first rendered frame.
+            self.write_trace_event("warmup", self.pass_initialized_at, now - self.pass_initialized_at,
+                                   render_pass=self.render_pass_index)
+            self.pass_initialized_at = 0.0
+
+        frame_struct = unreal.MovieGraphLibrary.get_current_shot_frame_number(self.active_movie_pipeline)
+        frame_number = frame_struct.value if hasattr(frame_struct, 'value') else 0
+        if frame_number != self.last_frame_number:
+            self.trace_last_frame(now)
+            self.last_frame_number = frame_number
+            self.last_frame_time = now
+        return frame_number
+
+    def trace_last_frame(self, end_time):
+        """Closes the span of the frame currently in flight, if any."""
+        if self.last_frame_number >= 0:
+            self.write_trace_event("frame", self.last_frame_time, end_time - self.last_frame_time,
+                                   frame=self.last_frame_number)
+            self.write_ledger_entry({"output_path": self.current_output_path, "frame": self.last_frame_number})
+            self.last_frame_number = -1
+
     @unreal.ufunction(override=True)
     def on_begin_frame(self):
-        """Called every frame. Used to report progress."""
+        """Called every engine tick. Traces frame boundaries and reports progress, throttled."""
         super(RealisVirtualPlateRenderExecutor, self).on_begin_frame()
-        
-        # Ensure we have a valid pipeline object and that it is a MovieGraphPipeline
-        if self.active_movie_pipeline and isinstance(self.active_movie_pipeline, unreal.MovieGraphPipeline):
-            # Check if the pipeline is actually in the rendering state.
-            if self.active_movie_pipeline.get_pipeline_state() == unreal.MovieRenderPipelineState.PRODUCING_FRAMES:
-                
-                # --- MODIFICATION ---
-                # Use the new MovieGraphBlueprintLibrary for getting progress information.
-                progress = unreal.MovieGraphLibrary.get_completion_percentage(self.active_movie_pipeline)
-                
-                # To avoid spamming the file, only write if progress has changed meaningfully.
-                if progress > self.last_progress + 0.01:
-                    self.last_progress = progress
-                    
-                    # Get current frame number using the graph library
-                    current_frame_struct = unreal.MovieGraphLibrary.get_current_shot_frame_number(self.active_movie_pipeline)
-                    current_frame = current_frame_struct.value if hasattr(current_frame_struct, 'value') else 0
-
-                    status_update = {
-                        "timestamp": time.time(),
-                        "job_id": self.job_id,
-                        "status": "Rendering",
-                        "progress": round(progress, 4),
-                        "current_frame": current_frame
-                    }
-                    self.write_status(status_update)
+
+        # Only MovieGraph pipelines are tracked; the type is checked once per pass in start_render_pass.
+        if not self.is_graph_pipeline:
+            return
+        tick_start = time.perf_counter()
+        reporter = self.get_reporter()
+        if not reporter:
+            return
+        if self.active_movie_pipeline.get_pipeline_state() == unreal.MovieRenderPipelineState.PRODUCING_FRAMES:
+            now = time.time()
+            current_frame = self.trace_frame_boundary(now)
+            if reporter.due(now):
+                self.report_progress(now, current_frame)
+        reporter.record_tick(time.perf_counter() - tick_start)
+
+    def report_progress(self, now, current_frame):
+        """Writes a Rendering status with frame counts if progress moved enough since the last one."""
+        pass_frames_done, pass_frames_total = unreal.MovieGraphLibrary.get_overall_output_frames(self.active_movie_pipeline)
+        if pass_frames_total:
+            self.pass_frames_total = pass_frames_total
+            pass_progress = min(1.0, pass_frames_done / pass_frames_total)
+        else:
+            pass_progress = unreal.MovieGraphLibrary.get_completion_percentage(self.active_movie_pipeline)
+        progress = (self.render_pass_index + pass_progress) / max(1, self.render_pass_count)
+        frames_done = self.completed_frames + pass_frames_done
+        reporter = self.get_reporter()
+        if not reporter.should_report(now, progress, frames_done):
+            return
+
+        render_pass = json.loads(self.render_passes_json)[self.render_pass_index]
+        reporter.report(now, {
+            "timestamp": now,
+            "job_id": self.job_id,
+            "status": "Rendering",
+            "progress": round(progress, 4),
+            "current_frame": current_frame,
+            "frames_done": frames_done,
+            "frames_total": (self.completed_frames + self.later_pass_frames
+                             + self.pass_frames_total * (1 + self.later_unknown_passes)),
+            "render_pass": self.render_pass_index,
+            "render_pass_count": self.render_pass_count,
+            "pass_progress": round(pass_progress, 4),
+            "pass_frames_done": pass_frames_done,
+            "pass_frames_total": self.pass_frames_total,
+            "variant": render_pass.get("variant"),
+            "output_path": render_pass["output_path"]
+        })
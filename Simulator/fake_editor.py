@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+A stand-in for UnrealEditor-Cmd that runs the render executor against the
+simulated `unreal` module. Point an agent's unreal_editor_path at this file
+and it accepts the same command line the agent builds:
+
+    fake_editor.py <project.uproject> -ExecutorPythonClass=/Engine/PythonTypes.<Class> -JobPath=... ...
+    fake_editor.py <project.uproject> -ExecutePythonScript="<script.py> -JobPath=... -GraphPath=..."
+
+Simulation settings (frame time, frame range, crashes) come from
+UNREAL_SIM_CONFIG / UNREAL_SIM_* environment variables; see unreal/engine.py.
+"""
+import glob
+import os
+import runpy
+import sys
+
+SIMULATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SIMULATOR_DIR)
+import unreal
+
+
+def build_command_line(arguments):
+    """Rejoins argv into one string, re-quoting values the shell unquoted."""
+    parts = []
+    for argument in arguments:
+        if ' ' in argument and '"' not in argument:
+            if argument.startswith('-') and '=' in argument:
+                key, value = argument.split('=', 1)
+                argument = f'{key}="{value}"'
+            else:
+                argument = f'"{argument}"'
+        parts.append(argument)
+    return ' '.join(parts)
+
+
+def find_python_dirs(project_path):
+    """The Content/Python folders the engine would add to sys.path for this project and its plugins."""
+    project_dir = os.path.dirname(os.path.abspath(project_path)) if project_path else os.getcwd()
+    python_dirs = sorted(glob.glob(os.path.join(project_dir, 'Plugins', '*', 'Content', 'Python')))
+    python_dirs.append(os.path.join(project_dir, 'Content', 'Python'))
+    extra_dirs = os.environ.get('UNREAL_SIM_PYTHON_PATH', '')
+    python_dirs.extend(d for d in extra_dirs.split(os.pathsep) if d)
+    return [d for d in python_dirs if os.path.isdir(d)]
+
+
+def run_startup_scripts(python_dirs):
+    """Runs each folder's init_unreal.py like the editor does. Scripts needing real engine APIs only log an error."""
+    for python_dir in python_dirs:
+        if python_dir not in sys.path:
+            sys.path.insert(0, python_dir)
+    for python_dir in python_dirs:
+        init_script = os.path.join(python_dir, 'init_unreal.py')
+        if os.path.exists(init_script):
+            try:
+                runpy.run_path(init_script, run_name='init_unreal')
+            except Exception as e:
+                unreal.log_error(f"Simulator: {init_script} failed: {e}")
+
+
+def main(arguments):
+    command_line = build_command_line(arguments)
+    engine = unreal.start_engine(command_line)
+    tokens, switches, params = unreal.SystemLibrary.parse_command_line(command_line)
+    project_path = next((t for t in tokens if t.endswith('.uproject')), None)
+
+    run_startup_scripts(find_python_dirs(project_path))
+    engine.load_map(params.get('Map', '/Game/SimMap'))
+
+    if 'ExecutePythonScript' in params:
+        # The script's own arguments follow its path inside the quoted value, as with the real editor.
+        script_path, _, script_arguments = params['ExecutePythonScript'].partition(' ')
+        sys.argv = [script_path, script_arguments or command_line]
+        runpy.run_path(script_path, run_name='__main__')
+    elif 'ExecutorPythonClass' in params:
+        class_name = params['ExecutorPythonClass'].rsplit('.', 1)[-1]
+        executor_class = unreal.find_class(class_name)
+        if executor_class is None:
+            unreal.log_error(f"Simulator: No Python UClass named '{class_name}' was registered.")
+            return 1
+        executor = executor_class()
+        engine.add_executor(executor)
+        executor.pipeline_queue = unreal.MoviePipelineQueue(outer=executor)
+        executor.on_map_load(engine.world)
+        executor.execute_delayed(executor.pipeline_queue)
+    else:
+        unreal.log_error("Simulator: Nothing to run; pass -ExecutorPythonClass or -ExecutePythonScript.")
+        return 1
+
+    timeout = os.environ.get('UNREAL_SIM_TIMEOUT')
+    return engine.run(float(timeout) if timeout else None)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Load-tests a real DirectorLogic against a simulated render farm. Hundreds or
+thousands of fake AgentServer endpoints run on one asyncio loop in this
+process; each listens on its own localhost port and speaks the agent's
+protocol (newline-delimited JSON: an initial status, Starting / Rendering /
+Completed / Error updates, trace messages, then Idle). Job durations,
+failures and progress rates are drawn per job from a seeded RNG.
+
+The Director side is unmodified: agents are added with connect_to_agent, so
+each one gets its thread-per-connection reader, and the UI callbacks mirror
+director_ui.py (including the all-agents payload on every status update) with
+emits serialized and counted instead of sent over SocketIO.
+
+    fleet_sim.py --agents 1000 --jobs 5000 --report fleet_report.json
+
+The report covers dispatch latency (agent idle -> next job received), queue
+wait, queue throughput, UI emit rate and bytes, Director threads and memory.
+Fake agents share the process (and the GIL) with the Director, so absolute
+numbers are pessimistic; compare runs against each other.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+SIMULATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+DIRECTOR_DIR = os.path.join(os.path.dirname(SIMULATOR_DIR), 'Director')
+sys.path.insert(0, DIRECTOR_DIR)
+import director
+from director import DirectorLogic
+
+try:
+    import resource # Unix only; peak RSS is left out of the report elsewhere
+except ImportError:
+    resource = None
+
+# Defaults for a simulated fleet. Override with --config <json> and/or the command line flags.
+DEFAULT_FLEET_CONFIG = {
+    "agents": 200,
+    "jobs": 1000,
+    "seed": 1,
+    "host": "127.0.0.1",
+    "job_duration": 5.0,         # Median seconds a job spends rendering on a speed 1.0 agent
+    "duration_sigma": 0.5,       # Log-normal spread of job durations
+    "speed_sigma": 0.25,         # Log-normal spread of per-agent speed (heterogeneous hardware)
+    "startup_time": 0.5,         # Seconds between Starting and the first Rendering update
+    "failure_rate": 0.02,        # Probability a job ends in Error part-way through
+    "frames": 100,               # Frames per job, reported as current_frame
+    "progress_interval": 0.5,    # Mean seconds between Rendering updates (jittered per job)
+    "completed_hold": 2.0,       # Seconds an agent reports Completed before Idle, as AgentLogic does
+    "submit_batch_size": 0,      # Jobs per add_job_batch_to_queue call; 0 submits everything at once
+    "submit_interval": 0.0,      # Seconds between submission batches
+    "connect_timeout": 60.0,     # Seconds to wait for the Director to connect to every agent
+    "timeout": 600.0,            # Give up if the jobs have not all finished by then
+    "sample_interval": 1.0,      # Seconds between time-series samples in the report
+    "ui_mode": "full",           # 'full' builds and serializes director_ui.py's payloads; 'count' only counts
+    "history": None,             # Keep the Director's job history here, e.g. as input for replay_sim.py
+    "tracemalloc": False,        # Track Python heap use, split into Director modules and everything else
+    "verbose": False             # Print Director log lines
+}
+
+
+def summarize(values):
+    """Count, mean and p50/p95/p99/max of a list of seconds (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 6)
+    return {
+        "count": len(ordered), "mean": round(sum(ordered) / len(ordered), 6),
+        "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(ordered[-1], 6)
+    }
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024 # Linux reports kilobytes
+
+
+class FleetMetrics:
+    """Thread-safe counters shared by the fake agents (loop thread) and the Director callbacks."""
+    def __init__(self, job_count):
+        self.lock = threading.Lock()
+        self.job_count = job_count
+        self.submitted_at = {} # job_id -> time handed to the Director
+        self.dispatched = 0
+        self.finished = 0
+        self.failed = 0
+        self.rejected = 0 # Jobs an agent refused as busy; the Director does not re-queue them, so they are lost
+        self.idle_since = {} # agent_id -> time it went Idle while jobs were still waiting
+        self.dispatch_latencies = []
+        self.queue_waits = []
+        self.turnarounds = []
+        self.first_submit = None
+        self.fill_time = None # Seconds until every agent (or every job) had been dispatched once
+        self.fill_target = 0
+        self.last_finish = None
+        self.all_finished = threading.Event()
+        self.emits = {} # event name -> [count, bytes]
+        self.log_lines = 0
+
+    def record_submitted(self, job_ids):
+        now = time.time()
+        with self.lock:
+            if self.first_submit is None:
+                self.first_submit = now
+            for job_id in job_ids:
+                self.submitted_at[job_id] = now
+
+    def record_idle(self, agent_id):
+        with self.lock:
+            if self.dispatched < len(self.submitted_at):
+                self.idle_since[agent_id] = time.time()
+
+    def record_received(self, agent_id, job_id):
+        now = time.time()
+        with self.lock:
+            self.dispatched += 1
+            idle_since = self.idle_since.pop(agent_id, None)
+            if idle_since is not None:
+                self.dispatch_latencies.append(now - idle_since)
+            if job_id in self.submitted_at:
+                self.queue_waits.append(now - self.submitted_at[job_id])
+            if self.fill_time is None and self.dispatched >= self.fill_target:
+                self.fill_time = now - self.first_submit
+
+    def record_rejected(self):
+        with self.lock:
+            self.rejected += 1
+            self._check_done()
+
+    def record_finished(self, job_id, succeeded):
+        """Called from the Director's status callback, so this is when the Director saw the result."""
+        now = time.time()
+        with self.lock:
+            self.finished += 1
+            if not succeeded:
+                self.failed += 1
+            if job_id in self.submitted_at:
+                self.turnarounds.append(now - self.submitted_at[job_id])
+            self.last_finish = now
+            self._check_done()
+
+    def _check_done(self):
+        if self.finished + self.rejected >= self.job_count:
+            self.all_finished.set()
+
+    def record_emit(self, event, size):
+        with self.lock:
+            counts = self.emits.setdefault(event, [0, 0])
+            counts[0] += 1
+            counts[1] += size
+
+    def record_log(self):
+        with self.lock:
+            self.log_lines += 1
+
+
+class FakeAgent:
+    """
+    One simulated AgentServer endpoint. Accepts Director connections, sends its
+    status on connect, and runs one job at a time, broadcasting status lines
+    to every connected Director like AgentServer.broadcast_status.
+    """
+    def __init__(self, agent_id, config, metrics, speed):
+        self.agent_id = agent_id
+        self.config = config
+        self.metrics = metrics
+        self.speed = speed
+        self.writers = []
+        self.server = None
+        self.port = None
+        self.current_job = None
+        self.last_status = self._idle_status()
+
+    # --- Public Methods ---
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_director, self.config["host"], 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        await self.server.wait_closed()
+
+    # --- Connection Handling ---
+
+    async def _handle_director(self, reader, writer):
+        self.writers.append(writer)
+        self._send(writer, dict(self.last_status, timestamp=time.time()))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    self._handle_job_message(writer, line)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if writer in self.writers:
+                self.writers.remove(writer)
+            writer.close()
+
+    def _handle_job_message(self, writer, line):
+        try:
+            job_data = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"{self.agent_id}: Received invalid job data: {e}")
+            return
+        if self.current_job is not None:
+            self.metrics.record_rejected()
+            self._send(writer, {"status": "error", "message": "Agent is busy with another job."})
+            return
+        self.current_job = job_data
+        self.metrics.record_received(self.agent_id, job_data.get('job_id'))
+        asyncio.ensure_future(self._run_job(job_data))
+
+    def _send(self, writer, message):
+        try:
+            writer.write((json.dumps(message) + '\n').encode('utf-8'))
+        except (ConnectionError, RuntimeError):
+            pass # The Director side is gone; its reader loop cleans up
+
+    def _broadcast(self, status):
+        self.last_status = status
+        for writer in list(self.writers):
+            self._send(writer, status)
+
+    # --- Job Simulation ---
+
+    async def _run_job(self, job_data):
+        job_id = job_data.get('job_id')
+        accepted_at = time.time()
+        # Per-job randomness is keyed on the job, so a seed reproduces the same work whatever agent gets it.
+        rng = random.Random(f"{self.config['seed']}:{job_id}")
+        duration = self.config["job_duration"] * rng.lognormvariate(0, self.config["duration_sigma"]) / self.speed
+        interval = self.config["progress_interval"] * rng.uniform(0.5, 1.5)
+        fail_at = rng.uniform(0.05, 0.95) if rng.random() < self.config["failure_rate"] else None
+        frames = job_data.get('sim_frames', self.config["frames"])
+
+        self._broadcast(dict(self._idle_status(), status="Starting", job_id=job_id))
+        await asyncio.sleep(self.config["startup_time"])
+        render_start = time.time()
+
+        progress = 0.0
+        while progress < 1.0:
+            await asyncio.sleep(min(interval, duration))
+            progress = min(1.0, (time.time() - render_start) / duration) if duration > 0 else 1.0
+            if fail_at is not None and progress >= fail_at:
+                break
+            if progress < 1.0:
+                self._broadcast({"timestamp": time.time(), "job_id": job_id, "status": "Rendering",
+                                 "progress": round(progress, 4), "current_frame": int(progress * frames)})
+
+        if fail_at is not None:
+            final_status = {"timestamp": time.time(), "job_id": job_id, "status": "Error",
+                            "reason": "Simulated render failure."}
+        else:
+            final_status = {"timestamp": time.time(), "job_id": job_id, "status": "Completed",
+                            "progress": 1.0, "current_frame": frames}
+        self._broadcast(final_status)
+        self._broadcast({
+            "type": "trace", "timestamp": time.time(), "agent_id": self.agent_id,
+            "job_id": job_id, "trace_id": job_data.get('trace_id'), "events": [
+                {"name": "agent_accept", "ts": accepted_at},
+                {"name": "render", "ts": render_start, "dur": time.time() - render_start,
+                 "args": {"status": final_status["status"]}}
+            ]
+        })
+
+        if final_status["status"] == "Completed":
+            await asyncio.sleep(self.config["completed_hold"])
+        self.current_job = None
+        self.metrics.record_idle(self.agent_id)
+        self._broadcast(self._idle_status())
+
+    def _idle_status(self):
+        return {
+            "timestamp": time.time(), "job_id": None,
+            "status": "Idle", "agent_id": self.agent_id,
+            "progress": 0, "current_frame": 0,
+            "file_server_port": None
+        }
+
+
+class FleetSimulation:
+    """Runs one fleet against a fresh DirectorLogic and returns the report dictionary."""
+    def __init__(self, config):
+        self.config = config
+        self.metrics = FleetMetrics(config["jobs"])
+        self.loop = asyncio.new_event_loop()
+        self.agents = []
+        self.logic = None
+        self.samples = []
+        self.work_dir = None
+
+    def run(self):
+        self.work_dir = tempfile.mkdtemp(prefix='fleet_sim_')
+        previous_dir = os.getcwd()
+        history_path = os.path.abspath(self.config["history"]) if self.config["history"] else None
+        loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        loop_thread.start()
+        if self.config["tracemalloc"]:
+            tracemalloc.start()
+        try:
+            # The Director keeps its agent list and render cache in the working directory.
+            os.chdir(self.work_dir)
+            director.AGENTS_SAVE_FILE = os.path.join(self.work_dir, 'director_agents.json')
+            return self._run_fleet(history_path)
+        finally:
+            os.chdir(previous_dir)
+            self._call_in_loop(self._stop_agents(), timeout=30)
+            if self.logic:
+                self.logic.history.flush()
+                if not history_path:
+                    # Disconnects still being recorded would otherwise be flushed into the removed work dir.
+                    self.logic.history.path = os.devnull
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            loop_thread.join(timeout=5)
+            if self.config["tracemalloc"]:
+                tracemalloc.stop()
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    # --- Phases ---
+
+    def _run_fleet(self, history_path):
+        config = self.config
+        started_at = time.time()
+        self.logic = DirectorLogic(self._log, self._build_ui_callbacks())
+        if history_path:
+            self.logic.history.path = history_path
+        self._call_in_loop(self._start_agents())
+        baseline_threads = threading.active_count()
+
+        connect_start = time.time()
+        for agent in self.agents:
+            self.logic.connect_to_agent(f"{config['host']}:{agent.port}")
+        while len(self.logic.get_all_agents()) < len(self.agents):
+            if time.time() - connect_start > config["connect_timeout"]:
+                print(f"Only {len(self.logic.get_all_agents())} of {len(self.agents)} agents connected.")
+                break
+            time.sleep(0.05)
+        connect_seconds = time.time() - connect_start
+        connected_heap = self._director_heap_bytes()
+
+        jobs = self._build_jobs()
+        self.metrics.fill_target = min(len(self.agents), len(jobs))
+        sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        sampler.start()
+
+        submit_start = time.time()
+        batch_size = config["submit_batch_size"] or len(jobs)
+        for first in range(0, len(jobs), batch_size):
+            batch = jobs[first:first + batch_size]
+            self.metrics.record_submitted([job['job_id'] for job in batch])
+            self.logic.add_job_batch_to_queue(batch)
+            if config["submit_interval"] and first + batch_size < len(jobs):
+                time.sleep(config["submit_interval"])
+
+        completed = self.metrics.all_finished.wait(timeout=config["timeout"])
+        end_time = time.time()
+        peak_heap = tracemalloc.get_traced_memory()[1] if self.config["tracemalloc"] else None
+        final_heap = self._director_heap_bytes()
+        return self._build_report(completed, started_at, connect_seconds, submit_start, end_time,
+                                  baseline_threads, connected_heap, final_heap, peak_heap)
+
+    async def _start_agents(self):
+        master_rng = random.Random(self.config["seed"])
+        for index in range(self.config["agents"]):
+            speed = master_rng.lognormvariate(0, self.config["speed_sigma"])
+            agent = FakeAgent(f"sim-agent-{index:04d}", self.config, self.metrics, speed)
+            await agent.start()
+            self.agents.append(agent)
+
+    async def _stop_agents(self):
+        for agent in self.agents:
+            await agent.stop()
+
+    def _call_in_loop(self, coroutine, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def _build_jobs(self):
+        jobs = []
+        for index in range(self.config["jobs"]):
+            job_id = f"fleet_job_{index:06d}"
+            jobs.append({
+                "job_id": job_id,
+                "trace_id": uuid.uuid4().hex,
+                "job_type": "render",
+                "level_path": "/Game/SimMap",
+                "sequence_path": f"/Game/Sequences/Fleet_{index:06d}",
+                "graph_path": "/Game/Graphs/FleetGraph",
+                "output_path": os.path.join(self.work_dir, 'renders', job_id),
+                "sim_frames": self.config["frames"]
+            })
+        return jobs
+
+    # --- Director Callbacks ---
+
+    def _log(self, message):
+        self.metrics.record_log()
+        if self.config["verbose"]:
+            print(message)
+
+    def _emit(self, event, payload):
+        size = len(json.dumps(payload)) if self.config["ui_mode"] == 'full' else 0
+        self.metrics.record_emit(event, size)
+
+    def _build_ui_callbacks(self):
+        """The same callbacks director_ui.py registers, emitting into the metrics instead of SocketIO."""
+        full = self.config["ui_mode"] == 'full'
+
+        def on_agent_status_update(agent_id, status_data):
+            if status_data.get('status') in ('Completed', 'Error') and status_data.get('job_id'):
+                self.metrics.record_finished(status_data['job_id'], status_data['status'] == 'Completed')
+            if full:
+                all_agents_status = self.logic.get_all_agents()
+                payload = all_agents_status.get(agent_id, {}).copy()
+                payload['all_agents'] = all_agents_status
+            else:
+                payload = None
+            self._emit('agent_update', payload)
+
+        def on_agent_connected(agent_id, agent_data):
+            self._log(f"Successfully connected to agent: {agent_id}")
+            on_agent_status_update(agent_id, agent_data)
+
+        def on_agent_disconnected(agent_id):
+            self._emit('disconnect_agent', {'agent_id': agent_id})
+            self._emit('update_agent_dropdown', {'all_agents': self.logic.get_all_agents() if full else None})
+
+        return {
+            'on_agent_connected': on_agent_connected,
+            'on_agent_disconnected': on_agent_disconnected,
+            'on_agent_status_update': on_agent_status_update,
+            'on_queue_update': lambda queue_data: self._emit('queue_update', {'queue': queue_data}),
+            'on_agent_preview': lambda agent_id, preview: self._emit('agent_preview', preview)
+        }
+
+    # --- Measurements ---
+
+    def _director_heap_bytes(self):
+        """Python heap allocated from the Director's own modules, or None without tracemalloc."""
+        if not self.config["tracemalloc"]:
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, os.path.join(DIRECTOR_DIR, '*'))])
+        return sum(stat.size for stat in snapshot.statistics('filename'))
+
+    def _sample_loop(self):
+        interval = self.config["sample_interval"]
+        previous_finished, previous_emits, previous_time = 0, 0, time.time()
+        while not self.metrics.all_finished.is_set():
+            time.sleep(interval)
+            now = time.time()
+            with self.metrics.lock:
+                finished = self.metrics.finished
+                emits = sum(count for count, _ in self.metrics.emits.values())
+            self.samples.append({
+                "t": round(now - self.metrics.first_submit, 3),
+                "queued": self.logic.get_queued_job_count(),
+                "busy_agents": sum(1 for agent in self.agents if agent.current_job is not None),
+                "finished": finished,
+                "finish_rate": round((finished - previous_finished) / (now - previous_time), 3),
+                "emit_rate": round((emits - previous_emits) / (now - previous_time), 3),
+                "threads": threading.active_count(),
+                "traced_bytes": tracemalloc.get_traced_memory()[0] if self.config["tracemalloc"] else None
+            })
+            previous_finished, previous_emits, previous_time = finished, emits, now
+
+    def _build_report(self, completed, started_at, connect_seconds, submit_start, end_time,
+                      baseline_threads, connected_heap, final_heap, peak_heap):
+        metrics = self.metrics
+        makespan = (metrics.last_finish or end_time) - submit_start
+        ideal = self._ideal_makespan()
+        emits = {event: {"count": count, "bytes": size, "per_second": round(count / makespan, 3) if makespan else None}
+                 for event, (count, size) in sorted(metrics.emits.items())}
+        total_emits = sum(count for count, _ in metrics.emits.values())
+        return {
+            "config": self.config,
+            "completed": completed,
+            "agents": {"requested": len(self.agents), "connected": len(self.logic.get_all_agents()),
+                       "connect_seconds": round(connect_seconds, 3)},
+            "jobs": {"submitted": len(metrics.submitted_at), "dispatched": metrics.dispatched,
+                     "finished": metrics.finished, "failed": metrics.failed, "lost_busy_rejections": metrics.rejected},
+            "throughput": {
+                "makespan_seconds": round(makespan, 3),
+                "jobs_per_second": round(metrics.finished / makespan, 3) if makespan else None,
+                "ideal_makespan_seconds": round(ideal, 3),
+                "efficiency": round(ideal / makespan, 4) if makespan else None,
+                "fill_seconds": round(metrics.fill_time, 4) if metrics.fill_time is not None else None
+            },
+            "dispatch_latency": summarize(metrics.dispatch_latencies),
+            "queue_wait": summarize(metrics.queue_waits),
+            "turnaround": summarize(metrics.turnarounds),
+            "ui_emits": {"total": total_emits,
+                         "per_second": round(total_emits / makespan, 3) if makespan else None,
+                         "by_event": emits},
+            "director": {"log_lines": metrics.log_lines, "threads_before_connect": baseline_threads,
+                         "threads_peak": max([s["threads"] for s in self.samples] or [threading.active_count()])},
+            "memory": {"peak_rss_bytes": peak_rss_bytes(),
+                       "director_heap_after_connect_bytes": connected_heap,
+                       "director_heap_at_end_bytes": final_heap,
+                       "traced_peak_bytes": peak_heap},
+            "wall_seconds": round(end_time - started_at, 3),
+            "samples": self.samples
+        }
+
+    def _ideal_makespan(self):
+        """Makespan if every job were placed the instant an agent freed up, from the same per-job draws."""
+        config = self.config
+        total_work = 0.0
+        for index in range(config["jobs"]):
+            rng = random.Random(f"{config['seed']}:fleet_job_{index:06d}")
+            duration = config["job_duration"] * rng.lognormvariate(0, config["duration_sigma"])
+            total_work += config["startup_time"] + duration + config["completed_hold"]
+        mean_speed = sum(agent.speed for agent in self.agents) / len(self.agents) if self.agents else 1.0
+        return total_work / (mean_speed * max(1, len(self.agents)))
+
+
+def load_fleet_config(config_path=None, overrides=None):
+    config = dict(DEFAULT_FLEET_CONFIG)
+    if config_path:
+        with open(config_path, 'r') as f:
+            config.update(json.load(f))
+    config.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test DirectorLogic against a simulated agent fleet.")
+    parser.add_argument('--config', help="JSON file overriding DEFAULT_FLEET_CONFIG")
+    for key, default in DEFAULT_FLEET_CONFIG.items():
+        if isinstance(default, bool):
+            parser.add_argument(f"--{key.replace('_', '-')}", dest=key, action='store_const', const=True)
+        else:
+            parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=str if default is None else type(default))
+    parser.add_argument('--report', help="Write the JSON report here instead of stdout")
+    args = vars(parser.parse_args())
+    config_path, report_path = args.pop('config'), args.pop('report')
+
+    report = FleetSimulation(load_fleet_config(config_path, args)).run()
+    text = json.dumps(report, indent=2)
+    if report_path:
+        with open(report_path, 'w') as f:
+            f.write(text)
+        summary = {key: report[key] for key in ('completed', 'jobs', 'throughput', 'dispatch_latency', 'ui_emits')}
+        summary['ui_emits'] = {k: v for k, v in summary['ui_emits'].items() if k != 'by_event'}
+        print(json.dumps(summary, indent=2))
+    else:
+        print(text)
+    return 0 if report["completed"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Replays the Director's job history (director_history.jsonl, see
+Director/job_history.py) through a discrete-event simulator to compare
+scheduling policies offline. Job arrivals, durations and agent availability
+come from the log; only the order in which queued jobs are handed to idle
+agents changes.
+
+    replay_sim.py director_history.jsonl --policy all --report replay.json
+    replay_sim.py --synthesize month.jsonl --days 30 --agents 200
+
+Policies:
+    fifo      Oldest job first; what DirectorLogic does until its agents are calibrated, after
+              which it matches job size to agent speed (see Director/agent_profiles.py).
+    priority  Post-process jobs (derive, stitch, contact sheets) before renders, then oldest.
+    locality  An idle agent takes the oldest job for the level it rendered last, else the oldest job.
+    lpt       Longest expected job first, estimated online from jobs already finished in the replay.
+
+The report gives makespan, mean and tail wait and turnaround, and agent
+utilization for each policy, next to the same figures measured from the log
+itself ('recorded').
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+
+SIMULATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(SIMULATOR_DIR), 'Director'))
+from job_history import load_history
+
+# Used by the priority policy. Short post-process stages deliver finished
+# outputs, so they go ahead of renders.
+JOB_TYPE_PRIORITY = {'derive': 1, 'stitch': 1, 'contact_sheet': 1, 'reproject': 1}
+
+# Event kinds, in the order they are handled when they share a timestamp:
+# agents becoming available before jobs arrive, so a job arriving exactly as
+# an agent frees up is dispatched at once; agents leaving last.
+AGENT_UP, AGENT_READY, ARRIVAL, AGENT_DOWN = range(4)
+
+
+def job_priority(job):
+    return JOB_TYPE_PRIORITY.get(job.get('job_type') or 'render', 0)
+
+
+def summarize(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+    return {"mean": round(sum(ordered) / len(ordered), 3), "p50": pick(0.50), "p95": pick(0.95),
+            "p99": pick(0.99), "max": round(ordered[-1], 3)}
+
+
+# --- Queues, one per policy ---
+
+class FifoQueue:
+    def __init__(self, estimator=None):
+        self.jobs = deque()
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def push(self, job):
+        self.jobs.append(job)
+
+    def pop_for(self, agent):
+        return self.jobs.popleft()
+
+
+class PriorityQueue:
+    def __init__(self, estimator=None):
+        self.heap = []
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, job):
+        self.counter += 1
+        heapq.heappush(self.heap, (-job_priority(job), job['arrival'], self.counter, job))
+
+    def pop_for(self, agent):
+        return heapq.heappop(self.heap)[-1]
+
+
+class LptQueue(PriorityQueue):
+    """Longest expected processing time first. The estimate is fixed when the job is queued."""
+    def __init__(self, estimator=None):
+        super().__init__()
+        self.estimator = estimator
+
+    def push(self, job):
+        self.counter += 1
+        heapq.heappush(self.heap, (-self.estimator.estimate(job), job['arrival'], self.counter, job))
+
+
+class LocalityQueue:
+    """
+    FIFO per level plus a global FIFO. A job taken through one of them is
+    marked and skipped when it reaches the front of the other.
+    """
+    def __init__(self, estimator=None):
+        self.all_jobs = deque()
+        self.by_level = {}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, job):
+        entry = [job, False]
+        self.all_jobs.append(entry)
+        self.by_level.setdefault(job.get('level_path'), deque()).append(entry)
+        self.size += 1
+
+    def pop_for(self, agent):
+        level_jobs = self.by_level.get(agent.last_level)
+        entry = self._pop_untaken(level_jobs) if level_jobs else None
+        if entry is None:
+            entry = self._pop_untaken(self.all_jobs)
+        entry[1] = True
+        self.size -= 1
+        return entry[0]
+
+    @staticmethod
+    def _pop_untaken(entries):
+        while entries:
+            entry = entries.popleft()
+            if not entry[1]:
+                return entry
+        return None
+
+
+POLICIES = {"fifo": FifoQueue, "priority": PriorityQueue, "locality": LocalityQueue, "lpt": LptQueue}
+
+
+class DurationEstimator:
+    """Running mean duration per job shape, falling back to coarser shapes and then to all jobs."""
+    def __init__(self, default=60.0):
+        self.sums = {}
+        self.default = default
+
+    @staticmethod
+    def _keys(job):
+        resolution = tuple(job.get('resolution') or ())
+        return [(job.get('job_type'), job.get('level_path'), job.get('sequence_path'), resolution),
+                (job.get('job_type'), resolution), ()]
+
+    def estimate(self, job):
+        for key in self._keys(job):
+            total, count = self.sums.get(key, (0.0, 0))
+            if count:
+                return total / count
+        return self.default
+
+    def observe(self, job, duration):
+        for key in self._keys(job):
+            total, count = self.sums.get(key, (0.0, 0))
+            self.sums[key] = (total + duration, count + 1)
+
+
+class SimAgent:
+    __slots__ = ('agent_id', 'available', 'busy', 'in_idle_queue', 'last_level', 'epoch', 'busy_time')
+
+    def __init__(self, agent_id):
+        self.agent_id = agent_id
+        self.available = False
+        self.busy = None # (job, start, end) while running
+        self.in_idle_queue = False
+        self.last_level = None
+        self.epoch = 0 # Bumped on disconnect so stale finish events are ignored
+        self.busy_time = 0.0
+
+
+class ReplaySimulation:
+    """
+    Replays jobs on agents under one policy.
+    :param jobs: Job dicts from load_history (arrival, duration, level_path, ...).
+    :param agents: {agent_id: [(up, down or None), ...]} availability intervals.
+    :param agent_gap: Seconds an agent stays unavailable after a job, e.g. the
+                      agent holding Completed before it reports Idle.
+    :param locality_saving: Seconds a job runs faster when its agent's previous job used the same level.
+    """
+    def __init__(self, jobs, agents, policy='fifo', agent_gap=2.0, locality_saving=0.0, record_runs=False):
+        self.jobs = jobs
+        self.agent_intervals = agents
+        self.policy = policy
+        self.agent_gap = agent_gap
+        self.locality_saving = locality_saving
+        self.record_runs = record_runs
+        self.runs = [] # (job, agent_id, start, end) when record_runs
+
+    def run(self):
+        estimator = DurationEstimator()
+        queue = POLICIES[self.policy](estimator)
+        agents = {agent_id: SimAgent(agent_id) for agent_id in self.agent_intervals}
+        idle = deque()
+        events = []
+        counter = 0
+
+        def make_idle(agent):
+            if not agent.in_idle_queue:
+                agent.in_idle_queue = True
+                idle.append(agent)
+
+        for agent_id, intervals in self.agent_intervals.items():
+            for up, down in intervals:
+                events.append((up, AGENT_UP, counter, agent_id, None))
+                counter += 1
+                if down is not None:
+                    events.append((down, AGENT_DOWN, counter, agent_id, None))
+                    counter += 1
+        for job in self.jobs:
+            events.append((job['arrival'], ARRIVAL, counter, None, job))
+            counter += 1
+        heapq.heapify(events)
+
+        waits, turnarounds = [], []
+        interrupted = 0
+        first_arrival = self.jobs[0]['arrival'] if self.jobs else 0.0
+        last_end = first_arrival
+        unfinished = len(self.jobs)
+
+        def start_jobs(now):
+            nonlocal counter
+            while queue and idle:
+                agent = idle.popleft()
+                agent.in_idle_queue = False
+                if not agent.available or agent.busy:
+                    continue
+                job = queue.pop_for(agent)
+                duration = self._replay_duration(job, agent)
+                agent.busy = (job, now, now + duration)
+                agent.last_level = job.get('level_path')
+                heapq.heappush(events, (now + duration, AGENT_READY, counter, agent.agent_id, agent.epoch))
+                counter += 1
+
+        while events and unfinished:
+            now, kind, _, agent_id, payload = heapq.heappop(events)
+            if kind == ARRIVAL:
+                queue.push(payload)
+            elif kind == AGENT_UP:
+                agent = agents[agent_id]
+                if not agent.available:
+                    agent.available = True
+                    make_idle(agent)
+            elif kind == AGENT_DOWN:
+                agent = agents[agent_id]
+                agent.available = False
+                agent.epoch += 1
+                if agent.busy:
+                    # The Director loses the running job with the connection; the replay re-queues it.
+                    job, start, _ = agent.busy
+                    agent.busy_time += now - start
+                    agent.busy = None
+                    interrupted += 1
+                    queue.push(job)
+            elif kind == AGENT_READY:
+                agent = agents[agent_id]
+                if payload is None:
+                    # The gap after a job is over.
+                    if agent.available and not agent.busy:
+                        make_idle(agent)
+                elif payload == agent.epoch and agent.busy:
+                    job, start, end = agent.busy
+                    agent.busy = None
+                    agent.busy_time += end - start
+                    estimator.observe(job, end - start)
+                    waits.append(start - job['arrival'])
+                    turnarounds.append(end - job['arrival'])
+                    last_end = max(last_end, end)
+                    unfinished -= 1
+                    if self.record_runs:
+                        self.runs.append((job, agent_id, start, end))
+                    heapq.heappush(events, (now + self.agent_gap, AGENT_READY, counter, agent_id, None))
+                    counter += 1
+            start_jobs(now)
+
+        makespan = last_end - first_arrival
+        available_time = sum(self._available_seconds(intervals, first_arrival, last_end)
+                             for intervals in self.agent_intervals.values())
+        return {
+            "policy": self.policy,
+            "jobs": len(self.jobs), "finished": len(self.jobs) - unfinished, "interrupted": interrupted,
+            "makespan_seconds": round(makespan, 3),
+            "wait_seconds": summarize(waits),
+            "turnaround_seconds": summarize(turnarounds),
+            "utilization": round(sum(a.busy_time for a in agents.values()) / available_time, 4) if available_time else None
+        }
+
+    def _replay_duration(self, job, agent):
+        duration = job['duration']
+        if self.locality_saving:
+            # Recorded durations already include the original warm or cold start; swap it for this one.
+            warm_now = agent.last_level is not None and agent.last_level == job.get('level_path')
+            duration += self.locality_saving * (job.get('recorded_warm', False) - warm_now)
+        return max(0.0, duration)
+
+    @staticmethod
+    def _available_seconds(intervals, start, end):
+        total = 0.0
+        for up, down in intervals:
+            overlap = min(end, down if down is not None else end) - max(start, up)
+            total += max(0.0, overlap)
+        return total
+
+
+def mark_recorded_locality(jobs):
+    """Flags jobs whose original agent had rendered the same level just before, for locality_saving."""
+    last_level = {}
+    for job in sorted(jobs, key=lambda job: job['dispatched']):
+        level = job.get('level_path')
+        job['recorded_warm'] = level is not None and last_level.get(job['agent_id']) == level
+        last_level[job['agent_id']] = job.get('level_path')
+
+
+def recorded_metrics(jobs, agents):
+    """The figures the replay reports, measured from what actually happened."""
+    if not jobs:
+        return {"policy": "recorded", "jobs": 0}
+    first_arrival = jobs[0]['arrival']
+    last_end = max(job['finished'] for job in jobs)
+    available_time = sum(ReplaySimulation._available_seconds(intervals, first_arrival, last_end)
+                         for intervals in agents.values())
+    return {
+        "policy": "recorded",
+        "jobs": len(jobs), "finished": len(jobs), "interrupted": 0,
+        "makespan_seconds": round(last_end - first_arrival, 3),
+        "wait_seconds": summarize([job['dispatched'] - job['arrival'] for job in jobs]),
+        "turnaround_seconds": summarize([job['finished'] - job['arrival'] for job in jobs]),
+        "utilization": round(sum(job['duration'] for job in jobs) / available_time, 4) if available_time else None
+    }
+
+
+def synthesize_history(path, days=30, agent_count=200, jobs_per_day=6000, seed=1, agent_gap=2.0):
+    """
+    Writes a plausible history log for trying policies without a real farm:
+    submissions in working hours, per-level durations, and agents that drop
+    out now and then. The jobs are scheduled FIFO, like the Director does.
+    """
+    rng = random.Random(seed)
+    start = 1700000000.0
+    levels = [f"/Game/Maps/Set_{index:02d}" for index in range(12)]
+    level_minutes = {level: rng.uniform(2, 30) for level in levels}
+    resolutions = [(1920, 1080), (3840, 2160), (7680, 4320)]
+
+    agents = {}
+    for index in range(agent_count):
+        intervals, t = [], start
+        while t < start + days * 86400:
+            uptime = rng.expovariate(1 / (7 * 86400))
+            intervals.append((t, min(t + uptime, start + days * 86400 + 86400)))
+            t += uptime + rng.expovariate(1 / 3600)
+        intervals[-1] = (intervals[-1][0], None)
+        agents[f"agent-{index:04d}"] = intervals
+
+    jobs = []
+    for day in range(days):
+        t = start + day * 86400 + 9 * 3600
+        remaining = jobs_per_day
+        while remaining > 0:
+            batch_size = min(remaining, rng.choice([10, 50, 200, 1000]))
+            level = rng.choice(levels)
+            resolution = rng.choice(resolutions)
+            scale = (resolution[0] * resolution[1]) / (1920 * 1080)
+            for index in range(batch_size):
+                job_type = 'derive' if rng.random() < 0.1 else 'render'
+                minutes = level_minutes[level] * (scale ** 0.5) if job_type == 'render' else 0.5
+                jobs.append({
+                    "job_id": f"job_{len(jobs):08d}", "arrival": t, "job_type": job_type, "level_path": level,
+                    "sequence_path": f"{level}/Seq_{index % 20:02d}", "resolution": list(resolution),
+                    "duration": minutes * 60 * rng.lognormvariate(0, 0.3),
+                    "status": "Completed" if rng.random() > 0.02 else "Error"
+                })
+            remaining -= batch_size
+            t += rng.expovariate(1 / (9 * 3600 / max(1, jobs_per_day / 300)))
+
+    simulation = ReplaySimulation(jobs, agents, 'fifo', agent_gap=agent_gap, record_runs=True)
+    simulation.run()
+    events = []
+    for agent_id, intervals in agents.items():
+        for up, down in intervals:
+            events.append({"event": "agent_connected", "t": up, "agent_id": agent_id})
+            if down is not None:
+                events.append({"event": "agent_disconnected", "t": down, "agent_id": agent_id})
+    for job, agent_id, run_start, run_end in simulation.runs:
+        fields = {key: job[key] for key in ('job_id', 'job_type', 'level_path', 'sequence_path', 'resolution')}
+        events.append(dict(fields, event="queued", t=job['arrival']))
+        events.append({"event": "dispatched", "t": run_start, "job_id": job['job_id'], "agent_id": agent_id})
+        events.append({"event": "finished", "t": run_end, "job_id": job['job_id'], "agent_id": agent_id,
+                       "status": job['status']})
+    events.sort(key=lambda event: event['t'])
+    with open(path, 'w') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+    return len(simulation.runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay Director history under different scheduling policies.")
+    parser.add_argument('history', nargs='?', help="director_history.jsonl")
+    parser.add_argument('--policy', action='append', choices=sorted(POLICIES) + ['all'],
+                        help="Policy to evaluate (repeatable). Default: all")
+    parser.add_argument('--agent-gap', type=float, default=2.0, help="Seconds an agent rests between jobs")
+    parser.add_argument('--locality-saving', type=float, default=0.0,
+                        help="Seconds saved when an agent renders the same level as its previous job")
+    parser.add_argument('--start', type=float, help="Only replay events after this epoch time")
+    parser.add_argument('--end', type=float, help="Only replay events before this epoch time")
+    parser.add_argument('--report', help="Write the JSON report here as well")
+    parser.add_argument('--synthesize', metavar='PATH', help="Write a synthetic history log to PATH and exit")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--agents', type=int, default=200)
+    parser.add_argument('--jobs-per-day', type=int, default=6000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.synthesize:
+        started = time.time()
+        count = synthesize_history(args.synthesize, args.days, args.agents, args.jobs_per_day, args.seed,
+                                   args.agent_gap)
+        print(f"Wrote {count} jobs to {args.synthesize} in {time.time() - started:.1f}s.")
+        return 0
+    if not args.history:
+        parser.error("a history file is required unless --synthesize is given")
+
+    load_start = time.time()
+    jobs, agents = load_history(args.history, args.start, args.end)
+    load_seconds = time.time() - load_start
+    mark_recorded_locality(jobs)
+    print(f"Loaded {len(jobs)} jobs and {len(agents)} agents in {load_seconds:.1f}s.")
+
+    policies = sorted(POLICIES) if not args.policy or 'all' in args.policy else args.policy
+    results = [recorded_metrics(jobs, agents)]
+    for policy in policies:
+        replay_start = time.time()
+        metrics = ReplaySimulation(jobs, agents, policy, args.agent_gap, args.locality_saving).run()
+        metrics["replay_seconds"] = round(time.time() - replay_start, 3)
+        results.append(metrics)
+
+    print(f"{'policy':<10} {'finished':>9} {'makespan':>12} {'mean wait':>11} {'p95 wait':>11} {'p99 wait':>11} "
+          f"{'p99 turn':>11} {'util':>7}")
+    for metrics in results:
+        wait, turnaround = metrics.get('wait_seconds') or {}, metrics.get('turnaround_seconds') or {}
+        print(f"{metrics['policy']:<10} {metrics.get('finished', 0):>9} {metrics.get('makespan_seconds', 0):>12.0f} {wait.get('mean', 0):>11.1f} "
+              f"{wait.get('p95', 0):>11.1f} {wait.get('p99', 0):>11.1f} {turnaround.get('p99', 0):>11.1f} "
+              f"{metrics.get('utilization') or 0:>7.3f}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({"history": args.history, "load_seconds": round(load_seconds, 3),
+                       "agent_gap": args.agent_gap, "locality_saving": args.locality_saving,
+                       "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,180 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SIMULATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_PATH = os.path.join(os.path.dirname(SIMULATOR_DIR), "VirtualPlates.uproject")
+FAKE_EDITOR = os.path.join(SIMULATOR_DIR, "fake_editor.py")
+EXECUTOR_DIR = os.path.join(os.path.dirname(SIMULATOR_DIR), "Plugins", "VirtualPlateRender", "Content", "Python")
+
+
+def run_executor(work_dir, job_data, resume=False, **sim_config):
+    """
+    Runs RealisVirtualPlateRenderExecutor on job_data in fake_editor, with
+    UNREAL_SIM_<KEY> settings from sim_config. Returns the exit code, the
+    editor's log and the statuses the executor wrote.
+    """
+    job_path = os.path.join(work_dir, "job.json")
+    progress_path = os.path.join(work_dir, "job.stat")
+    with open(job_path, 'w') as f:
+        json.dump(dict({"job_id": "job", "sequence_path": "/Game/Seq/Shot.Shot", "level_path": "/Game/Level",
+                        "resolution": [64, 32], "output_path": os.path.join(work_dir, "out")}, **job_data), f)
+    env = dict(os.environ, UNREAL_SIM_FRAME_TIME="0", UNREAL_SIM_WARMUP_FRAMES="1", UNREAL_SIM_TICK_INTERVAL="0",
+               UNREAL_SIM_TIMEOUT="30")
+    env.update({f"UNREAL_SIM_{key.upper()}": json.dumps(value) for key, value in sim_config.items()})
+    command = [sys.executable, FAKE_EDITOR, PROJECT_PATH,
+               "-ExecutorPythonClass=/Engine/PythonTypes.RealisVirtualPlateRenderExecutor",
+               f"-JobPath={job_path}", "-GraphPath=/Game/MRG_DefaultPlateConfig", f"-ProgressFile={progress_path}",
+               f"-LedgerFile={os.path.join(work_dir, 'job.ledger')}"] + (["-Resume"] if resume else [])
+    result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=60)
+    statuses = []
+    if os.path.exists(progress_path):
+        with open(progress_path) as f:
+            statuses = [json.loads(line) for line in f if line.strip()]
+    return result.returncode, result.stdout + result.stderr, statuses
+
+
+def output_frames(output_dir):
+    """Frame numbers written under output_dir."""
+    frames = set()
+    for _, _, file_names in os.walk(output_dir):
+        frames.update(int(file_name.split('.')[-2]) for file_name in file_names)
+    return frames
+
+
+def frame_cameras(output_dir):
+    """Frame file name -> the camera the simulator shot it through."""
+    cameras = {}
+    for file_name in sorted(os.listdir(output_dir)):
+        with open(os.path.join(output_dir, file_name), 'rb') as f:
+            cameras[file_name] = f.read()[4:].split(b'\0', 1)[0].decode()
+    return cameras
+
+
+class ConsoleVariableTests(unittest.TestCase):
+
+    def test_numeric_cvars_reach_the_pipeline(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"console_variable_overrides": {"r.ScreenPercentage": 50}})
+        self.assertEqual(exit_code, 0, log)
+        self.assertIn("Console variable r.ScreenPercentage = 50.0", log)
+        self.assertEqual(statuses[-1]["status"], "Completed")
+
+
+class FrameWindowTests(unittest.TestCase):
+
+    def test_frame_range_narrows_the_playback_range(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"frame_range": [5, 9]})
+            self.assertEqual(exit_code, 0, log)
+            self.assertEqual(output_frames(os.path.join(work_dir, "out")), set(range(5, 10)))
+        self.assertEqual(statuses[-1]["status"], "Completed")
+
+    def test_frame_set_renders_only_its_runs(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"frame_set": [2, 3, 4, 10, 11]})
+            self.assertEqual(exit_code, 0, log)
+            self.assertEqual(output_frames(os.path.join(work_dir, "out")), {2, 3, 4, 10, 11})
+
+    def test_exposed_frame_variables_are_used(self):
+        graph_variables = ["Output path", "Resolution", "StartFrame", "EndFrame"]
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"frame_range": [5, 9]}, graph_variables=graph_variables,
+                                                    lock_sequences=True)
+            self.assertEqual(exit_code, 0, log)
+            self.assertEqual(output_frames(os.path.join(work_dir, "out")), set(range(5, 10)))
+
+    def test_frame_range_that_cannot_be_applied_fails_the_job(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"frame_range": [5, 9]}, lock_sequences=True)
+            self.assertNotEqual(exit_code, 0)
+            self.assertFalse(os.path.exists(os.path.join(work_dir, "out")))
+        self.assertEqual(statuses[-1]["status"], "Error")
+        self.assertIn("5-9", statuses[-1]["reason"])
+
+
+
+class CameraTests(unittest.TestCase):
+
+    def test_each_camera_pass_renders_through_its_camera(self):
+        # The default graph has no CameraName variable, like MRG_DefaultPlateConfig.
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"camera_actor_names": ["CamA", "CamB"],
+                                                               "frame_range": [0, 2]}, cameras=["CamA", "CamB"])
+            self.assertEqual(exit_code, 0, log)
+            for camera in ("CamA", "CamB"):
+                cameras = frame_cameras(os.path.join(work_dir, "out", camera))
+                self.assertEqual(len(cameras), 3)
+                self.assertEqual(set(cameras.values()), {camera})
+        self.assertEqual(statuses[-1]["status"], "Completed")
+
+    def test_camera_without_a_binding_fails_the_job(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"camera_actor_name": "CamC"}, cameras=["CamA", "CamB"])
+            self.assertNotEqual(exit_code, 0)
+            self.assertFalse(os.path.exists(os.path.join(work_dir, "out")))
+        self.assertEqual(statuses[-1]["status"], "Error")
+        self.assertIn("CamC", statuses[-1]["reason"])
+
+    def test_tile_job_renders_through_its_camera(self):
+        tile = {"rect": [0, 0, 32, 32], "full_resolution": [64, 32]}
+        with tempfile.TemporaryDirectory() as work_dir:
+            exit_code, log, statuses = run_executor(work_dir, {"camera_actor_name": "CamB", "tile": tile},
+                                                    cameras=["CamA", "CamB"])
+            self.assertEqual(exit_code, 0, log)
+            self.assertEqual(set(frame_cameras(os.path.join(work_dir, "out")).values()), {"CamB"})
+        self.assertIn("Rendering tile [0, 0, 32, 32] of 64x32.", log)
+
+
+class ResumeTests(unittest.TestCase):
+
+    def run_crashed_job(self, work_dir, **sim_config):
+        """Crashes a whole-sequence job at frame 12, then resumes it. Returns the resumed run's Initializing status."""
+        exit_code, log, _ = run_executor(work_dir, {}, crash_at_frame=12, **sim_config)
+        self.assertNotEqual(exit_code, 0)
+        exit_code, log, statuses = run_executor(work_dir, {}, resume=True, crash_at_frame=12, **sim_config)
+        self.assertEqual(exit_code, 0, log)
+        self.assertEqual(output_frames(os.path.join(work_dir, "out")), set(range(24)))
+        self.assertEqual(statuses[-1]["status"], "Completed")
+        return [status for status in statuses if status["status"] == "Initializing"][-1]
+
+    def test_resume_starts_at_the_first_missing_frame(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            status = self.run_crashed_job(work_dir)
+        self.assertEqual(status["resumed_from_frame"], 12)
+        self.assertIsNone(status["restart_reason"])
+
+    def test_resume_that_cannot_be_applied_restarts_and_says_so(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            status = self.run_crashed_job(work_dir, lock_sequences=True)
+        self.assertIsNone(status["resumed_from_frame"])
+        self.assertIn("frame 12", status["restart_reason"])
+
+
+
+class ReporterTests(unittest.TestCase):
+
+    def test_reporter_dropped_by_the_engine_is_rebuilt(self):
+        sys.path.insert(0, EXECUTOR_DIR)
+        try:
+            from RealisVirtualPlateRenderExecutor import RealisVirtualPlateRenderExecutor
+        finally:
+            sys.path.remove(EXECUTOR_DIR)
+        with tempfile.TemporaryDirectory() as work_dir:
+            executor = RealisVirtualPlateRenderExecutor()
+            executor.progress_file_path = os.path.join(work_dir, "job.stat")
+            executor.write_status({"status": "Initializing"})
+            del executor.reporter # Plain attributes do not survive the executor's lifecycle in the engine
+            executor.write_status({"status": "Rendering"})
+            executor.close_reporter()
+            executor.write_status({"status": "Late"})
+            with open(executor.progress_file_path) as f:
+                statuses = [json.loads(line)["status"] for line in f]
+        self.assertEqual(statuses, ["Initializing", "Rendering"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+"""
+An offline stand-in for the engine's `unreal` Python module. It implements
+the slice of the Movie Render Pipeline API that RealisVirtualPlateRenderExecutor
+and RealisPlateRenderSetup use (see ue_executor.py for the real surface), so
+the agent and executor control plane can be run and benchmarked on machines
+without Unreal. Frames are simulated, not rendered.
+"""
+from .core import (log, log_warning, log_error, uproperty, uclass, ufunction, find_class, new_object,
+                   Object, SoftObjectPath, DirectoryPath, FrameNumber, MoviePipelineOutputData, Delegate)
+from .engine import SimEngine, get_engine, start_engine, load_config
+from .world import (Actor, SceneSettingsActor, CineCameraActor, CineCameraComponent, CameraFilmbackSettings, World,
+                    GameplayStatics, EditorActorSubsystem, SystemLibrary, get_editor_subsystem, get_engine_subsystem)
+from .movie_pipeline import (MovieRenderPipelineState, MovieGraphVariable, MovieGraphConfig, MovieGraphInitConfig,
+                             MovieJobVariableAssignmentContainer, MoviePipelineConsoleVariableEntry,
+                             MoviePipelineExecutorJob, MoviePipelineQueue,
+                             MoviePipelineBase, MoviePipeline, MovieGraphPipeline, MovieGraphLibrary,
+                             MoviePipelineExecutorBase, MoviePipelineLinearExecutorBase,
+                             MoviePipelinePythonHostExecutor, MoviePipelinePIEExecutor, MoviePipelineQueueSubsystem,
+                             load_asset)
+from .sequencer import (LevelSequence, MovieSceneBindingProxy, MovieSceneObjectBindingID,
+                        MovieSceneCameraCutTrack, MovieSceneCameraCutSection)
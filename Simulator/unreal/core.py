@@ -0,0 +1,188 @@
+import sys
+import time
+
+# Classes decorated with @uclass, by name, so the fake editor can resolve -ExecutorPythonClass.
+_registered_classes = {}
+
+
+# --- Logging ---
+# Mirrors the engine's LogPython category so simulator output reads like a real editor log.
+
+def _write_log(verbosity, message):
+    prefix = f"LogPython: {verbosity}: " if verbosity else "LogPython: "
+    sys.stdout.write(f"[{time.strftime('%Y.%m.%d-%H.%M.%S')}]{prefix}{message}\n")
+    sys.stdout.flush()
+
+def log(message):
+    _write_log(None, message)
+
+def log_warning(message):
+    _write_log("Warning", message)
+
+def log_error(message):
+    _write_log("Error", message)
+
+
+# --- Reflection Decorators ---
+
+_PROPERTY_DEFAULTS = {str: "", int: 0, float: 0.0, bool: False}
+
+class _UProperty:
+    """Per-instance storage with the engine's zero value as default, like a reflected UPROPERTY."""
+    def __init__(self, property_type):
+        self.default = _PROPERTY_DEFAULTS.get(property_type)
+
+    def __set_name__(self, owner, name):
+        self.storage_name = f"_uproperty_{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self.storage_name, self.default)
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.storage_name] = value
+
+
+def uproperty(property_type, meta=None):
+    return _UProperty(property_type)
+
+
+def uclass():
+    def register(cls):
+        _registered_classes[cls.__name__] = cls
+        return cls
+    return register
+
+
+def ufunction(**kwargs):
+    def decorate(function):
+        return function
+    return decorate
+
+
+def find_class(name):
+    """Returns a class registered with @uclass, or None."""
+    return _registered_classes.get(name)
+
+
+# --- Objects ---
+
+class _Class:
+    """What Object.get_class() returns; only the name is meaningful here."""
+    def __init__(self, cls):
+        self.cls = cls
+
+    def get_name(self):
+        return getattr(self.cls, 'UNREAL_CLASS_NAME', self.cls.__name__)
+
+
+class Object:
+    """
+    Base of every simulated UObject. Subclasses set up their own state before
+    calling this constructor, so _post_init (the hook Python UClasses use in
+    the engine) sees a fully built base object.
+    """
+    _object_counter = 0
+
+    def __init__(self, outer=None, name=None):
+        Object._object_counter += 1
+        self._outer = outer
+        self._name = name or f"{type(self).__name__}_{Object._object_counter}"
+        post_init = getattr(self, '_post_init', None)
+        if post_init:
+            post_init()
+
+    def get_name(self):
+        return self._name
+
+    def get_path_name(self):
+        outer_path = self._outer.get_path_name() if isinstance(self._outer, Object) else "/Sim"
+        return f"{outer_path}.{self._name}"
+
+    def get_outer(self):
+        return self._outer
+
+    def get_class(self):
+        return _Class(type(self))
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+    def set_editor_property(self, name, value, notify_mode=None):
+        setattr(self, name, value)
+
+
+def new_object(cls, outer=None, name=None):
+    return cls(outer=outer, name=name)
+
+
+# --- Structs ---
+
+class SoftObjectPath:
+    def __init__(self, path=""):
+        self.path = str(path)
+
+    def export_text(self):
+        return self.path
+
+    def asset_name(self):
+        """'/Game/Seq/Shot01.Shot01' -> 'Shot01'."""
+        return self.path.rsplit('/', 1)[-1].split('.', 1)[0]
+
+
+class DirectoryPath:
+    def __init__(self, path=""):
+        self.path = path
+
+    def export_text(self):
+        return f'(Path="{self.path}")'
+
+
+class FrameNumber:
+    def __init__(self, value=0):
+        self.value = value
+
+
+class MoviePipelineOutputData:
+    def __init__(self, success=True, job=None, pipeline=None):
+        self.success = success
+        self.job = job
+        self.pipeline = pipeline
+
+
+# --- Delegates ---
+
+class Delegate:
+    """A multicast delegate. Bound functions and callables are invoked in the order they were added."""
+    def __init__(self):
+        self._bindings = []
+
+    def add_function_unique(self, obj, function_name):
+        binding = ('function', obj, function_name)
+        if binding not in self._bindings:
+            self._bindings.append(binding)
+
+    def add_function(self, obj, function_name):
+        self._bindings.append(('function', obj, function_name))
+
+    def add_callable_unique(self, callable_object):
+        binding = ('callable', None, callable_object)
+        if binding not in self._bindings:
+            self._bindings.append(binding)
+
+    def add_callable(self, callable_object):
+        self._bindings.append(('callable', None, callable_object))
+
+    def remove_all(self, obj):
+        self._bindings = [b for b in self._bindings if b[1] is not obj]
+
+    def clear(self):
+        self._bindings = []
+
+    def broadcast(self, *args):
+        for kind, obj, target in list(self._bindings):
+            if kind == 'function':
+                getattr(obj, target)(*args)
+            else:
+                target(*args)
@@ -0,0 +1,132 @@
+import json
+import os
+import time
+
+# Defaults for a simulated render. Override with a JSON file named by UNREAL_SIM_CONFIG,
+# and/or individual UNREAL_SIM_<KEY> environment variables holding JSON values.
+DEFAULT_CONFIG = {
+    "tick_interval": 0.01,                # Seconds between engine ticks (on_begin_frame calls)
+    "startup_time": 0.0,                  # Simulated editor boot and map load before the executor starts
+    "warmup_frames": 2,                   # Ticks spent initializing before frames are produced
+    "frame_time": 0.05,                   # Seconds to render one output frame...
+    "frame_time_per_megapixel": 0.0,      # ...plus this much per megapixel of the Resolution variable
+    "frame_range": [0, 23],               # Initial playback range of every simulated sequence (inclusive)
+    "write_frames": True,                 # Write a small placeholder file per frame to the Output path
+    "output_extension": "exr",
+    "frame_bytes": 1024,
+    "crash_at_frame": None,               # Exit abruptly (as a crash) when this frame is reached, unless -Resume
+    "fail_at_frame": None,                # Finish the pipeline with success=False at this frame
+    "graph_variables": ["Output path", "Resolution"], # As exposed by MRG_DefaultPlateConfig
+    "lock_sequences": False,              # Ignore playback range changes, as a locked sequence does
+    "cameras": ["CineCameraActor"],       # Cine cameras placed in every level and bound in every sequence; the first is cut to
+    "scene_settings_actor": True          # Place a BP_SceneSettings actor tagged 'SceneSettings'
+}
+
+# Exit code used for a simulated crash, as seen by the agent.
+CRASH_EXIT_CODE = 3
+
+
+def load_config():
+    config = dict(DEFAULT_CONFIG)
+    config_path = os.environ.get('UNREAL_SIM_CONFIG')
+    if config_path:
+        with open(config_path, 'r') as f:
+            config.update(json.load(f))
+    for key in DEFAULT_CONFIG:
+        value = os.environ.get(f"UNREAL_SIM_{key.upper()}")
+        if value is not None:
+            config[key] = json.loads(value)
+    return config
+
+
+class SimEngine:
+    """
+    The simulated engine loop. Every tick it calls on_begin_frame on the
+    registered executors, then advances the active pipelines, until something
+    requests an exit (quit_editor, an executor finishing, or a crash).
+    """
+    def __init__(self, config=None, command_line=""):
+        self.config = config or load_config()
+        self.command_line = command_line
+        self.executors = []
+        self.pipelines = []
+        self.subsystems = {}
+        self.exit_code = None
+        self.frame_counter = 0
+        self.world = None
+        self.console_variables = {} # Set by console commands and job cvar overrides; recorded, not simulated
+        self.sequences = {} # Loaded level sequences by package path, see sequencer.load_sequence
+
+    # --- Public Methods ---
+
+    def load_map(self, map_path="/Game/SimMap"):
+        """Creates the simulated world the executor renders in."""
+        from .world import World
+        time.sleep(self.config["startup_time"])
+        self.world = World(map_path, self.config)
+        return self.world
+
+    def set_console_variable(self, name, value):
+        from .core import log
+        self.console_variables[name] = value
+        log(f"Simulator: Console variable {name} = {value}")
+
+    def add_executor(self, executor):
+        if executor not in self.executors:
+            self.executors.append(executor)
+
+    def add_pipeline(self, pipeline):
+        self.pipelines.append(pipeline)
+
+    def request_exit(self, exit_code=0):
+        if self.exit_code is None:
+            self.exit_code = exit_code
+
+    def crash(self):
+        """Ends the process the way a crashing editor would: immediately, with no cleanup."""
+        import sys
+        sys.stdout.flush()
+        os._exit(CRASH_EXIT_CODE)
+
+    def tick(self):
+        self.frame_counter += 1
+        for executor in list(self.executors):
+            executor.on_begin_frame()
+        for pipeline in list(self.pipelines):
+            pipeline._tick()
+        self.pipelines = [p for p in self.pipelines if not p._is_done()]
+
+    def run(self, timeout=None):
+        """Ticks until an exit is requested. Returns the process exit code."""
+        started_at = time.time()
+        interval = self.config["tick_interval"]
+        next_tick = time.time()
+        while self.exit_code is None:
+            if timeout is not None and time.time() - started_at > timeout:
+                from .core import log_error
+                log_error(f"Simulator: Timed out after {timeout} seconds.")
+                return 1
+            self.tick()
+            next_tick += interval
+            delay = next_tick - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.time() # Fell behind; don't try to catch up with a burst of ticks
+        return self.exit_code
+
+
+_engine = None
+
+def get_engine():
+    """The running engine; created with the default config on first use so `import unreal` alone works."""
+    global _engine
+    if _engine is None:
+        _engine = SimEngine()
+    return _engine
+
+
+def start_engine(command_line="", config=None):
+    global _engine
+    _engine = SimEngine(config, command_line)
+    return _engine
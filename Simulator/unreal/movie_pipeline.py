@@ -0,0 +1,504 @@
+import os
+import re
+import time
+from .core import Object, Delegate, FrameNumber, MoviePipelineOutputData, log, log_error
+from .engine import get_engine
+from .world import SystemLibrary
+from .sequencer import LevelSequence, load_sequence
+
+# Leading bytes written into placeholder frames, so output verification sees a valid header.
+PLACEHOLDER_HEADERS = {
+    'exr': b'\x76\x2f\x31\x01', 'png': b'\x89PNG\r\n\x1a\n', 'jpg': b'\xff\xd8\xff', 'bmp': b'BM', 'tif': b'II*\x00'
+}
+
+
+class MovieRenderPipelineState:
+    UNINITIALIZED = 0
+    PRODUCING_FRAMES = 1
+    FINALIZE = 2
+    EXPORT = 3
+    FINISHED = 4
+
+
+# --- Graph Configuration ---
+
+class MovieGraphVariable(Object):
+    def get_member_name(self):
+        return self.get_name()
+
+
+class MovieGraphConfig(Object):
+    """A graph asset exposing the variables listed in the simulator config."""
+    def __init__(self, outer=None, name=None, variable_names=()):
+        self._variables = {}
+        super().__init__(outer, name)
+        for variable_name in variable_names:
+            self._variables[variable_name] = MovieGraphVariable(outer=self, name=variable_name)
+
+    def get_variable_by_name(self, name):
+        return self._variables.get(name)
+
+    def get_variables(self):
+        return list(self._variables.values())
+
+
+class MovieGraphInitConfig(Object):
+    pass
+
+
+class MovieJobVariableAssignmentContainer(Object):
+    def __init__(self, outer=None, name=None, graph=None):
+        self.graph = graph
+        self._enabled = {}
+        self._values = {}
+        super().__init__(outer, name)
+
+    def set_variable_assignment_enable_state(self, graph_variable, is_enabled):
+        self._enabled[graph_variable.get_name()] = bool(is_enabled)
+        return True
+
+    def get_variable_assignment_enable_state(self, graph_variable):
+        return self._enabled.get(graph_variable.get_name(), False)
+
+    def set_value_serialized_string(self, graph_variable, new_value):
+        self._values[graph_variable.get_name()] = new_value
+        return True
+
+    def get_value_serialized_string(self, graph_variable):
+        return self._values.get(graph_variable.get_name(), "")
+
+    def get_enabled_value(self, variable_name):
+        """Simulator helper: the overridden value of a variable, or None when it is not enabled."""
+        if not self._enabled.get(variable_name):
+            return None
+        return self._values.get(variable_name)
+
+
+def load_asset(name, asset_class=None, follow_redirectors=True):
+    """
+    Level sequence paths resolve to the process's copy of that sequence; every
+    other path resolves to a graph config exposing the configured variables.
+    """
+    if asset_class is LevelSequence:
+        return load_sequence(name)
+    if asset_class is not None and asset_class is not MovieGraphConfig:
+        return None
+    return MovieGraphConfig(name=name, variable_names=get_engine().config["graph_variables"])
+
+
+# --- Queue ---
+
+class MoviePipelineConsoleVariableEntry:
+    """
+    A struct whose fields are BlueprintReadOnly: Python can read them, but
+    must set them with set_editor_property, as in the engine.
+    """
+    _READ_ONLY_FIELDS = ("name", "value", "is_enabled")
+
+    def __init__(self, name="", value=0.0, is_enabled=True):
+        self.__dict__.update(name=name, value=value, is_enabled=is_enabled)
+
+    def __setattr__(self, name, value):
+        if name in self._READ_ONLY_FIELDS:
+            raise Exception(f"Property '{name}' for attribute '{name}' on 'MoviePipelineConsoleVariableEntry' "
+                            "is read-only and cannot be set")
+        super().__setattr__(name, value)
+
+    def get_editor_property(self, name):
+        return getattr(self, name)
+
+    def set_editor_property(self, name, value, notify_mode=None):
+        if name not in self._READ_ONLY_FIELDS:
+            raise Exception(f"Failed to find property '{name}' for attribute '{name}' on 'MoviePipelineConsoleVariableEntry'")
+        self.__dict__[name] = value
+
+
+class MoviePipelineExecutorJob(Object):
+    def __init__(self, outer=None, name=None):
+        self.job_name = ""
+        self.console_variable_overrides = []
+        self.sequence = None
+        self.map = None
+        self.author = ""
+        self.comment = ""
+        self.user_data = ""
+        self._graph_preset = None
+        self._variable_overrides = {}
+        self._enabled = True
+        self._consumed = False
+        self._status_message = ""
+        self._status_progress = 0.0
+        super().__init__(outer, name)
+
+    def set_graph_preset(self, graph_preset, update_variable_assignments=True):
+        self._graph_preset = graph_preset
+
+    def get_graph_preset(self):
+        return self._graph_preset
+
+    def is_using_graph_configuration(self):
+        return self._graph_preset is not None
+
+    def get_or_create_variable_overrides(self, graph):
+        key = graph.get_name()
+        if key not in self._variable_overrides:
+            self._variable_overrides[key] = MovieJobVariableAssignmentContainer(outer=self, graph=graph)
+        return self._variable_overrides[key]
+
+    def set_is_enabled(self, enabled):
+        self._enabled = enabled
+
+    def is_enabled(self):
+        return self._enabled
+
+    def set_consumed(self, consumed):
+        self._consumed = consumed
+
+    def is_consumed(self):
+        return self._consumed
+
+    def set_status_message(self, status):
+        self._status_message = status
+
+    def get_status_message(self):
+        return self._status_message
+
+    def set_status_progress(self, progress):
+        self._status_progress = progress
+
+    def get_status_progress(self):
+        return self._status_progress
+
+
+class MoviePipelineQueue(Object):
+    def __init__(self, outer=None, name=None):
+        self._jobs = []
+        super().__init__(outer, name)
+
+    def allocate_new_job(self, job_type=None):
+        job = (job_type or MoviePipelineExecutorJob)(outer=self)
+        self._jobs.append(job)
+        return job
+
+    def delete_job(self, job):
+        if job in self._jobs:
+            self._jobs.remove(job)
+
+    def delete_all_jobs(self):
+        self._jobs = []
+
+    def get_jobs(self):
+        return list(self._jobs)
+
+
+# --- Pipelines ---
+
+class MoviePipelineBase(Object):
+    pass
+
+
+class MoviePipeline(MoviePipelineBase):
+    pass
+
+
+class MovieGraphPipeline(MoviePipelineBase):
+    """
+    Plays a job's frame range at the configured frame time. Reads the exposed
+    graph variables the way the real graph would consume them: Output path,
+    Resolution (for the frame time), StartFrame/EndFrame and FileNameFormat.
+    Without StartFrame/EndFrame the sequence's playback range is rendered, and
+    frames are shot through the camera its camera cut is bound to.
+    """
+    def __init__(self, outer=None, name=None):
+        self.on_movie_pipeline_work_finished_delegate = Delegate()
+        self.on_movie_pipeline_shot_work_finished_delegate = Delegate()
+        self._job = None
+        self._state = MovieRenderPipelineState.UNINITIALIZED
+        self._frames = []
+        self._frame_index = 0
+        self._warmup_remaining = 0
+        self._frame_started_at = None
+        self._output_dir = None
+        self._file_name_format = None
+        self._camera_name = None
+        self._frame_seconds = 0.0
+        self._shutdown_requested = False
+        super().__init__(outer, name)
+
+    # --- Public Methods ---
+
+    def initialize(self, job, init_config=None):
+        engine = get_engine()
+        config = engine.config
+        self._job = job
+        overrides = job.get_or_create_variable_overrides(job.get_graph_preset()) if job.get_graph_preset() else None
+
+        def variable(name):
+            return overrides.get_enabled_value(name) if overrides else None
+
+        sequence = load_sequence(job.sequence.path) if job.sequence else None
+        if sequence:
+            first, last = sequence.get_playback_start(), sequence.get_playback_end() - 1
+            self._camera_name = sequence.get_camera_cut_binding_name()
+        else:
+            first, last = config["frame_range"]
+        if variable("StartFrame") is not None:
+            first = int(variable("StartFrame"))
+        if variable("EndFrame") is not None:
+            last = int(variable("EndFrame"))
+        self._frames = list(range(first, last + 1))
+
+        # RealisPlateRenderSetup's graph names the same setting 'OutputDirectory'.
+        output_variable = variable("Output path") or variable("OutputDirectory")
+        path_match = re.search(r'Path="([^"]*)"', output_variable or "")
+        self._output_dir = path_match.group(1) if path_match else output_variable
+        self._file_name_format = variable("FileNameFormat") or "{sequence_name}.{frame_number}"
+
+        megapixels = 0.0
+        resolution_match = re.search(r'Resolution=\(X=(\d+),Y=(\d+)\)', variable("Resolution") or "")
+        if resolution_match:
+            megapixels = int(resolution_match.group(1)) * int(resolution_match.group(2)) / 1e6
+        self._frame_seconds = config["frame_time"] + config["frame_time_per_megapixel"] * megapixels
+
+        for entry in job.console_variable_overrides:
+            if entry.is_enabled:
+                engine.set_console_variable(entry.name, entry.value)
+
+        self._warmup_remaining = config["warmup_frames"]
+        self._state = MovieRenderPipelineState.UNINITIALIZED
+        log(f"Simulator: Initializing MovieGraph render of {job.job_name}, frames {first}-{last}, camera {self._camera_name}.")
+        engine.add_pipeline(self)
+
+    def get_pipeline_state(self):
+        return self._state
+
+    def get_current_job(self):
+        return self._job
+
+    def request_shutdown(self, is_error=False):
+        self._shutdown_requested = True
+
+    def is_shutdown_requested(self):
+        return self._shutdown_requested
+
+    def shutdown(self, error=False):
+        self._finish(not error)
+
+    # --- Simulation ---
+
+    def _current_frame(self):
+        if not self._frames:
+            return 0
+        return self._frames[min(self._frame_index, len(self._frames) - 1)]
+
+    def _is_done(self):
+        return self._state == MovieRenderPipelineState.FINISHED
+
+    def _tick(self):
+        config = get_engine().config
+        if self._state == MovieRenderPipelineState.UNINITIALIZED:
+            self._warmup_remaining -= 1
+            if self._warmup_remaining <= 0:
+                self._state = MovieRenderPipelineState.PRODUCING_FRAMES
+                self._frame_started_at = time.time()
+        elif self._state == MovieRenderPipelineState.PRODUCING_FRAMES:
+            if self._shutdown_requested:
+                self._finish(False)
+                return
+            if self._frame_index >= len(self._frames):
+                self._state = MovieRenderPipelineState.FINALIZE
+                return
+            frame = self._current_frame()
+            if frame == config["crash_at_frame"] and 'Resume' not in SystemLibrary.parse_command_line(get_engine().command_line)[1]:
+                log_error(f"Simulator: Simulated crash at frame {frame}.")
+                get_engine().crash()
+            if frame == config["fail_at_frame"]:
+                log_error(f"Simulator: Simulated pipeline failure at frame {frame}.")
+                self._finish(False)
+                return
+            if time.time() - self._frame_started_at >= self._frame_seconds:
+                self._write_frame(frame)
+                self._frame_index += 1
+                self._frame_started_at = time.time()
+        elif self._state == MovieRenderPipelineState.FINALIZE:
+            self._state = MovieRenderPipelineState.EXPORT
+        elif self._state == MovieRenderPipelineState.EXPORT:
+            self._finish(True)
+
+    def _write_frame(self, frame):
+        config = get_engine().config
+        if not config["write_frames"] or not self._output_dir:
+            return
+        sequence_name = self._job.sequence.asset_name() if self._job.sequence else "Sequence"
+        file_name = (self._file_name_format.replace("{sequence_name}", sequence_name)
+                     .replace("{frame_number}", f"{frame:04d}"))
+        file_name = re.sub(r'\{[^}]*\}', '', file_name) + "." + config["output_extension"]
+        os.makedirs(self._output_dir, exist_ok=True)
+        # The camera's name follows the header, so tests can tell which camera a frame was shot through.
+        header = PLACEHOLDER_HEADERS.get(config["output_extension"], b'') + (self._camera_name or "").encode() + b'\0'
+        with open(os.path.join(self._output_dir, file_name), 'wb') as f:
+            f.write(header + b'\0' * max(0, config["frame_bytes"] - len(header)))
+
+    def _finish(self, success):
+        self._state = MovieRenderPipelineState.FINISHED
+        log(f"Simulator: MovieGraph render of {self._job.job_name} finished (success={success}).")
+        self.on_movie_pipeline_work_finished_delegate.broadcast(MoviePipelineOutputData(success, self._job, self))
+
+
+class MovieGraphLibrary:
+    @staticmethod
+    def get_completion_percentage(movie_pipeline):
+        frames = movie_pipeline._frames
+        if movie_pipeline._state >= MovieRenderPipelineState.FINALIZE:
+            return 1.0
+        return movie_pipeline._frame_index / len(frames) if frames else 0.0
+
+    @staticmethod
+    def get_current_shot_frame_number(movie_pipeline):
+        return FrameNumber(movie_pipeline._current_frame())
+
+    @staticmethod
+    def get_overall_output_frames(movie_pipeline):
+        """:return: (frames output so far, total frames), as the out parameters of the real function."""
+        return min(movie_pipeline._frame_index, len(movie_pipeline._frames)), len(movie_pipeline._frames)
+
+    @staticmethod
+    def get_pipeline_state(movie_pipeline):
+        return movie_pipeline.get_pipeline_state()
+
+
+# --- Executors ---
+
+class MoviePipelineExecutorBase(Object):
+    def __init__(self, outer=None, name=None):
+        self.on_executor_finished_delegate = Delegate()
+        self.on_executor_errored_delegate = Delegate()
+        self.target_pipeline_class = MovieGraphPipeline
+        self.user_data = ""
+        self._status_message = ""
+        self._status_progress = 0.0
+        self._had_fatal_error = False
+        super().__init__(outer, name)
+
+    def on_begin_frame(self):
+        pass
+
+    def execute(self, pipeline_queue):
+        pass
+
+    def is_rendering(self):
+        return False
+
+    def set_status_message(self, status):
+        self._status_message = status
+
+    def get_status_message(self):
+        return self._status_message
+
+    def set_status_progress(self, progress):
+        self._status_progress = progress
+
+    def get_status_progress(self):
+        return self._status_progress
+
+    def on_executor_finished_impl(self):
+        self.on_executor_finished_delegate.broadcast(self, not self._had_fatal_error)
+
+    def on_executor_errored_impl(self, errored_pipeline, fatal, error_reason):
+        log_error(f"Simulator: Executor error (fatal={fatal}): {error_reason}")
+        if fatal:
+            self._had_fatal_error = True
+        self.on_executor_errored_delegate.broadcast(self, errored_pipeline, fatal, error_reason)
+
+    def on_executor_errored(self, errored_pipeline, fatal, error_reason):
+        self.on_executor_errored_impl(errored_pipeline, fatal, error_reason)
+
+    def cancel_current_job(self):
+        pass
+
+    def cancel_all_jobs(self):
+        pass
+
+
+class MoviePipelineLinearExecutorBase(MoviePipelineExecutorBase):
+    def __init__(self, outer=None, name=None):
+        self.pipeline_queue = None
+        super().__init__(outer, name)
+
+    def get_last_loaded_world(self):
+        return get_engine().world
+
+    def on_map_load(self, world):
+        pass
+
+    def execute_delayed(self, pipeline_queue):
+        pass
+
+
+class MoviePipelinePythonHostExecutor(MoviePipelineLinearExecutorBase):
+    """Ends the process when the Python executor reports it is finished, or on a fatal error."""
+    def on_executor_finished_impl(self):
+        super().on_executor_finished_impl()
+        get_engine().request_exit(1 if self._had_fatal_error else 0)
+
+    def on_executor_errored_impl(self, errored_pipeline, fatal, error_reason):
+        super().on_executor_errored_impl(errored_pipeline, fatal, error_reason)
+        if fatal:
+            get_engine().request_exit(1)
+
+
+class MoviePipelinePIEExecutor(MoviePipelineLinearExecutorBase):
+    """Renders every job in the queue one after another, then broadcasts on_executor_finished_delegate."""
+    def __init__(self, outer=None, name=None):
+        self._pending_jobs = []
+        self._active_pipeline = None
+        super().__init__(outer, name)
+
+    def execute(self, pipeline_queue):
+        self.pipeline_queue = pipeline_queue
+        self._pending_jobs = [job for job in pipeline_queue.get_jobs() if job.is_enabled()]
+        self._start_next_job()
+
+    def is_rendering(self):
+        return self._active_pipeline is not None
+
+    def _start_next_job(self):
+        if not self._pending_jobs:
+            self._active_pipeline = None
+            self.on_executor_finished_impl()
+            return
+        job = self._pending_jobs.pop(0)
+        self._active_pipeline = self.target_pipeline_class(outer=get_engine().world)
+        self._active_pipeline.on_movie_pipeline_work_finished_delegate.add_callable(self._on_job_finished)
+        self._active_pipeline.initialize(job, MovieGraphInitConfig())
+
+    def _on_job_finished(self, results):
+        if not results.success:
+            self.on_executor_errored_impl(self._active_pipeline, True, "Pipeline reported failure.")
+        self._start_next_job()
+
+
+class MoviePipelineQueueSubsystem(Object):
+    def __init__(self, outer=None, name=None):
+        self._queue = MoviePipelineQueue(outer=self)
+        self._active_executor = None
+        super().__init__(outer, name)
+
+    def get_queue(self):
+        return self._queue
+
+    def get_active_executor(self):
+        return self._active_executor
+
+    def is_rendering(self):
+        return self._active_executor is not None and self._active_executor.is_rendering()
+
+    def render_queue_with_executor_instance(self, executor):
+        self._active_executor = executor
+        get_engine().add_executor(executor)
+        executor.execute(self._queue)
+
+    def render_queue_with_executor(self, executor_type):
+        executor = executor_type(outer=self)
+        self.render_queue_with_executor_instance(executor)
+        return executor
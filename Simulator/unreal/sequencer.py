@@ -0,0 +1,125 @@
+from .core import Object
+from .engine import get_engine
+
+
+# --- Bindings ---
+
+class MovieSceneObjectBindingID:
+    def __init__(self, guid=""):
+        self.guid = guid
+
+    def __eq__(self, other):
+        return isinstance(other, MovieSceneObjectBindingID) and other.guid == self.guid
+
+    def __hash__(self):
+        return hash(self.guid)
+
+
+class MovieSceneBindingProxy:
+    """A possessable in a sequence, named after the actor it is bound to."""
+    def __init__(self, sequence, name):
+        self.sequence = sequence
+        self._name = name
+
+    def get_name(self):
+        return self._name
+
+    def get_display_name(self):
+        return self._name
+
+
+# --- Tracks ---
+
+class MovieSceneCameraCutSection(Object):
+    def __init__(self, outer=None, name=None, camera_binding_id=None):
+        self._camera_binding_id = camera_binding_id
+        super().__init__(outer, name)
+
+    def get_camera_binding_id(self):
+        return self._camera_binding_id
+
+    def set_camera_binding_id(self, binding_id):
+        self._camera_binding_id = binding_id
+
+
+class MovieSceneCameraCutTrack(Object):
+    def __init__(self, outer=None, name=None):
+        self._sections = []
+        super().__init__(outer, name)
+
+    def add_section(self):
+        section = MovieSceneCameraCutSection(outer=self)
+        self._sections.append(section)
+        return section
+
+    def get_sections(self):
+        return list(self._sections)
+
+
+# --- Sequences ---
+
+class LevelSequence(Object):
+    """
+    A level sequence with one possessable per simulated camera and a camera
+    cut track on the first one. Its playback range is the configured
+    frame_range; like the real pipeline, renders use it unless the graph
+    overrides the range. Frame numbers are in display rate.
+    """
+    def __init__(self, outer=None, name=None):
+        config = get_engine().config
+        self._playback_start, last = config["frame_range"]
+        self._playback_end = last + 1 # Exclusive, as the engine reports it
+        self._bindings = []
+        self._tracks = []
+        super().__init__(outer, name)
+        for label in config.get("cameras", []):
+            self._bindings.append(MovieSceneBindingProxy(self, label))
+        if self._bindings:
+            camera_cut_track = MovieSceneCameraCutTrack(outer=self)
+            camera_cut_track.add_section().set_camera_binding_id(self.get_portable_binding_id(self, self._bindings[0]))
+            self._tracks.append(camera_cut_track)
+
+    def get_playback_start(self):
+        return self._playback_start
+
+    def get_playback_end(self):
+        return self._playback_end
+
+    def set_playback_start(self, start_frame):
+        if not get_engine().config["lock_sequences"]:
+            self._playback_start = int(start_frame)
+
+    def set_playback_end(self, end_frame):
+        if not get_engine().config["lock_sequences"]:
+            self._playback_end = int(end_frame)
+
+    def get_bindings(self):
+        return list(self._bindings)
+
+    def find_binding_by_name(self, name):
+        return next((binding for binding in self._bindings if binding.get_name() == name), None)
+
+    def get_portable_binding_id(self, sequence, binding):
+        return MovieSceneObjectBindingID(f"{self.get_name()}:{binding.get_name()}")
+
+    def find_tracks_by_exact_type(self, track_type):
+        return [track for track in self._tracks if type(track) is track_type]
+
+    def get_camera_cut_binding_name(self):
+        """Simulator helper: the possessable the first camera cut looks through, or None."""
+        for track in self.find_tracks_by_exact_type(MovieSceneCameraCutTrack):
+            for section in track.get_sections():
+                binding_id = section.get_camera_binding_id()
+                for binding in self._bindings:
+                    if self.get_portable_binding_id(self, binding) == binding_id:
+                        return binding.get_name()
+        return None
+
+
+def load_sequence(path):
+    """Loads a sequence once per process, so edits to it are seen by every later load, as in the engine."""
+    engine = get_engine()
+    key = str(path).split('.', 1)[0]
+    if key not in engine.sequences:
+        engine.sequences[key] = LevelSequence(name=key.rsplit('/', 1)[-1] or "Sequence")
+    return engine.sequences[key]
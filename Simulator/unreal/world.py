@@ -0,0 +1,158 @@
+from .core import Object, log
+from .engine import get_engine
+
+
+# --- Actors ---
+
+class Actor(Object):
+    def __init__(self, outer=None, name=None, label=None, tags=None):
+        self.tags = list(tags or [])
+        self._label = label
+        super().__init__(outer, name)
+
+    def get_actor_label(self):
+        return self._label or self.get_name()
+
+    def actor_has_tag(self, tag):
+        return tag in self.tags
+
+
+class SceneSettingsActor(Actor):
+    """The project's BP_SceneSettings actor: scene settings as properties, plus its setter functions."""
+    UNREAL_CLASS_NAME = 'BP_SceneSettings_C'
+
+    def __init__(self, outer=None, name=None, label=None, tags=None):
+        self.time_of_day = 12.0
+        self.cloud_coverage = 0.0
+        self.dirty_settings = False
+        super().__init__(outer, name, label, tags)
+
+    def set_time_of_day(self, value):
+        self.time_of_day = float(value)
+        self.dirty_settings = True
+
+    def set_cloud_coverage(self, value):
+        self.cloud_coverage = float(value)
+        self.dirty_settings = True
+
+
+class CameraFilmbackSettings:
+    def __init__(self, sensor_width=36.0, sensor_height=24.0, sensor_horizontal_offset=0.0, sensor_vertical_offset=0.0):
+        self.sensor_width = sensor_width
+        self.sensor_height = sensor_height
+        self.sensor_horizontal_offset = sensor_horizontal_offset
+        self.sensor_vertical_offset = sensor_vertical_offset
+
+
+class CineCameraComponent(Object):
+    def __init__(self, outer=None, name=None):
+        self.filmback = CameraFilmbackSettings()
+        super().__init__(outer, name)
+
+
+class CineCameraActor(Actor):
+    def __init__(self, outer=None, name=None, label=None, tags=None):
+        self._camera_component = None
+        super().__init__(outer, name, label, tags)
+        self._camera_component = CineCameraComponent(outer=self, name="CameraComponent")
+
+    def get_cine_camera_component(self):
+        return self._camera_component
+
+
+class World(Object):
+    """A loaded level holding the actors described by the simulator config."""
+    def __init__(self, map_path, config):
+        self.map_path = map_path
+        self.actors = []
+        super().__init__(None, map_path.rsplit('/', 1)[-1].split('.', 1)[0] or "SimMap")
+        if config.get("scene_settings_actor"):
+            self.actors.append(SceneSettingsActor(outer=self, name="BP_SceneSettings", tags=["SceneSettings"]))
+        for label in config.get("cameras", []):
+            self.actors.append(CineCameraActor(outer=self, name=label, label=label))
+
+
+# --- Libraries and Subsystems ---
+
+class GameplayStatics:
+    @staticmethod
+    def get_all_actors_with_tag(world, tag):
+        return [actor for actor in world.actors if actor.actor_has_tag(tag)]
+
+    @staticmethod
+    def get_all_actors_of_class(world, actor_class):
+        return [actor for actor in world.actors if isinstance(actor, actor_class)]
+
+
+class EditorActorSubsystem(Object):
+    def get_all_level_actors(self):
+        world = get_engine().world
+        return list(world.actors) if world else []
+
+
+def get_editor_subsystem(subsystem_class):
+    """Subsystems are singletons of the running engine."""
+    engine = get_engine()
+    if subsystem_class not in engine.subsystems:
+        engine.subsystems[subsystem_class] = subsystem_class()
+    return engine.subsystems[subsystem_class]
+
+get_engine_subsystem = get_editor_subsystem
+
+
+def _split_command_line(command_line):
+    """Splits on whitespace outside double quotes. Backslashes are kept, since they are Windows paths."""
+    tokens, current, in_quotes = [], '', False
+    for character in command_line:
+        if character == '"':
+            in_quotes = not in_quotes
+            current += character
+        elif character.isspace() and not in_quotes:
+            if current:
+                tokens.append(current)
+            current = ''
+        else:
+            current += character
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+class SystemLibrary:
+    @staticmethod
+    def get_command_line():
+        return get_engine().command_line
+
+    @staticmethod
+    def parse_command_line(in_cmd_line):
+        """
+        Splits a command line the way FCommandLine does.
+        :return: (tokens, switches, params). '-Key=Value' goes into params as
+                 {Key: Value} with quotes removed and into switches as 'Key=Value';
+                 a bare '-Switch' goes into switches as 'Switch'.
+        """
+        tokens, switches, params = [], [], {}
+        for argument in _split_command_line(in_cmd_line):
+            if argument.startswith('-'):
+                switch = argument[1:]
+                switches.append(switch.replace('"', ''))
+                if '=' in switch:
+                    key, value = switch.split('=', 1)
+                    params[key] = value.strip('"')
+            else:
+                tokens.append(argument.strip('"'))
+        return tokens, switches, params
+
+    @staticmethod
+    def execute_console_command(world_context_object, command, specific_player=None):
+        name, _, value = command.strip().partition(' ')
+        get_engine().set_console_variable(name, value.strip())
+
+    @staticmethod
+    def quit_editor():
+        log("Simulator: quit_editor requested.")
+        get_engine().request_exit(0)
+
+    @staticmethod
+    def get_engine_version():
+        return "5.6.0-simulator"